@@ -3,12 +3,11 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 
-import mysql, mysql.connector
 from src.models.customer import Customers
 from src.models.dishes import Dishes
 from src.models.login import Login as LoginModel
 from src.models.menu import Menu
-from src.models.orders import Orders
+from src.models.orders import Orders, PedidoDesatualizadoError
 from src.ui.cardapio_page import CardapioPage
 from src.ui.cliente_page import ClientPage
 from src.ui.login_page import LoginPage
@@ -19,6 +18,7 @@ from src.models.address import Address
 from src.models.collaborator import Collaborator
 from src.ui.pedido_page import PedidoPage
 from src.ui.pratos_page import PratosPage
+from src.utils.backgroundExecutor import BackgroundExecutor
 from src.utils.verificadorCpf import validar_cpf
 from src.utils.verificadorEndereco import validar_endereco
 from src.utils.verificadorPreco import verificar_preco
@@ -53,6 +53,18 @@ class Main:
         self.container = ttk.Frame(root, style="Background.TFrame")
         self.container.pack(fill="both", expand=True)
 
+        # Acesso ao banco em segundo plano: a janela nunca espera pelo MySQL
+        self.indicador_carregando = ttk.Label(
+            self.root, text="⏳ Carregando...", style="Loading.TLabel"
+        )
+        self.executor = BackgroundExecutor(
+            self.root, ao_mudar_ocupado=self._atualizar_indicador_carregando
+        )
+        # Aviso de banco fora do ar (disjuntor aberto)
+        self.status_banco = ttk.Label(self.root, style="Offline.TLabel")
+        self._status_banco_after_id = None
+        self.root.protocol("WM_DELETE_WINDOW", self._ao_fechar)
+
         # Estado da aplicação
         self.usuario_logado = False
         self.dados_usuario_logado = None
@@ -119,22 +131,87 @@ class Main:
         self.pratos_data = None
         self.pratos_pedido_data = None
         self.cardapio_data = None
-        self.pedidos_data = None
-        self.reload_data()
-
-        # Iniciar com a tela de login
+        self.ingredientes_data = None
+        # Pedidos são carregados em páginas pela tela de pedidos
+        self.pedidos_data = {}
+        self.filtros_pedidos = {}
+        self.proximo_pedido = None
+        self.marcador_pedidos = None
+        self._carregando_pedidos = False
+
+        # Iniciar com a tela de login enquanto os dados carregam em segundo plano
         self.mostrar_tela("login")
+        self.reload_data()
+        self._atualizar_status_banco()
 
-    def reload_data(self):
+    def reload_data(self, ao_concluir=None):
         """
-        Recarrega todas as datas para sempre ficar com os dados atualizados
+        Recarrega todas as datas em segundo plano para sempre ficar com os dados atualizados
 
+        args:
+            ao_concluir(callable): chamado na thread do Tk depois que os dados forem atualizados
         """
-        self.colaboradores_data = self.colaborador.recuperar_colaboradores_completos()
-        self.cliente_data = self.cliente.recuperar_clientes_completos()
-        self.pratos_data = self.dishes.recuperar_pratos_completos()
-        self.cardapio_data = self.menu.recuperar_cardapio_completo()
-        self.pedidos_data = self.order.recuperar_pedidos()
+
+        def aplicar(dados):
+            (
+                self.colaboradores_data,
+                self.cliente_data,
+                self.pratos_data,
+                self.cardapio_data,
+            ) = dados
+            if ao_concluir:
+                ao_concluir()
+
+        self.executor.executar(
+            self._carregar_dados, ao_concluir=aplicar, ao_falhar=self._mostrar_erro
+        )
+
+    def _carregar_dados(self):
+        """Consultas do reload_data (roda fora da thread do Tk)."""
+        return (
+            self.colaborador.recuperar_colaboradores_completos(),
+            self.cliente.recuperar_clientes_completos(),
+            self.dishes.recuperar_pratos_completos(),
+            self.menu.recuperar_cardapio_completo(),
+        )
+
+    def _atualizar_indicador_carregando(self, ocupado: bool):
+        """Mostra ou esconde o indicador enquanto há consultas pendentes."""
+        if ocupado:
+            self.indicador_carregando.place(relx=1.0, rely=1.0, x=-10, y=-10, anchor="se")
+            self.indicador_carregando.lift()
+            self.root.config(cursor="watch")
+        else:
+            self.indicador_carregando.place_forget()
+            self.root.config(cursor="")
+
+    def _atualizar_status_banco(self):
+        """Mostra o estado do banco enquanto ele estiver fora do ar (verificado a cada segundo)."""
+        status = self.db.estado_conexao()
+        if status["estado"] == "fechado":
+            self.status_banco.place_forget()
+        else:
+            if status["estado"] == "meio_aberto":
+                texto = "🟡 Reconectando ao banco de dados..."
+            else:
+                texto = (
+                    "🔴 Banco de dados indisponível — nova tentativa em "
+                    f"{status['proxima_tentativa_s']:.0f}s"
+                )
+            self.status_banco.config(text=texto)
+            self.status_banco.place(relx=0.0, rely=1.0, x=10, y=-10, anchor="sw")
+            self.status_banco.lift()
+        self._status_banco_after_id = self.root.after(1000, self._atualizar_status_banco)
+
+    def _mostrar_erro(self, erro: Exception):
+        """Mostra na tela o erro de uma tarefa executada em segundo plano."""
+        messagebox.showerror("Erro", str(erro))
+
+    def _ao_fechar(self):
+        if self._status_banco_after_id is not None:
+            self.root.after_cancel(self._status_banco_after_id)
+        self.executor.encerrar()
+        self.root.destroy()
 
     # Styles:
     def _definir_cores_e_fontes(self):
@@ -230,6 +307,20 @@ class Main:
             selectforeground=self.cor_texto_claro,  # Cor do texto do item selecionado na lista
         )
         self.style.map("Treeview.Heading", background=[("active", self.cor_destaque)])
+        self.style.configure(
+            "Offline.TLabel",
+            background="#B22222",
+            foreground=self.cor_texto_claro,
+            font=self.fonte_botao,
+            padding=6,
+        )
+        self.style.configure(
+            "Loading.TLabel",
+            background=self.cor_principal,
+            foreground=self.cor_texto_claro,
+            font=self.fonte_botao,
+            padding=6,
+        )
 
     # Criação do Menu:
     def criar_menu(self):
@@ -326,6 +417,18 @@ class Main:
             label="Mostrar Pedidos",
             command=lambda: self.mostrar_tela("lista_pedidos"),
         )
+        menu_pedidos.add_command(
+            label="Fila da Cozinha",
+            command=lambda: self.mostrar_tela("fila_cozinha"),
+        )
+        menu_pedidos.add_command(
+            label="Tempos de Preparo",
+            command=lambda: self.mostrar_tela("relatorio_tempos"),
+        )
+        menu_pedidos.add_command(
+            label="Arquivar Entregues",
+            command=self.arquivar_pedidos,
+        )
         barra_menu.add_cascade(label="Pedidos", menu=menu_pedidos)
 
         # Ajustar menu com o nivel do Usuario logado
@@ -349,9 +452,39 @@ class Main:
         # mantém uma referência para não ser coletado pelo garbage collector
         bg_label.image = self._bg_photo
 
+    # Telas que não dependem dos dados do banco são desenhadas na hora
+    _TELAS_SEM_DADOS = {"login", "form_colaborador", "form_cliente", "tela_inicial"}
+
     def mostrar_tela(self, nome_tela, modo="visualizar", data_extra=None):
+        # Respostas pedidas pela tela anterior não devem mais ser desenhadas
+        self.executor.cancelar_pendentes()
         self.limpar_container()
-        self.reload_data()
+
+        def desenhar():
+            self._desenhar_tela(nome_tela, modo, data_extra)
+
+        if nome_tela in self._TELAS_SEM_DADOS or nome_tela == "lista_pedidos":
+            # A lista de pedidos busca a própria primeira página
+            desenhar()
+        elif nome_tela == "form_prato":
+            self._carregar_ingredientes(desenhar)
+        elif nome_tela == "fila_cozinha":
+            # A fila só depende dos pedidos ativos, não do reload_data
+            self.executor.executar(
+                self.order.fila_cozinha,
+                ao_concluir=self.orderPage.criar_fila_cozinha,
+                ao_falhar=self._mostrar_erro,
+            )
+        elif nome_tela == "relatorio_tempos":
+            self.executor.executar(
+                self.order.relatorio_tempos_status,
+                ao_concluir=self.orderPage.criar_relatorio_tempos,
+                ao_falhar=self._mostrar_erro,
+            )
+        else:
+            self.reload_data(ao_concluir=desenhar)
+
+    def _desenhar_tela(self, nome_tela, modo, data_extra):
         if nome_tela == "form_colaborador":
             # 'data_extra' aqui seria os dados do colaborador para edição
             self.colaboradores_page.criar_form_colaborador(modo, data_extra)
@@ -381,7 +514,8 @@ class Main:
 
             # Pedidos
         elif nome_tela == "lista_pedidos":
-            self.orderPage.criar_lista_pedidos(pedidos_data=self.pedidos_data)
+            self.orderPage.criar_lista_pedidos(colaboradores=self.colaboradores_data)
+            self.carregar_pedidos()
         elif nome_tela == "form_pedido":
             self.orderPage.criar_form_pedido(
                 modo="novo",
@@ -409,17 +543,32 @@ class Main:
         """
         Valida o login antes de liberar o acesso
         """
+        self.executor.executar(
+            self._consultar_login,
+            cpf,
+            senha,
+            ao_concluir=lambda resultado: self._concluir_login(cpf, *resultado),
+            ao_falhar=self._mostrar_erro,
+        )
 
+    def _consultar_login(self, cpf, senha):
+        """Consultas do login (roda fora da thread do Tk)."""
         # Primeiro verifica se o usuario está cadastrado como Funcionario:
         dados_usuario = self.login_model.searchDataFromPerson(cpf, colaborador=True)
+        if not dados_usuario or not dados_usuario.get("pessoa"):
+            return dados_usuario, None
+
+        # Segundo verifica no banco de dados os valore inseridos
+        return dados_usuario, self.login_model.validate_login(cpf=cpf, password=senha)
+
+    def _concluir_login(self, cpf, dados_usuario, validated):
+        """Libera o acesso ou mostra o erro, com o resultado de _consultar_login."""
         if not dados_usuario or not dados_usuario.get("pessoa"):
             messagebox.showerror(
                 "Erro de Login", "CPF não encontrado no banco de Dados."
             )
             return
 
-        # Segundo verifica no banco de dados os valore inseridos
-        validated = self.login_model.validate_login(cpf=cpf, password=senha)
         print(validated)
         # --- Caso não encontre o cpf precisaremos inserir o colaborador no Banco de dados ---
         if not validated["cpf_exists"]:
@@ -549,8 +698,14 @@ class Main:
             messagebox.showerror("Erro", "As senhas não coincidem.")
             return
 
-        self.login_model.add_login(cpf, new_password)
-        self.mostrar_tela(nome_tela="login")
+        self.executor.executar(
+            self.login_model.add_login,
+            cpf,
+            new_password,
+            escrita=True,
+            ao_concluir=lambda _: self.mostrar_tela(nome_tela="login"),
+            ao_falhar=self._mostrar_erro,
+        )
 
     def _handle_cancelar_senha_colaborador(self):
         """
@@ -582,11 +737,6 @@ class Main:
             messagebox.showerror("❌Erro", "CPF INVÁLIDO")
             return
 
-        # verificar se cpf ja está cadastrado
-        if self.colaborador.cpf_existe(cpf) and modo == "novo":
-            messagebox.showerror("❌Erro", "CPF JÀ EXISTE")
-            return
-
         # verificar numero de telefone
         if not validar_telefone_celular(telefone):
             messagebox.showerror("❌Erro", "TELEFONE INVALIDO")
@@ -610,27 +760,42 @@ class Main:
             messagebox.showerror("❌Erro", "NIVEL OBRIGATORIO")
             return
 
-        if modo == "novo":
-            self.colaborador.inserirColaborador(
-                cpf=cpf,
-                nome=nome,
-                dataAd=data_ad_formatada_sql,
-                nivelSystem=nivelSystem,
-                funcao=funcao,
-                telefone=formated_telefone,
-                endereco=endereco,
-            )
-        else:
-            self.colaborador.atualizarColaborador(
-                cpf=cpf,
-                novo_nome=nome,
-                nova_data_AD=data_ad_formatada_sql,
-                novo_nivel_system=nivelSystem,
-                nova_funcao=funcao,
-                novo_telefone=formated_telefone,
-                novo_endereco=endereco,
-            )
-        self.recarregarListaColaboradores()
+        def gravar():
+            # verificar se cpf ja está cadastrado
+            if modo == "novo" and self.colaborador.cpf_existe(cpf):
+                return False
+
+            if modo == "novo":
+                self.colaborador.inserirColaborador(
+                    cpf=cpf,
+                    nome=nome,
+                    dataAd=data_ad_formatada_sql,
+                    nivelSystem=nivelSystem,
+                    funcao=funcao,
+                    telefone=formated_telefone,
+                    endereco=endereco,
+                )
+            else:
+                self.colaborador.atualizarColaborador(
+                    cpf=cpf,
+                    novo_nome=nome,
+                    nova_data_AD=data_ad_formatada_sql,
+                    novo_nivel_system=nivelSystem,
+                    nova_funcao=funcao,
+                    novo_telefone=formated_telefone,
+                    novo_endereco=endereco,
+                )
+            return True
+
+        def concluir(gravado):
+            if not gravado:
+                messagebox.showerror("❌Erro", "CPF JÀ EXISTE")
+                return
+            self.recarregarListaColaboradores()
+
+        self.executor.executar(
+            gravar, escrita=True, ao_concluir=concluir, ao_falhar=self._mostrar_erro
+        )
 
     def solicitar_edicao_colaborador(self, colab_id):
         """Prepara e mostra o formulário para editar um colaborador."""
@@ -648,21 +813,33 @@ class Main:
             "Confirmar Exclusão",
             f"Tem certeza que deseja excluir '{nome_colaborador}' (CPF: {colab_id})?",
         ):
-            try:
-                self.colaborador.deletarColaborador(cpf_colaborador=colab_id)
-                messagebox.showinfo("Sucesso", "Colaborador excluído!")
-            except mysql.connector.Error as e:
-                print(f"❌erro ao deletar colaborador")
-                return
 
-            self.recarregarListaColaboradores()
+            def concluir(_):
+                messagebox.showinfo("Sucesso", "Colaborador excluído!")
+                self.recarregarListaColaboradores()
+
+            self.executor.executar(
+                self.colaborador.deletarColaborador,
+                cpf_colaborador=colab_id,
+                escrita=True,
+                ao_concluir=concluir,
+                ao_falhar=lambda e: print(f"❌erro ao deletar colaborador"),
+            )
 
     # --- Métodos de Controle de Cliente ---
     def solicitar_edicao_cliente(self, cpf):
         """Prepara e mostra o formulário para editar um cliente."""
+        self.executor.cancelar_pendentes()
 
         # 1) Puxe sempre os dados completos (com telefone_info)
-        self.cliente_data = self.cliente.recuperar_clientes_completos()
+        self.executor.executar(
+            self.cliente.recuperar_clientes_completos,
+            ao_concluir=lambda dados: self._mostrar_form_edicao_cliente(cpf, dados),
+            ao_falhar=self._mostrar_erro,
+        )
+
+    def _mostrar_form_edicao_cliente(self, cpf, cliente_data: list):
+        self.cliente_data = cliente_data
         # print(self.cliente_data)
 
         # 2) Normalize o CPF para string, sem formatação
@@ -699,14 +876,18 @@ class Main:
             "Confirmar Exclusão",
             f"Tem certeza que deseja excluir '{nome_cliente}' (CPF: {client_id})?",
         ):
-            try:
-                self.cliente.deletarCliente(cpf=client_id)
-                messagebox.showinfo("Sucesso", "Cliente excluído!")
-            except mysql.connector.Error as e:
-                print(f"❌erro ao deletar colaborador")
-                return
 
-            self.recarregarListaCliente()
+            def concluir(_):
+                messagebox.showinfo("Sucesso", "Cliente excluído!")
+                self.recarregarListaCliente()
+
+            self.executor.executar(
+                self.cliente.deletarCliente,
+                cpf=client_id,
+                escrita=True,
+                ao_concluir=concluir,
+                ao_falhar=lambda e: print(f"❌erro ao deletar colaborador"),
+            )
 
     def salvar_dados_cliente(self, dados_cliente, modo: str):
         if not dados_cliente.get("cpf") or not dados_cliente.get("nome"):
@@ -722,11 +903,6 @@ class Main:
             messagebox.showerror("❌Erro", "CPF INVÁLIDO")
             return
 
-        # verificar se cpf ja está cadastrado
-        if self.cliente.cpf_existe_cliente(cpf) and modo == "novo":
-            messagebox.showerror("❌Erro", "CPF JÀ EXISTE")
-            return
-
         # verificar numero de telefone
         if not validar_telefone_celular(telefone):
             messagebox.showerror("❌Erro", "TELEFONE INVALIDO")
@@ -735,49 +911,101 @@ class Main:
         # formata o telefone após verificado
         formated_telefone = formatar_telefone(telefone)
 
-        if modo == "novo":
-            self.cliente.inserirCliente(
-                cpf=cpf,
-                nome=nome,
-                telefone=formated_telefone,
-            )
-        else:
-            self.cliente.atualizarCliente(
-                cpf=cpf,
-                novo_nome=nome,
-                novo_telefone=formated_telefone,
-            )
+        def gravar():
+            # verificar se cpf ja está cadastrado
+            if modo == "novo" and self.cliente.cpf_existe_cliente(cpf):
+                return False
+
+            if modo == "novo":
+                self.cliente.inserirCliente(
+                    cpf=cpf,
+                    nome=nome,
+                    telefone=formated_telefone,
+                )
+            else:
+                self.cliente.atualizarCliente(
+                    cpf=cpf,
+                    novo_nome=nome,
+                    novo_telefone=formated_telefone,
+                )
+            return True
+
+        def concluir(gravado):
+            if not gravado:
+                messagebox.showerror("❌Erro", "CPF JÀ EXISTE")
+                return
+            self.recarregarListaCliente()
 
-        self.recarregarListaCliente()
+        self.executor.executar(
+            gravar, escrita=True, ao_concluir=concluir, ao_falhar=self._mostrar_erro
+        )
 
     def recarregarListaColaboradores(self):
         """metodo para recarregar a lista de colaboradores"""
-        self.colaboradores_data = self.colaborador.recuperar_colaboradores_completos()
-        self.colaboradores_page.criar_lista_colaboradores(
-            colaboradores_data=self.colaboradores_data
+
+        def concluir(dados):
+            self.colaboradores_data = dados
+            self.colaboradores_page.criar_lista_colaboradores(
+                colaboradores_data=self.colaboradores_data
+            )
+
+        self.executor.executar(
+            self.colaborador.recuperar_colaboradores_completos,
+            ao_concluir=concluir,
+            ao_falhar=self._mostrar_erro,
         )
 
     def recarregarListaCliente(self):
         """metodo para recarregar a lista de colaboradores"""
-        self.cliente_data = self.cliente.recuperar_clientes_completos()
-        self.client_page.criar_lista_clientes(clientes_data=self.cliente_data)
+
+        def concluir(dados):
+            self.cliente_data = dados
+            self.client_page.criar_lista_clientes(clientes_data=self.cliente_data)
+
+        self.executor.executar(
+            self.cliente.recuperar_clientes_completos,
+            ao_concluir=concluir,
+            ao_falhar=self._mostrar_erro,
+        )
 
     # --- Métodos de Controle dos Pratos ---
 
     def recuperar_ingredientes(self) -> list:
         """
         Retorna lista de ingredientes disponíveis para seleção.
+
+        A lista é carregada em segundo plano por _carregar_ingredientes antes
+        de o formulário de pratos ser desenhado.
         """
-        try:
-            return self.dishes.recuperar_ingredientes()
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao recuperar ingredientes: {e}")
-            return []
+        return self.ingredientes_data or []
+
+    def _carregar_ingredientes(self, ao_concluir):
+        """Carrega os ingredientes em segundo plano e chama ao_concluir na thread do Tk."""
+
+        def concluir(dados):
+            self.ingredientes_data = dados
+            ao_concluir()
+
+        self.executor.executar(
+            self.dishes.recuperar_ingredientes,
+            ao_concluir=concluir,
+            ao_falhar=lambda e: messagebox.showerror(
+                "Erro", f"Falha ao recuperar ingredientes: {e}"
+            ),
+        )
 
     def recarregarListaPratos(self):
         """Recarrega dados e atualiza a lista de pratos."""
-        self.pratos_data = self.dishes.recuperar_pratos_completos()
-        self.prato_page.criar_lista_pratos(self.pratos_data)
+
+        def concluir(dados):
+            self.pratos_data = dados
+            self.prato_page.criar_lista_pratos(self.pratos_data)
+
+        self.executor.executar(
+            self.dishes.recuperar_pratos_completos,
+            ao_concluir=concluir,
+            ao_falhar=self._mostrar_erro,
+        )
 
     def solicitar_edicao_prato(self, prato_id):
         """Mostra o formulário preenchido para edição de um prato."""
@@ -791,16 +1019,31 @@ class Main:
             "nome": prato["nome"],
             "preco": prato["preco"],
             "ingredientes": prato.get("ingredientes", ""),
+            "ingredientes_ids": prato.get("ingredientes_ids", []),
         }
-        self.prato_page.criar_form_pratos(modo="editar", data_prato=data_form)
+        self.executor.cancelar_pendentes()
+        self._carregar_ingredientes(
+            lambda: self.prato_page.criar_form_pratos(
+                modo="editar", data_prato=data_form
+            )
+        )
 
     def solicitar_exclusao_prato(self, prato_id):
         """Exclui um prato após confirmação."""
         if messagebox.askyesno("Confirmar Exclusão", f"Excluir prato ID {prato_id}?"):
-            success = self.dishes.deletarPrato(prato_id)
-            if success:
-                messagebox.showinfo("Sucesso", "Prato excluído.")
-                self.recarregarListaPratos()
+
+            def concluir(success):
+                if success:
+                    messagebox.showinfo("Sucesso", "Prato excluído.")
+                    self.recarregarListaPratos()
+
+            self.executor.executar(
+                self.dishes.deletarPrato,
+                prato_id,
+                escrita=True,
+                ao_concluir=concluir,
+                ao_falhar=self._mostrar_erro,
+            )
 
     def salvar_dados_prato(self, dados_prato, modo: str):
         """Salva ou atualiza um prato e suas associações de ingredientes."""
@@ -818,31 +1061,49 @@ class Main:
         # Verificar se o preço é válido
         preco = verificar_preco(preco)
 
-        if modo == "novo":
-            prato_id = self.dishes.inserirPrato(nome, float(preco))
-            for ing_id in ingredientes:
-                self.dishes.adicionarIngredienteAoPrato(prato_id, ing_id)
-        else:
-            # atualiza dados do prato
-            self.dishes.atualizarPrato(
-                id_prato=prato_id, novo_nome=nome, novo_preco=float(preco)
-            )
-            # atualiza ingredientes: remove todos e reinsere
-            for ing_id in ingredientes:
-                self.dishes.removerIngredienteDoPrato(prato_id, ing_id)
-                self.dishes.adicionarIngredienteAoPrato(prato_id, ing_id)
-        self.recarregarListaPratos()
+        def gravar():
+            if modo == "novo":
+                # prato e ingredientes entram juntos ou nada entra
+                with self.db.transaction():
+                    novo_id = self.dishes.inserirPrato(nome, float(preco))
+                    if novo_id is None:
+                        raise RuntimeError(f"Não foi possível cadastrar o prato '{nome}'.")
+                    if not self.dishes.adicionarIngredientesAoPrato(novo_id, ingredientes):
+                        raise RuntimeError(
+                            f"Não foi possível associar os ingredientes ao prato '{nome}'."
+                        )
+            else:
+                # nome, preço e ingredientes selecionados numa só transação
+                if not self.dishes.atualizarPrato(
+                    id_prato=prato_id,
+                    novo_nome=nome,
+                    novo_preco=float(preco),
+                    ingredientes_ids=ingredientes,
+                ):
+                    raise RuntimeError(f"Não foi possível atualizar o prato '{nome}'.")
+
+        self.executor.executar(
+            gravar,
+            escrita=True,
+            ao_concluir=lambda _: self.recarregarListaPratos(),
+            ao_falhar=self._mostrar_erro,
+        )
 
     # --- Método de controle do Cardapio ---
     def recarregar_pratos_cardapio(self):
-        self.reload_data()
-        data = self.cardapio_data
-        self.cardapio_page.criar_lista_cardapio(data)
+        self.reload_data(
+            ao_concluir=lambda: self.cardapio_page.criar_lista_cardapio(
+                self.cardapio_data
+            )
+        )
 
     def adicionar_prato_ao_cardapio(self):
         """Controlador para adiionar pratos ao cardapio"""
+        self.executor.cancelar_pendentes()
+        self.reload_data(ao_concluir=self._mostrar_view_add_pratos)
+
+    def _mostrar_view_add_pratos(self):
         # Faz um filtro dos pratos que não estão no cardapio
-        self.reload_data()
         cardapio_id = self.cardapio_data["id"]
         data = [
             prato
@@ -866,10 +1127,15 @@ class Main:
             messagebox.showerror("Erro", "selecione algum prato.")
             return
 
-        for prato_id in pratos:
-            self.menu.adicionarPratoAoCardapio(cardapio_id, prato_id)
-
-        self.recarregar_pratos_cardapio()
+        self.executor.executar(
+            self.menu.adicionarPratosAoCardapio,
+            cardapio_id,
+            pratos,
+            ignorar_duplicados=True,
+            escrita=True,
+            ao_concluir=lambda _: self.recarregar_pratos_cardapio(),
+            ao_falhar=self._mostrar_erro,
+        )
 
     def remover_prato_do_cardapio(self, cardapio_id: int, prato_id: int):
         """
@@ -878,13 +1144,181 @@ class Main:
         args:
             prato_id(int): chave do prato a ser exluido do cardapio
         """
-        self.menu.removerPratoDoCardapio(cardapio_id, prato_id)
+        self.executor.executar(
+            self.menu.removerPratoDoCardapio,
+            cardapio_id,
+            prato_id,
+            escrita=True,
+            ao_falhar=self._mostrar_erro,
+        )
 
     # --- Métodos de controle dos Pedidos ---
+    # Pedidos buscados por página na tela de pedidos
+    TAMANHO_PAGINA_PEDIDOS = 50
+    # Idade, em dias, a partir da qual pedidos entregues vão para o histórico
+    DIAS_ARQUIVAMENTO = 90
+
     def recarregarListaPedidos(self):
         """Controlador para recarregarar a lista de Pedidos"""
         self.mostrar_tela(nome_tela="lista_pedidos")
 
+    def voltarListaPedidos(self):
+        """
+        Controlador que volta do formulário para a lista de pedidos já
+        carregada, sem buscá-la de novo nem descartar as respostas pendentes.
+        """
+        if self.marcador_pedidos is None:
+            self.recarregarListaPedidos()
+            return
+        self.orderPage.criar_lista_pedidos(colaboradores=self.colaboradores_data)
+        self.orderPage.adicionar_pedidos(
+            self.pedidos_data, limpar=True, tem_mais=self.proximo_pedido is not None
+        )
+
+    def carregar_pedidos(self, filtros: dict = None):
+        """
+        Controlador que carrega a primeira página de pedidos com os filtros informados.
+
+        args:
+            filtros(dict): argumentos de filtro de Orders.recuperar_pedidos_pagina
+                (status, num_mesa, fk_colaborador, data_inicio, data_fim)
+        """
+        self.filtros_pedidos = dict(filtros or {})
+        self.pedidos_data = {}
+        self.proximo_pedido = None
+        self.marcador_pedidos = None
+        self._buscar_pagina_pedidos(primeira=True)
+
+    def atualizarListaPedidos(self):
+        """
+        Controlador do botão "Atualizar Pedidos": aplica na lista apenas os
+        pedidos incluídos, alterados ou excluídos desde a última carga.
+        """
+        if self.marcador_pedidos is None or self._carregando_pedidos:
+            self.carregar_pedidos(self.filtros_pedidos)
+            return
+
+        filtros = self.filtros_pedidos
+
+        def concluir(alteracoes):
+            if filtros is not self.filtros_pedidos:
+                return
+            self.marcador_pedidos = alteracoes["marcador"]
+            for pedido_id in alteracoes["excluidos"]:
+                self.pedidos_data.pop(pedido_id, None)
+            self.pedidos_data.update(alteracoes["alterados"])
+            self.orderPage.aplicar_alteracoes(
+                alteracoes["alterados"], alteracoes["excluidos"]
+            )
+
+        self.executor.executar(
+            self.order.recuperar_pedidos_desde,
+            self.marcador_pedidos,
+            **filtros,
+            ao_concluir=concluir,
+            ao_falhar=self._mostrar_erro,
+        )
+
+    def carregar_mais_pedidos(self):
+        """Controlador que carrega a próxima página (a lista chegou ao fim da rolagem)."""
+        if self.proximo_pedido is None or self._carregando_pedidos:
+            return
+        self._buscar_pagina_pedidos(primeira=False)
+
+    def _buscar_pagina_pedidos(self, primeira: bool):
+        filtros = self.filtros_pedidos
+
+        def concluir(pagina):
+            # Os filtros mudaram enquanto a página era buscada
+            if filtros is not self.filtros_pedidos:
+                return
+            self._carregando_pedidos = False
+            if primeira:
+                self.marcador_pedidos, pagina = pagina
+            self.pedidos_data.update(pagina["pedidos"])
+            self.proximo_pedido = pagina["proximo"]
+            self.orderPage.adicionar_pedidos(
+                pagina["pedidos"],
+                limpar=primeira,
+                tem_mais=self.proximo_pedido is not None,
+            )
+
+        def falhar(erro):
+            self._carregando_pedidos = False
+            self._mostrar_erro(erro)
+
+        self._carregando_pedidos = True
+        self.executor.executar(
+            self._consultar_pagina_pedidos,
+            primeira,
+            None if primeira else self.proximo_pedido,
+            filtros,
+            ao_concluir=concluir,
+            ao_falhar=falhar,
+        )
+
+    def _consultar_pagina_pedidos(self, primeira: bool, apos_id, filtros: dict):
+        """Consulta de uma página de pedidos (roda fora da thread do Tk).
+
+        A primeira página vem com o marcador de alterações, lido antes dela e
+        na mesma conexão: o que mudar entre as duas leituras volta na próxima
+        atualização.
+        """
+        pagina = self.order.recuperar_pedidos_pagina(
+            limite=self.TAMANHO_PAGINA_PEDIDOS, apos_id=apos_id, com_marcador=primeira, **filtros
+        )
+        return (pagina["marcador"], pagina) if primeira else pagina
+
+    def mudar_status_pedido(self, pedido_id, novo_status: str, versao: int = None):
+        """
+        Controlador da fila da cozinha: muda o status do pedido e redesenha a fila.
+
+        Se outro terminal mudou o pedido antes, nada é gravado; a fila é
+        redesenhada mesmo assim, trazendo só os pedidos alterados.
+        """
+
+        def falhar(erro):
+            if isinstance(erro, PedidoDesatualizadoError):
+                messagebox.showwarning("Pedido alterado", str(erro))
+                self.mostrar_tela("fila_cozinha")
+            else:
+                self._mostrar_erro(erro)
+
+        self.executor.executar(
+            self.order.atualizarPedido,
+            int(pedido_id),
+            novo_status=novo_status,
+            versao=versao,
+            escrita=True,
+            ao_concluir=lambda _: self.mostrar_tela("fila_cozinha"),
+            ao_falhar=falhar,
+        )
+
+    def mudar_status_em_lote(self, novo_status: str, ids: list = None, num_mesa: int = None):
+        """
+        Controlador da lista de pedidos: muda o status dos pedidos selecionados
+        (ou de todos os pedidos em aberto de uma mesa) com uma única gravação e
+        atualiza na lista apenas os pedidos alterados.
+        """
+        self.executor.executar(
+            self.order.atualizarStatusEmLote,
+            ids,
+            novo_status,
+            num_mesa=num_mesa,
+            escrita=True,
+            ao_concluir=lambda _: self.atualizarListaPedidos(),
+            ao_falhar=self._mostrar_erro,
+        )
+
+    def mostrar_conta_mesa(self, num_mesa: int):
+        """Controlador do caixa: mostra a conta em aberto de uma mesa."""
+        self.executor.executar(
+            self.order.contaDaMesa,
+            num_mesa,
+            ao_concluir=self.orderPage.mostrar_conta_mesa,
+            ao_falhar=self._mostrar_erro,
+        )
+
     def criar_pedido(self, data_pedidos: dict):
         """
         Controlador para salvar pedidos novos no banco de dados.
@@ -907,22 +1341,63 @@ class Main:
             # Por padrão o status inicial é pendente
             status = "pendente"
 
-        self.order.inserirPedido(num_mesa, fk_colaborador, status, ids_pratos)
+        self.executor.executar(
+            self.order.inserirPedido,
+            num_mesa,
+            fk_colaborador,
+            status,
+            ids_pratos,
+            escrita=True,
+            ao_falhar=self._mostrar_erro,
+        )
+
+    def arquivar_pedidos(self):
+        """
+        Controlador do arquivamento: move pedidos entregues antigos para o histórico.
+        """
+        if not messagebox.askyesno(
+            "Confirmar",
+            f"Arquivar os pedidos entregues há mais de {self.DIAS_ARQUIVAMENTO} dias?",
+        ):
+            return
+        self.executor.executar(
+            self.order.arquivarPedidos,
+            dias=self.DIAS_ARQUIVAMENTO,
+            escrita=True,
+            ao_concluir=lambda total: messagebox.showinfo(
+                "Sucesso", f"{total} pedido(s) arquivado(s)."
+            ),
+            ao_falhar=self._mostrar_erro,
+        )
 
     def solicitar_exclusao_pedido(self, pedido_id):
         """
         Controlador de exclusão dos pedidos do banco de dados.
         """
-        self.order.deletarPedido(pedido_id)
-        self.recarregarListaPedidos()
+        self.executor.executar(
+            self.order.deletarPedido,
+            pedido_id,
+            escrita=True,
+            ao_concluir=lambda _: self.recarregarListaPedidos(),
+            ao_falhar=self._mostrar_erro,
+        )
 
     def solicitar_edicao_pedido(self, pedido_id):
         """Mostra o formulário preenchido para edição de um pedido."""
         pedido_id = int(pedido_id)
+        self.executor.cancelar_pendentes()
+        # Todos os pratos: os que já estão no pedido vêm selecionados e podem
+        # ser desmarcados
+        self.executor.executar(
+            self.dishes.recuperar_pratos_completos,
+            ao_concluir=lambda dados: self._mostrar_form_edicao_pedido(pedido_id, dados),
+            ao_falhar=self._mostrar_erro,
+        )
+
+    def _mostrar_form_edicao_pedido(self, pedido_id: int, pratos_data: list):
         pedido = self.pedidos_data.get(pedido_id)
-        pratos_data = self.dishes.recuperar_pratos_para_pedido(pedido_id)
 
-        if not pratos_data or not pratos_data.get("pratos"):
+        if not pedido or not pratos_data:
             messagebox.showerror(
                 "Erro", "Pedido não encontrado ou sem pratos disponíveis."
             )
@@ -931,7 +1406,7 @@ class Main:
         self.orderPage.criar_form_pedido(
             modo="editar",
             data_pedido=pedido,
-            data_pratos=pratos_data["pratos"],
+            data_pratos=pratos_data,
             id_colaborador=self._id_colaborador_editando,
             pedido_id=pedido_id,
         )
@@ -942,13 +1417,64 @@ class Main:
         """
         novo_num_mesa = new_data_pedidos["numero_mesa"]
         novo_status = new_data_pedidos["status"]
-        novos_pratos = new_data_pedidos["pratos"]
 
-        self.order.atualizarPedido(
+        # Conjunto final de pratos: os que continuam selecionados mantêm a
+        # quantidade atual, os novos entram com 1 e os desmarcados saem
+        quantidades = {
+            prato["id"]: prato.get("quantidade") or 1
+            for prato in self.pedidos_data.get(id_pedido, {}).get("pratos", [])
+        }
+        pratos = {
+            int(prato_id): quantidades.get(int(prato_id), 1)
+            for prato_id in new_data_pedidos["pratos"]
+        }
+
+        versao = self.pedidos_data.get(id_pedido, {}).get("versao")
+
+        def concluir(nova_versao):
+            # A próxima edição parte da versão gravada agora
+            if versao is not None and id_pedido in self.pedidos_data:
+                self.pedidos_data[id_pedido]["versao"] = nova_versao
+            # Só os pedidos alterados desde a última carga voltam do banco
+            self.atualizarListaPedidos()
+
+        self.executor.executar(
+            self.order.atualizarPedido,
             id_pedido,
             novo_num_mesa=novo_num_mesa,
             novo_status=novo_status,
-            novos_pratos=novos_pratos,
+            pratos=pratos,
+            versao=versao,
+            escrita=True,
+            ao_concluir=concluir,
+            ao_falhar=self._tratar_erro_pedido,
+        )
+
+    def _tratar_erro_pedido(self, erro: Exception):
+        """
+        Erro ao gravar um pedido editado. Se outro terminal alterou o pedido
+        antes, relê apenas esse pedido e atualiza a sua linha na lista.
+        """
+        if not isinstance(erro, PedidoDesatualizadoError):
+            self._mostrar_erro(erro)
+            return
+        messagebox.showwarning("Pedido alterado", str(erro))
+
+        pedido_id = erro.pedido_id
+
+        def concluir(pedido):
+            if pedido is None:
+                self.pedidos_data.pop(pedido_id, None)
+                self.orderPage.aplicar_alteracoes({}, [pedido_id])
+            else:
+                self.pedidos_data[pedido_id] = pedido
+                self.orderPage.aplicar_alteracoes({pedido_id: pedido}, [])
+
+        self.executor.executar(
+            self.order.recuperar_pedido,
+            pedido_id,
+            ao_concluir=concluir,
+            ao_falhar=self._mostrar_erro,
         )
 
 
@@ -0,0 +1,149 @@
+import math
+import random
+import threading
+import time
+
+import mysql.connector
+
+
+class CircuitoAbertoError(mysql.connector.errors.OperationalError):
+    """Levantada sem tocar a rede enquanto o banco de dados está fora do ar."""
+
+
+class CircuitBreaker:
+    """Disjuntor que evita esperar pelo banco enquanto ele está indisponível.
+
+    Estados:
+        fechado: as conexões são abertas normalmente.
+        aberto: o banco falhou `limite_falhas` vezes seguidas; toda tentativa
+            falha na hora com CircuitoAbertoError.
+        meio_aberto: uma sonda em segundo plano está testando o banco.
+
+    Enquanto aberto, uma thread sonda o banco com backoff exponencial com
+    jitter (entre metade e o total de `backoff_base * 2^tentativa`, limitado a
+    `backoff_max`). Quando a sonda conecta, o disjuntor fecha sozinho.
+    """
+
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    MEIO_ABERTO = "meio_aberto"
+
+    def __init__(
+        self,
+        sonda,
+        limite_falhas: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        ao_recuperar=None,
+    ):
+        """Inicializa o disjuntor.
+
+        Args:
+            sonda (callable): Função sem argumentos que testa o banco e levanta
+                exceção se ele continuar fora do ar.
+            limite_falhas (int): Falhas seguidas que abrem o circuito.
+            backoff_base (float): Espera inicial entre sondas, em segundos.
+            backoff_max (float): Espera máxima entre sondas, em segundos.
+            ao_recuperar (callable, optional): Chamado (na thread da sonda)
+                quando o banco volta.
+        """
+        self._sonda = sonda
+        self.limite_falhas = max(1, limite_falhas)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._ao_recuperar = ao_recuperar
+
+        self._lock = threading.Lock()
+        self.estado = self.FECHADO
+        self._falhas = 0
+        self._tentativas = 0
+        self._proxima_sonda = 0.0
+        self._thread = None
+        self.ultimo_erro = None
+
+    def permitir(self):
+        """Falha imediatamente se o circuito não estiver fechado.
+
+        Raises:
+            CircuitoAbertoError: Se o banco estiver marcado como indisponível.
+        """
+        with self._lock:
+            if self.estado == self.FECHADO:
+                return
+            restante = max(0.0, self._proxima_sonda - time.monotonic())
+        raise CircuitoAbertoError(
+            msg=f"Banco de dados indisponível. Nova tentativa de conexão em {math.ceil(restante)}s."
+        )
+
+    def registrar_sucesso(self):
+        """Zera a contagem de falhas seguidas."""
+        with self._lock:
+            if self.estado == self.FECHADO:
+                self._falhas = 0
+
+    def registrar_falha(self, erro: Exception):
+        """Conta uma falha de conexão e abre o circuito ao atingir o limite."""
+        with self._lock:
+            self.ultimo_erro = str(erro)
+            if self.estado != self.FECHADO:
+                return
+            self._falhas += 1
+            if self._falhas < self.limite_falhas:
+                return
+            print("🔴 Banco de dados indisponível, operações vão falhar até ele voltar.")
+            self.estado = self.ABERTO
+            self._tentativas = 0
+            self._proxima_sonda = time.monotonic() + self._espera()
+            self._thread = threading.Thread(
+                target=self._sondar, name="db-sonda", daemon=True
+            )
+            self._thread.start()
+
+    def _espera(self) -> float:
+        teto = min(self.backoff_max, self.backoff_base * (2**self._tentativas))
+        return random.uniform(teto / 2, teto)
+
+    def _sondar(self):
+        """Testa o banco em segundo plano até ele responder."""
+        while True:
+            with self._lock:
+                espera = self._proxima_sonda - time.monotonic()
+            if espera > 0:
+                time.sleep(espera)
+
+            with self._lock:
+                self.estado = self.MEIO_ABERTO
+            try:
+                self._sonda()
+            except Exception as e:
+                with self._lock:
+                    self.ultimo_erro = str(e)
+                    self._tentativas += 1
+                    self.estado = self.ABERTO
+                    self._proxima_sonda = time.monotonic() + self._espera()
+                continue
+
+            with self._lock:
+                self.estado = self.FECHADO
+                self._falhas = 0
+                self._thread = None
+            print("🟢 Conexão com o banco de dados restabelecida.")
+            if self._ao_recuperar is not None:
+                self._ao_recuperar()
+            return
+
+    def status(self) -> dict:
+        """Retorna o estado atual para exibição na interface.
+
+        Returns:
+            dict: 'estado', 'falhas', 'proxima_tentativa_s' e 'ultimo_erro'.
+        """
+        with self._lock:
+            return {
+                "estado": self.estado,
+                "falhas": self._falhas,
+                "proxima_tentativa_s": max(0.0, self._proxima_sonda - time.monotonic())
+                if self.estado != self.FECHADO
+                else 0.0,
+                "ultimo_erro": self.ultimo_erro,
+            }
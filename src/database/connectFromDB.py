@@ -1,82 +1,591 @@
+import threading
+import time
+from contextlib import contextmanager
+
 import mysql.connector
 from dotenv import load_dotenv
 import os
 
+from src.database.circuitBreaker import CircuitBreaker, CircuitoAbertoError
+from src.database.connectionPool import ConnectionPool
+from src.database.migrations import aplicar_migracoes
+from src.database.preparedCache import PreparedStatementCache
+from src.database.queryStats import InstrumentedCursor, QueryStats
+from src.database.resultCache import ResultCache, tabelas_do_sql
+from src.database import sqliteBackend
+
 # Carregar as variáveis de ambiente do arquivo .env
 load_dotenv()
 
+# Script com a criação das tabelas, usado para montar o banco SQLite embarcado
+ARQUIVO_SCHEMA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "public",
+    "modelo logico cafeteria.sql",
+)
+
+# Erros do cliente MySQL que indicam conexão perdida (e não erro do comando)
+_ERROS_DE_CONEXAO = {2002, 2003, 2006, 2013, 2055}
+
+
+def _falhaDeConexao(erro: BaseException) -> bool:
+    """Indica se o erro significa que a conexão com o servidor caiu."""
+    if isinstance(erro, CircuitoAbertoError):
+        return False
+    if isinstance(erro, mysql.connector.errors.InterfaceError):
+        return True
+    return (
+        isinstance(erro, mysql.connector.errors.OperationalError)
+        and erro.errno in _ERROS_DE_CONEXAO
+    )
+
 
 class Database:
+    # Pool, disjuntor e estatísticas compartilhados por todas as instâncias de Database
+    _pool = None
+    _disjuntor = None
+    _estatisticas = None
+    _preparados = None
+    _resultados = None
+    _migrado = False
+    _pool_lock = threading.Lock()
+
     def __init__(self):
-        """Inicializa a conexão com o banco de dados MySQL."""
-        self.connection = mysql.connector.connect(
+        """Inicializa o acesso ao banco de dados através do pool de conexões.
+
+        O pool é criado na primeira instância e configurado pelas variáveis de ambiente:
+            DB_BACKEND: "mysql" (padrão) ou "sqlite" para rodar sem servidor MySQL.
+            DB_SQLITE_PATH: arquivo do banco SQLite (padrão coffeshop.sqlite3);
+                ":memory:" usa um banco em memória.
+            DB_POOL_SIZE: número máximo de conexões abertas (padrão 5).
+            DB_POOL_MAX_IDLE: segundos que uma conexão pode ficar ociosa (padrão 300).
+            DB_POOL_TIMEOUT: segundos de espera por uma conexão livre (padrão 10).
+            DB_SLOW_QUERY_MS: latência a partir da qual um comando vai para o log
+                de consultas lentas (padrão 200).
+            DB_SLOW_QUERY_LOG: arquivo do log de consultas lentas (padrão slow_queries.log).
+            DB_PREPARED_CACHE_SIZE: prepared statements mantidos por conexão (padrão 32).
+            DB_CONNECT_TIMEOUT: segundos para abrir uma conexão MySQL (padrão 3).
+            DB_POOL_PING_AFTER: conexões ociosas há mais que isso, em segundos,
+                recebem um ping antes de serem usadas (padrão 1).
+            DB_BREAKER_FAILURES: falhas de conexão seguidas que abrem o
+                disjuntor (padrão 3).
+            DB_BREAKER_BACKOFF_MAX: espera máxima entre as sondas do banco
+                fora do ar, em segundos (padrão 30).
+            DB_RESULT_CACHE_SIZE: resultados mantidos por `consultarComCache`
+                (padrão 128).
+            DB_RESULT_CACHE_TTL: segundos que um resultado em cache vale
+                (padrão 30); 0 desliga o cache.
+        """
+        with Database._pool_lock:
+            if Database._disjuntor is None:
+                Database._disjuntor = CircuitBreaker(
+                    sonda=Database._sondarBanco,
+                    limite_falhas=int(os.getenv("DB_BREAKER_FAILURES", 3)),
+                    backoff_max=float(os.getenv("DB_BREAKER_BACKOFF_MAX", 30)),
+                    ao_recuperar=lambda: Database._pool.fechar(),
+                )
+            if Database._pool is None:
+                Database._pool = ConnectionPool(
+                    fabrica=Database._abrirConexao,
+                    tamanho=int(os.getenv("DB_POOL_SIZE", 5)),
+                    max_ocioso=float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+                    timeout=float(os.getenv("DB_POOL_TIMEOUT", 10)),
+                    verificar=Database._conexaoViva,
+                    verificar_apos=float(os.getenv("DB_POOL_PING_AFTER", 1)),
+                )
+            if Database._estatisticas is None:
+                Database._estatisticas = QueryStats(
+                    limite_lento_ms=float(os.getenv("DB_SLOW_QUERY_MS", 200)),
+                    arquivo_log=os.getenv("DB_SLOW_QUERY_LOG", "slow_queries.log"),
+                )
+            if Database._preparados is None:
+                Database._preparados = PreparedStatementCache(
+                    capacidade=int(os.getenv("DB_PREPARED_CACHE_SIZE", 32))
+                )
+            if Database._resultados is None:
+                Database._resultados = ResultCache(
+                    capacidade=int(os.getenv("DB_RESULT_CACHE_SIZE", 128)),
+                    ttl=float(os.getenv("DB_RESULT_CACHE_TTL", 30)),
+                )
+        self.pool = Database._pool
+        self.disjuntor = Database._disjuntor
+        self.estatisticas = Database._estatisticas
+        self.preparados = Database._preparados
+        self.resultados = Database._resultados
+        # Conexão e cursor retirados do pool pela thread atual
+        self._local = threading.local()
+        self.verificarConexao()
+        self.migrarSchema()
+
+    @property
+    def connection(self):
+        """Conexão retirada do pool pela thread atual, ou None fora de `conexao()`."""
+        return getattr(self._local, "connection", None)
+
+    @property
+    def cursor(self):
+        """Cursor ativo da thread atual, ou None fora de `conexao()`."""
+        return getattr(self._local, "cursor", None)
+
+    # METODOS:
+    @staticmethod
+    def _criarConexao():
+        """Abre uma nova conexão com o banco de dados configurado em DB_BACKEND.
+
+        No modo "sqlite" as tabelas do modelo lógico são criadas na primeira
+        conexão, e os comandos dos models são traduzidos do dialeto MySQL.
+        """
+        print("🌐 Estabelecendo nova conexão com o banco de dados...")
+        if os.getenv("DB_BACKEND", "mysql").lower() == "sqlite":
+            return sqliteBackend.conectar(
+                os.getenv("DB_SQLITE_PATH", "coffeshop.sqlite3"), ARQUIVO_SCHEMA
+            )
+        return mysql.connector.connect(
             host=os.getenv("DB_HOST"),
             user=os.getenv("DB_USER"),
             password=os.getenv("DB_PASSWORD"),
             database=os.getenv("DB_DATABASE"),
+            connection_timeout=int(os.getenv("DB_CONNECT_TIMEOUT", 3)),
         )
-        self.cursor = self.connection.cursor(dictionary=True)
-        self.verificarConexao()
 
-    # METODOS:
-    def verificarConexao(self):
-        """Verifica se a conexão com o banco de dados está ativa.
+    @staticmethod
+    def _abrirConexao():
+        """Abre uma conexão para o pool passando pelo disjuntor.
 
         Raises:
-            mysql.connector.Error: Se houver erro ao verificar a conexão.
+            CircuitoAbertoError: Se o banco estiver marcado como fora do ar.
+            mysql.connector.Error: Se a conexão falhar (a falha é contada no disjuntor).
         """
+        disjuntor = Database._disjuntor
+        disjuntor.permitir()
         try:
-            if self.connection.is_connected():
-                print("✅ Conexao estabelecida com sucesso")
+            conexao = Database._criarConexao()
         except mysql.connector.Error as e:
-            self.garantir_conexao()
-            print(f"❌ Erro ao se conectar ao Banco de dados: \n {e}")
+            disjuntor.registrar_falha(e)
+            raise
+        disjuntor.registrar_sucesso()
+        return conexao
+
+    @staticmethod
+    def _sondarBanco():
+        """Sonda do disjuntor: abre e fecha uma conexão para testar o banco."""
+        Database._criarConexao().close()
+
+    @staticmethod
+    def _conexaoViva(conexao) -> bool:
+        """Health check do checkout: faz um ping sem tentar reconectar."""
+        try:
+            conexao.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    @contextmanager
+    def conexao(self):
+        """Retira uma conexão do pool (checkout) e a devolve ao final do bloco (checkin).
+
+        Chamadas aninhadas na mesma thread reaproveitam a conexão já retirada,
+        recebendo apenas um novo cursor. Ao devolver a conexão, qualquer transação
+        não confirmada é desfeita para que a próxima leitura não enxergue um
+        snapshot antigo.
+
+        Todo comando executado pelo cursor é medido em `self.estatisticas`,
+        assim como o tempo gasto no checkout. Escritas invalidam o cache de
+        resultados das tabelas afetadas.
+
+        Se a conexão cair durante o bloco ela é descartada, sem rollback, e a
+        falha é contada no disjuntor.
+
+        Yields:
+            cursor: Cursor em modo dicionário ligado à conexão retirada.
+
+        Raises:
+            CircuitoAbertoError: Se o banco estiver fora do ar (falha na hora).
+            mysql.connector.Error: Se não for possível obter uma conexão do pool.
+        """
+        local = self._local
+        conexao_externa = self.connection
+        cursor_externo = self.cursor
+        perdida = None
+
+        if conexao_externa is not None:
+            conexao = conexao_externa
+        else:
+            self.disjuntor.permitir()
+            inicio = time.perf_counter()
+            conexao = self.pool.checkout()
+            self.estatisticas.registrar_checkout((time.perf_counter() - inicio) * 1000)
+        try:
+            cursor = InstrumentedCursor(
+                conexao.cursor(dictionary=True, buffered=True),
+                self.estatisticas,
+                ao_escrever=self._registrarEscrita,
+            )
+        except mysql.connector.Error:
+            if conexao_externa is None:
+                self.pool.checkin(conexao, descartar=True)
+            raise
+
+        local.connection, local.cursor = conexao, cursor
+        try:
+            yield cursor
+        except BaseException as e:
+            # Um erro dentro de uma transação condena a unidade de trabalho inteira,
+            # mesmo que o model capture a exceção e apenas retorne False/None.
+            if getattr(local, "transacao", False):
+                local.somente_rollback = True
+            if _falhaDeConexao(e):
+                perdida = e
+            raise
+        finally:
+            local.cursor = cursor_externo
+            try:
+                cursor.close()
+            except mysql.connector.Error:
+                pass
+
+            if conexao_externa is None:
+                local.connection = None
+                descartar = perdida is not None
+                if descartar:
+                    self.disjuntor.registrar_falha(perdida)
+                else:
+                    try:
+                        conexao.rollback()
+                    except mysql.connector.Error:
+                        descartar = True
+                self.pool.checkin(conexao, descartar=descartar)
+                self._invalidarPendentes()
+                # O que não foi confirmado até aqui foi desfeito
+                local.ao_confirmar = []
+
+    @contextmanager
+    def transaction(self):
+        """Agrupa várias chamadas de models em uma única transação (unidade de trabalho).
+
+        Todas as chamadas feitas dentro do bloco, na mesma thread, compartilham a
+        mesma conexão do pool. Os `commit()` dos models são adiados e apenas um
+        commit é feito ao final do bloco. Se qualquer comando falhar, mesmo que o
+        model trate o erro internamente, tudo é desfeito. Transações aninhadas
+        participam da transação mais externa.
+
+        Yields:
+            cursor: Cursor em modo dicionário ligado à conexão da transação.
+
+        Raises:
+            mysql.connector.Error: Se a transação precisar ser desfeita por falha em
+                algum comando executado dentro dela.
+        """
+        local = self._local
+        if getattr(local, "transacao", False):
+            with self.conexao() as cursor:
+                yield cursor
+            return
+
+        with self.conexao() as cursor:
+            local.transacao, local.somente_rollback = True, False
+            try:
+                yield cursor
+                if local.somente_rollback:
+                    raise mysql.connector.errors.DatabaseError(
+                        msg="Transação desfeita: um dos comandos falhou."
+                    )
+                self.connection.commit()
+            except BaseException:
+                self.connection.rollback()
+                local.ao_confirmar = []
+                raise
+            finally:
+                local.transacao, local.somente_rollback = False, False
+            self._executarAoConfirmar()
+
+    def consultarPreparado(self, sql: str, params: tuple = (), unico: bool = False):
+        """Executa uma consulta usando um prepared statement do servidor.
+
+        O statement fica no cache da conexão (LRU por texto SQL), então chamadas
+        repetidas fazem apenas um EXECUTE, sem nova análise do comando pelo MySQL.
+        Indicado para buscas pontuais muito frequentes.
+
+        Args:
+            sql (str): Comando SELECT com placeholders %s.
+            params (tuple): Valores dos placeholders.
+            unico (bool): Se True, retorna apenas a primeira linha (ou None).
+
+        Returns:
+            list | dict | None: Linhas como dicionários, ou a primeira linha se `unico`.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        with self.conexao():
+            conexao = self.connection
+            sql_cache, cursor = self.preparados.obter(conexao, sql)
+            try:
+                instrumentado = InstrumentedCursor(
+                    cursor, self.estatisticas, ao_escrever=self._registrarEscrita
+                )
+                instrumentado.execute(sql_cache, params)
+                linhas = instrumentado.fetchall()
+            except mysql.connector.Error:
+                # O statement pode ter se perdido no servidor (ex.: reconexão)
+                self.preparados.descartar(conexao, sql)
+                raise
+        if unico:
+            return linhas[0] if linhas else None
+        return linhas
+
+    def _registrarEscrita(self, tabelas: frozenset):
+        """Invalida o cache das tabelas escritas pela thread atual.
+
+        As tabelas ficam pendentes até o commit ou a devolução da conexão, quando
+        são invalidadas de novo: assim uma leitura feita por outra thread antes
+        do commit (que ainda vê os dados antigos) não sobrevive no cache.
+        """
+        self.resultados.invalidar(tabelas)
+        pendentes = getattr(self._local, "tabelas_pendentes", None)
+        if pendentes is None:
+            pendentes = self._local.tabelas_pendentes = set()
+        pendentes.update(tabelas)
+
+    def _invalidarPendentes(self):
+        pendentes = getattr(self._local, "tabelas_pendentes", None)
+        if pendentes:
+            self.resultados.invalidar(frozenset(pendentes))
+            pendentes.clear()
+
+    def consultarComCache(self, sql: str, params: tuple = (), ttl: float = None) -> list:
+        """Executa uma consulta reaproveitando o resultado de uma execução recente.
+
+        O resultado é guardado pelo SQL + parâmetros junto com as tabelas lidas,
+        e é descartado ao vencer o TTL, ao sair do LRU ou quando qualquer
+        INSERT/UPDATE/DELETE feito pelo Database toca uma dessas tabelas.
+        Dentro de uma transação, ou com escritas ainda não confirmadas na
+        thread, a consulta vai direto ao banco.
+
+        Args:
+            sql (str): Comando SELECT com placeholders %s.
+            params (tuple): Valores dos placeholders.
+            ttl (float, optional): Validade do resultado, em segundos. Se None,
+                usa DB_RESULT_CACHE_TTL.
+
+        Returns:
+            list: Linhas como dicionários (cópias, podem ser alteradas).
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        params = tuple(params)
+        local = self._local
+        usar_cache = (
+            (self.resultados.ttl if ttl is None else ttl) > 0
+            and not getattr(local, "transacao", False)
+            and not getattr(local, "tabelas_pendentes", None)
+        )
+        if usar_cache:
+            chave = (sql, params)
+            linhas = self.resultados.obter(chave)
+            if linhas is not None:
+                return linhas
+            tabelas = tabelas_do_sql(sql)
+            versao = self.resultados.versao(tabelas)
 
-    def abrirConexao(self):
-        """Abre (ou reabre) a conexão com o banco de dados MySQL e o cursor.
+        with self.conexao() as cursor:
+            cursor.execute(sql, params)
+            linhas = cursor.fetchall()
 
-        Este método é seguro para ser chamado após uma desconexão ou falha na conexão.
-        Ele atualiza `self.connection` e `self.cursor` com uma nova sessão.
+        if usar_cache:
+            self.resultados.guardar(chave, tabelas, linhas, versao, ttl)
+        return linhas
+
+    def estatisticas_cache(self) -> dict:
+        """Contadores do cache de resultados de `consultarComCache`.
+
+        Returns:
+            dict: 'acertos', 'falhas', 'taxa_acerto', 'invalidacoes' e 'entradas'.
+        """
+        return self.resultados.estatisticas()
+
+    def iterarConsulta(self, sql: str, params: tuple = (), tamanho_lote: int = 500):
+        """Executa uma consulta e entrega as linhas aos poucos (gerador).
+
+        Usa um cursor sem buffer e `fetchmany(tamanho_lote)`, então só um lote
+        fica em memória por vez, seja qual for o tamanho do resultado.
+
+        Enquanto o resultado não é lido até o fim a conexão não aceita outros
+        comandos, por isso a consulta usa uma conexão própria do pool, separada
+        da conexão da thread. Se o consumidor parar antes do fim, essa conexão é
+        descartada em vez de voltar ao pool com linhas pendentes.
+
+        Args:
+            sql (str): Comando SELECT com placeholders %s.
+            params (tuple): Valores dos placeholders.
+            tamanho_lote (int): Linhas buscadas no servidor a cada fetchmany.
+
+        Yields:
+            dict: Cada linha do resultado.
 
         Raises:
-            mysql.connector.Error: Se ocorrer erro na conexão com o banco.
+            mysql.connector.Error: Se ocorrer erro na consulta.
         """
+        self.disjuntor.permitir()
+        inicio = time.perf_counter()
+        conexao = self.pool.checkout()
+        self.estatisticas.registrar_checkout((time.perf_counter() - inicio) * 1000)
+
+        descartar = True
         try:
-            print("🌐 Estabelecendo nova conexão com o banco de dados...")
-            self.connection = mysql.connector.connect(
-                host=os.getenv("DB_HOST"),
-                user=os.getenv("DB_USER"),
-                password=os.getenv("DB_PASSWORD"),
-                database=os.getenv("DB_DATABASE"),
+            cursor = InstrumentedCursor(
+                conexao.cursor(dictionary=True, buffered=False), self.estatisticas
             )
-            self.cursor = self.connection.cursor(dictionary=True)
-            print("✅ Nova conexão estabelecida com sucesso.")
+            cursor.execute(sql, params)
+            while True:
+                lote = cursor.fetchmany(tamanho_lote)
+                if not lote:
+                    break
+                yield from lote
+            cursor.close()
+            conexao.rollback()
+            descartar = False
         except mysql.connector.Error as e:
-            print(f"❌ Falha ao abrir a conexão com o banco: {e}")
+            if _falhaDeConexao(e):
+                self.disjuntor.registrar_falha(e)
             raise
+        finally:
+            self.pool.checkin(conexao, descartar=descartar)
 
-    def fecharConexao(self):
-        """Fecha a conexão com o banco de dados.
+    def commit(self):
+        """Confirma a transação da conexão atual.
+
+        Dentro de `transaction()` o commit é adiado para o final do bloco.
+        """
+        if not getattr(self._local, "transacao", False):
+            self.connection.commit()
+            self._invalidarPendentes()
+            self._executarAoConfirmar()
+
+    def aoConfirmar(self, callback):
+        """Agenda `callback()` para depois do commit da conexão/transação atual.
+
+        Se o trabalho for desfeito (rollback ou conexão devolvida sem commit),
+        o callback é descartado. Fora de `conexao()` ele roda na hora.
+
+        Args:
+            callback (callable): Função sem argumentos.
+        """
+        if self.connection is None:
+            callback()
+            return
+        pendentes = getattr(self._local, "ao_confirmar", None)
+        if pendentes is None:
+            pendentes = self._local.ao_confirmar = []
+        pendentes.append(callback)
+
+    def _executarAoConfirmar(self):
+        pendentes = getattr(self._local, "ao_confirmar", None)
+        if not pendentes:
+            return
+        self._local.ao_confirmar = []
+        for callback in pendentes:
+            try:
+                callback()
+            except Exception as e:
+                print(f"❌ Erro em uma ação após o commit: \n{e}")
+
+    def top_consultas(self, n: int = 10) -> list:
+        """Retorna os N comandos SQL que mais consumiram tempo desde o início.
+
+        Args:
+            n (int): Quantidade de comandos a retornar.
+
+        Returns:
+            list: Dicionários com 'sql', 'chamadas', 'total_ms', 'media_ms', 'max_ms' e 'linhas'.
+        """
+        return self.estatisticas.top(n)
+
+    def imprimir_top_consultas(self, n: int = 10):
+        """Imprime os N comandos SQL mais custosos e o tempo de checkout do pool."""
+        checkout = self.estatisticas.checkout()
+        print(
+            f"📊 Checkout do pool: {checkout['chamadas']} chamadas, "
+            f"{checkout['total_ms']:.1f}ms no total, máx {checkout['max_ms']:.1f}ms"
+        )
+        cache = self.estatisticas_cache()
+        print(
+            f"📦 Cache de resultados: {cache['acertos']} acertos, {cache['falhas']} falhas "
+            f"({cache['taxa_acerto']:.0%}), {cache['invalidacoes']} invalidações, "
+            f"{cache['entradas']} entradas"
+        )
+        for posicao, comando in enumerate(self.top_consultas(n), start=1):
+            print(
+                f"{posicao:>3}. {comando['total_ms']:>9.1f}ms total | "
+                f"{comando['chamadas']:>5}x | média {comando['media_ms']:.1f}ms | "
+                f"máx {comando['max_ms']:.1f}ms | {comando['linhas']} linhas\n"
+                f"     {comando['sql']}"
+            )
+
+    def verificarConexao(self):
+        """Verifica se a conexão com o banco de dados está ativa.
 
         Raises:
-            mysql.connector.Error: Se ocorrer erro ao fechar a conexão.
+            mysql.connector.Error: Se houver erro ao verificar a conexão.
         """
         try:
-            if self.cursor:
-                self.cursor.close()
-            if self.connection and self.connection.is_connected():
-                self.connection.close()
-            print("🔒 Conexão encerrada.")
+            with self.conexao():
+                self.garantir_conexao()
+                print("✅ Conexao estabelecida com sucesso")
         except mysql.connector.Error as e:
-            print(f"❌ Erro ao fechar a conexão: {e}")
+            print(f"❌ Erro ao se conectar ao Banco de dados: \n {e}")
+
+    def migrarSchema(self):
+        """Atualiza o schema de bancos antigos (uma vez por processo).
+
+        Veja `src.database.migrations`. Se o banco estiver fora do ar, tenta de
+        novo na próxima instância de Database.
+        """
+        with Database._pool_lock:
+            if Database._migrado:
+                return
+            try:
+                aplicar_migracoes(self)
+                Database._migrado = True
+            except mysql.connector.Error as e:
+                print(f"❌ Erro ao atualizar o schema do banco de dados: \n {e}")
+
+    def fecharConexao(self):
+        """Fecha as conexões ociosas mantidas pelo pool.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro ao fechar a conexão.
+        """
+        self.pool.fechar()
+        print("🔒 Conexões do pool encerradas.")
 
     def garantir_conexao(self):
-        """garante a conexão"""
-        if not self.connection.is_connected():
+        """garante que a conexão retirada pela thread atual está ativa
+
+        Faz uma única tentativa de reconexão, limitada por DB_CONNECT_TIMEOUT.
+        Se falhar, a falha é contada no disjuntor e o erro é propagado.
+        """
+        conexao = self.connection
+        if conexao is not None and not conexao.is_connected():
             print("🔄 Reconectando ao banco de dados...")
-            self.connection.reconnect(attempts=3, delay=2)
-        if not hasattr(self, "cursor") or self.cursor is None:
-            self.cursor = self.connection.cursor()
+            self.disjuntor.permitir()
+            # Os prepared statements morrem junto com a sessão antiga
+            self.preparados.descartar(conexao)
+            try:
+                conexao.reconnect(attempts=1, delay=0)
+            except mysql.connector.Error as e:
+                self.disjuntor.registrar_falha(e)
+                raise
+
+    def estado_conexao(self) -> dict:
+        """Estado do disjuntor do banco, para exibição na interface.
+
+        Returns:
+            dict: 'estado' ("fechado", "aberto" ou "meio_aberto"), 'falhas',
+                'proxima_tentativa_s' e 'ultimo_erro'.
+        """
+        return self.disjuntor.status()
 
     def searchIDFromDataBase(self, cpf: str, coluna: str, tabela: str):
         """Busca o ID  no banco baseado no cpf
@@ -93,16 +602,64 @@ class Database:
             mysql.connector.Error: Se ocorrer erro na consulta.
         """
         try:
-            self.abrirConexao()
             sql = f"SELECT {coluna} FROM {tabela} WHERE cpf = %s"
-            self.cursor.execute(sql, (cpf,))
-            resultado = self.cursor.fetchone()
+            resultado = self.consultarPreparado(sql, (cpf,), unico=True)
             return resultado[coluna] if resultado else None
         except mysql.connector.Error as e:
             print(f"❌ Erro ao buscar telefone do cliente: \n {e}")
             return None
-        finally:
-            self.fecharConexao()
+
+    def inserirRegistros(
+        self,
+        tabela: str,
+        colunas: list,
+        linhas: list,
+        ignorar_duplicados: bool = False,
+        somar_duplicados: list = None,
+        atualizar_duplicados: list = None,
+    ) -> int:
+        """
+        Insere várias linhas em uma tabela com um único INSERT de múltiplos VALUES.
+
+        Args:
+            tabela (str): Nome da tabela.
+            colunas (list): Nomes das colunas, na ordem dos valores de cada linha.
+            linhas (list): Lista de tuplas com os valores de cada linha.
+            ignorar_duplicados (bool): Se True, usa INSERT IGNORE e linhas que já
+                existem (chave duplicada) são ignoradas em vez de gerar erro.
+            somar_duplicados (list, optional): Colunas que, quando a linha já
+                existe, recebem a soma do valor atual com o novo
+                (INSERT ... ON DUPLICATE KEY UPDATE col = col + VALUES(col)).
+            atualizar_duplicados (list, optional): Colunas que, quando a linha já
+                existe, são substituídas pelo valor novo (col = VALUES(col)).
+
+        Returns:
+            int: Linhas afetadas, como informado pelo banco. Com
+                `somar_duplicados`/`atualizar_duplicados`, o MySQL conta 2 para
+                cada linha atualizada.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro ao executar a inserção.
+        """
+        if not linhas:
+            return 0
+
+        placeholders = "(" + ", ".join(["%s"] * len(colunas)) + ")"
+        comando = "INSERT IGNORE" if ignorar_duplicados else "INSERT"
+        sql = (
+            f"{comando} INTO `{tabela}` ({', '.join(f'`{c}`' for c in colunas)}) "
+            f"VALUES {', '.join([placeholders] * len(linhas))}"
+        )
+        atribuicoes = [f"`{c}` = `{c}` + VALUES(`{c}`)" for c in somar_duplicados or []]
+        atribuicoes += [f"`{c}` = VALUES(`{c}`)" for c in atualizar_duplicados or []]
+        if atribuicoes:
+            sql += " ON DUPLICATE KEY UPDATE " + ", ".join(atribuicoes)
+        valores = tuple(valor for linha in linhas for valor in linha)
+
+        with self.conexao() as cursor:
+            cursor.execute(sql, valores)
+            self.commit()
+            return cursor.rowcount
 
     def atualizarRegistro(
         self, tabela: str, valores_dict: dict, campo_where: str, valor_where
@@ -126,39 +683,24 @@ class Database:
             print("⚠️ Nenhum campo foi fornecido para atualização.")
             return False
 
-        try:
-            self.abrirConexao()
-
-            if not valores_dict:
-                print("⚠️ Nenhum valor fornecido para atualizar.")
-                return False
-
-            # Prepara os campos e valores
-            campos_sql = [f"`{campo}` = %s" for campo in valores_dict.keys()]
-            valores = list(valores_dict.values())
-            valores.append(valor_where)
-
-            # Comando SQL seguro
-            sql = f"UPDATE `{tabela}` SET {', '.join(campos_sql)} WHERE `{campo_where}` = %s"
+        # Prepara os campos e valores
+        campos_sql = [f"`{campo}` = %s" for campo in valores_dict.keys()]
+        valores = list(valores_dict.values())
+        valores.append(valor_where)
 
-            try:
-                self.cursor.execute(sql, tuple(valores))
-                self.connection.commit()
-                print(f"✅ Registro atualizado com sucesso na tabela '{tabela}'!")
-                return True
-            except mysql.connector.Error as e:
-                print(f"❌ Erro ao atualizar registro na tabela '{tabela}': {e.msg}")
-                return False
-            finally:
-                self.fecharConexao()
+        # Comando SQL seguro
+        sql = f"UPDATE `{tabela}` SET {', '.join(campos_sql)} WHERE `{campo_where}` = %s"
 
+        try:
+            with self.conexao() as cursor:
+                cursor.execute(sql, tuple(valores))
+                self.commit()
+            print(f"✅ Registro atualizado com sucesso na tabela '{tabela}'!")
+            return True
         except mysql.connector.Error as e:
             print(f"❌ Erro ao atualizar registro na tabela '{tabela}':\n{e}")
             return False
 
-        finally:
-            self.fecharConexao()
-
 
 # exemplo de uso
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+from mysql.connector.errors import PoolError
+
+
+class ConnectionPool:
+    """Pool de conexões persistentes com o banco de dados.
+
+    As conexões são criadas sob demanda até o limite `tamanho` e reaproveitadas
+    entre as chamadas dos models, evitando um novo handshake (TCP + autenticação)
+    a cada consulta.
+
+    Atributos:
+        tamanho (int): Número máximo de conexões abertas ao mesmo tempo.
+        max_ocioso (float): Tempo máximo, em segundos, que uma conexão pode ficar
+            parada no pool antes de ser descartada.
+        timeout (float): Tempo máximo, em segundos, de espera por uma conexão livre.
+        verificar_apos (float): Conexões paradas há mais que isso, em segundos,
+            passam pelo health check antes de serem entregues.
+    """
+
+    def __init__(
+        self,
+        fabrica,
+        tamanho: int,
+        max_ocioso: float,
+        timeout: float,
+        verificar=None,
+        verificar_apos: float = 0.0,
+    ):
+        """Inicializa o pool.
+
+        Args:
+            fabrica (callable): Função sem argumentos que abre uma nova conexão.
+            tamanho (int): Número máximo de conexões abertas.
+            max_ocioso (float): Tempo máximo ocioso de uma conexão, em segundos.
+            timeout (float): Tempo máximo de espera no checkout, em segundos.
+            verificar (callable, optional): Health check `verificar(conexao) -> bool`
+                (ex.: ping). Conexões reprovadas são fechadas e substituídas.
+            verificar_apos (float): Tempo ocioso mínimo para fazer o health check.
+        """
+        self._fabrica = fabrica
+        self.tamanho = max(1, tamanho)
+        self.max_ocioso = max_ocioso
+        self.timeout = timeout
+        self._verificar = verificar
+        self.verificar_apos = verificar_apos
+
+        self._livres = deque()  # (conexao, momento_da_devolucao)
+        self._abertas = 0
+        self._condicao = threading.Condition()
+
+    def checkout(self):
+        """Retira uma conexão do pool, abrindo uma nova se houver vaga.
+
+        Conexões que ficaram ociosas por mais de `max_ocioso` segundos são
+        fechadas e substituídas. As que ficaram paradas mais que
+        `verificar_apos` segundos passam pelo health check antes da entrega.
+
+        Returns:
+            Uma conexão pronta para uso.
+
+        Raises:
+            mysql.connector.errors.PoolError: Se nenhuma conexão ficar livre dentro do timeout.
+            mysql.connector.Error: Se ocorrer erro ao abrir uma nova conexão.
+        """
+        prazo = time.monotonic() + self.timeout
+        while True:
+            conexao, ociosa_por = self._retirar(prazo)
+            if conexao is None:
+                break
+            if (
+                self._verificar is None
+                or ociosa_por <= self.verificar_apos
+                or self._verificar(conexao)
+            ):
+                return conexao
+            # Reprovada no health check: fecha e tenta a próxima
+            self.checkin(conexao, descartar=True)
+
+        try:
+            return self._fabrica()
+        except Exception:
+            with self._condicao:
+                self._abertas -= 1
+                self._condicao.notify()
+            raise
+
+    def _retirar(self, prazo: float):
+        """Retira uma conexão livre ou reserva vaga para abrir uma nova.
+
+        Returns:
+            tuple: (conexao, segundos_ociosa), ou (None, 0) quando uma vaga foi
+                reservada e a conexão deve ser criada pela fábrica.
+        """
+        expiradas = []
+        try:
+            with self._condicao:
+                while True:
+                    agora = time.monotonic()
+                    while self._livres:
+                        conexao, devolvida_em = self._livres.pop()
+                        if agora - devolvida_em <= self.max_ocioso:
+                            return conexao, agora - devolvida_em
+                        expiradas.append(conexao)
+                        self._abertas -= 1
+
+                    if self._abertas < self.tamanho:
+                        self._abertas += 1
+                        return None, 0.0
+
+                    restante = prazo - agora
+                    if restante <= 0:
+                        raise PoolError(
+                            msg=f"Nenhuma conexão livre no pool após {self.timeout}s"
+                        )
+                    self._condicao.wait(restante)
+        finally:
+            for conexao in expiradas:
+                self._fechar(conexao)
+
+    def checkin(self, conexao, descartar: bool = False):
+        """Devolve uma conexão ao pool.
+
+        Args:
+            conexao: Conexão retirada anteriormente com `checkout`.
+            descartar (bool): Se True, fecha a conexão em vez de reaproveitá-la.
+        """
+        with self._condicao:
+            if descartar:
+                self._abertas -= 1
+            else:
+                self._livres.append((conexao, time.monotonic()))
+            self._condicao.notify()
+
+        if descartar:
+            self._fechar(conexao)
+
+    def fechar(self):
+        """Fecha todas as conexões ociosas do pool."""
+        with self._condicao:
+            livres = [conexao for conexao, _ in self._livres]
+            self._livres.clear()
+            self._abertas -= len(livres)
+            self._condicao.notify_all()
+
+        for conexao in livres:
+            self._fechar(conexao)
+
+    @staticmethod
+    def _fechar(conexao):
+        try:
+            conexao.close()
+        except mysql.connector.Error as e:
+            print(f"❌ Erro ao fechar conexão do pool: {e}")
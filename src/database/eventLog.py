@@ -0,0 +1,107 @@
+import atexit
+import threading
+
+import mysql.connector
+
+
+class EventLog:
+    """Registro append-only gravado no banco em lotes, fora da thread que gera os eventos.
+
+    `registrar` só coloca o evento em memória. Uma thread própria grava os
+    eventos acumulados com um único INSERT de múltiplos VALUES a cada
+    `intervalo` segundos, ou antes disso quando um lote enche. Ao encerrar o
+    processo o que restou é gravado (atexit).
+
+    Se a gravação falhar (ex.: banco fora do ar) os eventos voltam para a fila
+    e são tentados de novo no próximo ciclo; acima de `max_pendentes` os mais
+    antigos são descartados para a memória não crescer sem limite.
+    """
+
+    def __init__(
+        self,
+        db,
+        tabela: str,
+        colunas: list,
+        tamanho_lote: int = 50,
+        intervalo: float = 5.0,
+        max_pendentes: int = 10000,
+    ):
+        """Inicializa o registro.
+
+        Args:
+            db (Database): Acesso ao banco de dados.
+            tabela (str): Tabela onde os eventos são inseridos.
+            colunas (list): Colunas, na ordem dos valores passados a `registrar`.
+            tamanho_lote (int): Eventos por INSERT; um lote cheio é gravado na hora.
+            intervalo (float): Segundos máximos que um evento espera em memória.
+            max_pendentes (int): Eventos mantidos em memória enquanto o banco falha.
+        """
+        self.db = db
+        self.tabela = tabela
+        self.colunas = list(colunas)
+        self.tamanho_lote = max(1, tamanho_lote)
+        self.intervalo = intervalo
+        self.max_pendentes = max(self.tamanho_lote, max_pendentes)
+        self._lock = threading.Lock()
+        self._lock_gravacao = threading.Lock()
+        self._acordar = threading.Event()
+        self._pendentes = []
+        self._descartados = 0
+        self._thread = None
+        atexit.register(self.descarregar)
+
+    def registrar(self, *valores):
+        """Acrescenta um evento (valores na ordem de `colunas`) à fila de gravação."""
+        with self._lock:
+            self._pendentes.append(valores)
+            self._limitar()
+            cheio = len(self._pendentes) >= self.tamanho_lote
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._rodar, name=f"eventos-{self.tabela}", daemon=True
+                )
+                self._thread.start()
+        if cheio:
+            self._acordar.set()
+
+    def descarregar(self) -> int:
+        """Grava agora todos os eventos pendentes.
+
+        Returns:
+            int: Quantidade de eventos gravados.
+        """
+        with self._lock_gravacao:
+            with self._lock:
+                eventos, self._pendentes = self._pendentes, []
+            gravados = 0
+            try:
+                for inicio in range(0, len(eventos), self.tamanho_lote):
+                    lote = eventos[inicio : inicio + self.tamanho_lote]
+                    self.db.inserirRegistros(self.tabela, self.colunas, lote)
+                    gravados += len(lote)
+            except mysql.connector.Error as e:
+                print(f"❌ Erro ao gravar eventos em {self.tabela}, nova tentativa em breve: \n{e}")
+                with self._lock:
+                    self._pendentes[:0] = eventos[gravados:]
+                    self._limitar()
+            return gravados
+
+    def pendentes(self) -> int:
+        """Eventos ainda não gravados."""
+        with self._lock:
+            return len(self._pendentes)
+
+    def _limitar(self):
+        # Chamado com self._lock
+        excesso = len(self._pendentes) - self.max_pendentes
+        if excesso > 0:
+            del self._pendentes[:excesso]
+            self._descartados += excesso
+            print(f"⚠️ {self._descartados} evento(s) de {self.tabela} descartados: banco indisponível.")
+
+    def _rodar(self):
+        while True:
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+            if self.pendentes():
+                self.descarregar()
@@ -0,0 +1,225 @@
+import mysql.connector
+
+
+def _microssegundos(tabela: str, coluna: str, definicao: str) -> tuple:
+    """Migração que passa uma coluna DATETIME para DATETIME(6)."""
+    return (
+        f"{tabela}.{coluna} DATETIME(6)",
+        f"""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = '{tabela}'
+        AND COLUMN_NAME = '{coluna}' AND DATETIME_PRECISION < 6
+        """,
+        [f"ALTER TABLE {tabela} MODIFY {coluna} {definicao}"],
+    )
+
+
+def _indice(nome: str, tabela: str, colunas: str) -> tuple:
+    """Migração que cria o índice `nome` se ele ainda não existe."""
+    return (
+        nome,
+        f"""
+        SELECT 1 FROM DUAL WHERE NOT EXISTS (
+            SELECT 1 FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = '{tabela}'
+            AND INDEX_NAME = '{nome}'
+        )
+        """,
+        [f"CREATE INDEX {nome} ON {tabela} ({colunas})"],
+    )
+
+
+# Alterações de schema aplicadas a bancos criados com versões antigas do
+# "modelo logico cafeteria.sql". Cada migração tem uma consulta de verificação
+# e os comandos que a aplicam. A migração está pendente quando a verificação
+# falha com "coluna/tabela desconhecida" ou quando retorna alguma linha.
+# Rodar de novo não altera nada.
+MIGRACOES = [
+    (
+        "Pedidos.criado_em",
+        "SELECT criado_em FROM Pedidos LIMIT 0",
+        ["ALTER TABLE Pedidos ADD COLUMN criado_em DATETIME(6)"],
+    ),
+    (
+        "Pedidos_Alteracoes",
+        "SELECT id FROM Pedidos_Alteracoes LIMIT 0",
+        [
+            """
+            CREATE TABLE Pedidos_Alteracoes (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                pedido_id INT NOT NULL,
+                excluido BOOLEAN NOT NULL DEFAULT FALSE
+            )
+            """
+        ],
+    ),
+    _indice("idx_pedidos_status", "Pedidos", "status_pedido, id_pedido"),
+    (
+        "Pedidos.status_pedido 'em preparo' -> 'em_preparo'",
+        "SELECT id_pedido FROM Pedidos WHERE status_pedido = 'em preparo' LIMIT 1",
+        ["UPDATE Pedidos SET status_pedido = 'em_preparo' WHERE status_pedido = 'em preparo'"],
+    ),
+    (
+        "Pedido_Pratos.quantidade",
+        "SELECT quantidade FROM Pedido_Pratos LIMIT 0",
+        ["ALTER TABLE Pedido_Pratos ADD COLUMN quantidade INT NOT NULL DEFAULT 1"],
+    ),
+    (
+        "Pedidos_Eventos",
+        "SELECT id FROM Pedidos_Eventos LIMIT 0",
+        [
+            """
+            CREATE TABLE Pedidos_Eventos (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                pedido_id INT NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                registrado_em DATETIME NOT NULL
+            )
+            """
+        ],
+    ),
+    _indice("idx_eventos_registrado_em", "Pedidos_Eventos", "registrado_em"),
+    (
+        "Pedidos_Historico",
+        "SELECT id_pedido FROM Pedidos_Historico LIMIT 0",
+        [
+            """
+            CREATE TABLE Pedidos_Historico (
+                id_pedido INT NOT NULL,
+                numMesa INT,
+                fk_colaborador BIGINT,
+                status_pedido VARCHAR(20),
+                criado_em DATETIME(6) NOT NULL,
+                arquivado_em DATETIME NOT NULL,
+                PRIMARY KEY (id_pedido, criado_em)
+            )
+            PARTITION BY RANGE COLUMNS(criado_em) (
+                PARTITION p_futuro VALUES LESS THAN (MAXVALUE)
+            )
+            """
+        ],
+    ),
+    (
+        "Pedido_Pratos_Historico",
+        "SELECT pedido_id FROM Pedido_Pratos_Historico LIMIT 0",
+        [
+            """
+            CREATE TABLE Pedido_Pratos_Historico (
+                pedido_id INT NOT NULL,
+                prato_id INT NOT NULL,
+                quantidade INT NOT NULL DEFAULT 1,
+                criado_em DATETIME(6) NOT NULL,
+                PRIMARY KEY (pedido_id, prato_id, criado_em)
+            )
+            PARTITION BY RANGE COLUMNS(criado_em) (
+                PARTITION p_futuro VALUES LESS THAN (MAXVALUE)
+            )
+            """
+        ],
+    ),
+    (
+        "Pedidos.versao",
+        "SELECT versao FROM Pedidos LIMIT 0",
+        ["ALTER TABLE Pedidos ADD COLUMN versao INT NOT NULL DEFAULT 0"],
+    ),
+    (
+        "Pedidos_Historico.versao",
+        "SELECT versao FROM Pedidos_Historico LIMIT 0",
+        ["ALTER TABLE Pedidos_Historico ADD COLUMN versao INT NOT NULL DEFAULT 0"],
+    ),
+    _indice("idx_pedidos_mesa_status", "Pedidos", "numMesa, status_pedido"),
+    (
+        "Catalogo_Versao",
+        "SELECT id FROM Catalogo_Versao LIMIT 0",
+        [
+            """
+            CREATE TABLE Catalogo_Versao (
+                id INT PRIMARY KEY,
+                versao INT NOT NULL DEFAULT 0
+            )
+            """
+        ],
+    ),
+    (
+        "Precos_Historico",
+        "SELECT id FROM Precos_Historico LIMIT 0",
+        [
+            """
+            CREATE TABLE Precos_Historico (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                prato_id INT NOT NULL,
+                preco DOUBLE,
+                vigente_desde DATETIME(6) NOT NULL
+            )
+            """
+        ],
+    ),
+    _indice("idx_precos_historico_prato", "Precos_Historico", "prato_id, vigente_desde"),
+    (
+        # Pendente enquanto houver prato sem histórico: sem histórico anterior,
+        # o preço atual vale para todos os pedidos já feitos
+        "Precos_Historico: preços iniciais",
+        """
+        SELECT p.id FROM Pratos p
+        WHERE NOT EXISTS (SELECT 1 FROM Precos_Historico h WHERE h.prato_id = p.id)
+        LIMIT 1
+        """,
+        [
+            """
+            INSERT INTO Precos_Historico (prato_id, preco, vigente_desde)
+            SELECT p.id, pr.preco, '1970-01-01 00:00:00'
+            FROM Pratos p JOIN Precos pr ON pr.id = p.fk_preco
+            WHERE NOT EXISTS (SELECT 1 FROM Precos_Historico h WHERE h.prato_id = p.id)
+            """
+        ],
+    ),
+    # Datas com microssegundos: um pedido e uma mudança de preço no mesmo
+    # segundo precisam ficar na ordem em que aconteceram
+    _microssegundos("Pedidos", "criado_em", "DATETIME(6)"),
+    _microssegundos("Pedidos_Historico", "criado_em", "DATETIME(6) NOT NULL"),
+    _microssegundos("Pedido_Pratos_Historico", "criado_em", "DATETIME(6) NOT NULL"),
+    _microssegundos("Precos_Historico", "vigente_desde", "DATETIME(6) NOT NULL"),
+]
+
+# ER_BAD_FIELD_ERROR e ER_NO_SUCH_TABLE do MySQL
+_ERROS_DE_SCHEMA = {1054, 1146}
+
+
+def _pendente(erro: mysql.connector.Error) -> bool:
+    """Indica se o erro da verificação significa que a migração falta."""
+    if erro.errno in _ERROS_DE_SCHEMA:
+        return True
+    # O backend SQLite converte "no such column/table" sem errno
+    mensagem = str(erro.msg or "").lower()
+    return "no such column" in mensagem or "no such table" in mensagem
+
+
+def aplicar_migracoes(db) -> list:
+    """Aplica as migrações que ainda não estão no banco.
+
+    Args:
+        db (Database): Acesso ao banco de dados.
+
+    Returns:
+        list: Nomes das migrações aplicadas nesta chamada.
+
+    Raises:
+        mysql.connector.Error: Se a verificação ou a migração falhar por outro motivo.
+    """
+    aplicadas = []
+    with db.conexao() as cursor:
+        for nome, verificacao, comandos in MIGRACOES:
+            try:
+                cursor.execute(verificacao)
+                if not cursor.fetchall():
+                    continue
+            except mysql.connector.Error as e:
+                if not _pendente(e):
+                    raise
+
+            for comando in comandos:
+                cursor.execute(comando)
+            db.commit()
+            print(f"🛠️ Migração aplicada: {nome}")
+            aplicadas.append(nome)
+    return aplicadas
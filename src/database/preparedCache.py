@@ -0,0 +1,88 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+import mysql.connector
+
+
+class PreparedStatementCache:
+    """Cache LRU de prepared statements do servidor, separado por conexão.
+
+    Cada conexão guarda até `capacidade` cursores preparados, indexados pelo
+    texto SQL. Na primeira chamada o MySQL faz PREPARE + EXECUTE; nas seguintes
+    apenas EXECUTE, sem precisar analisar o comando de novo. Ao sair do cache o
+    cursor é fechado, liberando o statement no servidor.
+
+    O cursor preparado do mysql-connector só reaproveita o statement quando
+    recebe o mesmo objeto str da execução anterior, por isso o cache devolve
+    também o texto SQL guardado, que deve ser o usado no execute.
+    """
+
+    def __init__(self, capacidade: int):
+        """Inicializa o cache.
+
+        Args:
+            capacidade (int): Número máximo de statements preparados por conexão.
+        """
+        self.capacidade = max(1, capacidade)
+        self._por_conexao = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def obter(self, conexao, sql: str):
+        """Retorna o cursor preparado para `sql` na conexão, criando-o se preciso.
+
+        Args:
+            conexao: Conexão retirada do pool pela thread atual.
+            sql (str): Comando SQL com placeholders %s.
+
+        Returns:
+            tuple: (sql, cursor) com o texto SQL guardado no cache e o cursor
+                preparado em modo dicionário.
+        """
+        with self._lock:
+            cursores = self._por_conexao.get(conexao)
+            if cursores is None:
+                cursores = self._por_conexao[conexao] = OrderedDict()
+
+        # Uma conexão só é usada por uma thread por vez, então o OrderedDict
+        # da conexão não precisa do lock.
+        entrada = cursores.get(sql)
+        if entrada is not None:
+            cursores.move_to_end(sql)
+            return entrada
+
+        entrada = cursores[sql] = (sql, conexao.cursor(prepared=True, dictionary=True))
+        while len(cursores) > self.capacidade:
+            _, (_, antigo) = cursores.popitem(last=False)
+            self._fechar(antigo)
+        return entrada
+
+    def descartar(self, conexao, sql: str = None):
+        """Remove do cache um statement (ou todos) de uma conexão.
+
+        Usado quando a conexão é refeita e os statements do servidor se perdem.
+
+        Args:
+            conexao: Conexão dona dos statements.
+            sql (str, optional): Comando a remover. Se None, remove todos.
+        """
+        with self._lock:
+            cursores = self._por_conexao.get(conexao)
+            if cursores is None:
+                return
+            if sql is None:
+                removidos = [cursor for _, cursor in cursores.values()]
+                cursores.clear()
+            else:
+                removido = cursores.pop(sql, None)
+                removidos = [removido[1]] if removido is not None else []
+
+        for cursor in removidos:
+            self._fechar(cursor)
+
+    @staticmethod
+    def _fechar(cursor):
+        try:
+            cursor.close()
+        except mysql.connector.Error:
+            pass
@@ -0,0 +1,190 @@
+import logging
+import re
+import threading
+import time
+
+from src.database.resultCache import eh_escrita, tabelas_do_sql
+
+# Literais e listas de valores são trocados por "?" para agrupar
+# comandos que só diferem nos valores.
+_RE_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_RE_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_LISTA = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)")
+_RE_VALUES = re.compile(r"(VALUES\s*\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+", re.IGNORECASE)
+_RE_ESPACOS = re.compile(r"\s+")
+
+
+def normalizar_sql(sql: str) -> str:
+    """Normaliza um comando SQL para agregação das estatísticas.
+
+    Args:
+        sql (str): Comando SQL como foi executado.
+
+    Returns:
+        str: Comando em uma linha, com literais e listas de valores substituídos.
+    """
+    texto = _RE_ESPACOS.sub(" ", sql).strip().rstrip(";")
+    texto = _RE_STRING.sub("?", texto)
+    texto = _RE_NUMERO.sub("?", texto)
+    texto = _RE_LISTA.sub("(...)", texto)
+    texto = _RE_VALUES.sub(r"\1", texto)
+    return texto
+
+
+class QueryStats:
+    """Coleta latência, linhas retornadas e tempo de checkout por comando SQL.
+
+    As estatísticas são agregadas pelo texto normalizado do comando. Comandos
+    que passam do limite configurado são gravados no log de consultas lentas.
+    """
+
+    def __init__(self, limite_lento_ms: float, arquivo_log: str):
+        """Inicializa o coletor.
+
+        Args:
+            limite_lento_ms (float): Latência, em milissegundos, a partir da qual o
+                comando é registrado no log de consultas lentas.
+            arquivo_log (str): Caminho do arquivo do log de consultas lentas.
+        """
+        self.limite_lento_ms = limite_lento_ms
+        self._lock = threading.Lock()
+        self._comandos = {}
+        self._checkout = {"chamadas": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+        self._log_lento = logging.getLogger("coffeshop.slow_query")
+        self._log_lento.propagate = False
+        if not self._log_lento.handlers:
+            handler = logging.FileHandler(arquivo_log, encoding="utf-8", delay=True)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self._log_lento.addHandler(handler)
+            self._log_lento.setLevel(logging.INFO)
+
+    def registrar_execucao(self, chave: str, duracao_ms: float, linhas: int = 0):
+        """Soma uma execução às estatísticas do comando normalizado `chave`."""
+        with self._lock:
+            estatistica = self._comandos.get(chave)
+            if estatistica is None:
+                estatistica = self._comandos[chave] = {
+                    "sql": chave,
+                    "chamadas": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "linhas": 0,
+                }
+            estatistica["chamadas"] += 1
+            estatistica["total_ms"] += duracao_ms
+            estatistica["max_ms"] = max(estatistica["max_ms"], duracao_ms)
+            estatistica["linhas"] += max(linhas, 0)
+
+        if duracao_ms >= self.limite_lento_ms:
+            self._log_lento.info("%.1fms %s", duracao_ms, chave)
+
+    def registrar_leitura(self, chave: str, duracao_ms: float, linhas: int):
+        """Soma o tempo e as linhas de um fetch ao comando normalizado que os gerou."""
+        with self._lock:
+            estatistica = self._comandos.get(chave)
+            if estatistica is not None:
+                estatistica["total_ms"] += duracao_ms
+                estatistica["linhas"] += linhas
+
+    def registrar_checkout(self, duracao_ms: float):
+        """Soma o tempo gasto para obter uma conexão do pool."""
+        with self._lock:
+            self._checkout["chamadas"] += 1
+            self._checkout["total_ms"] += duracao_ms
+            self._checkout["max_ms"] = max(self._checkout["max_ms"], duracao_ms)
+
+    def top(self, n: int = 10) -> list:
+        """Retorna os N comandos com maior tempo total.
+
+        Returns:
+            list: Dicionários com 'sql', 'chamadas', 'total_ms', 'media_ms', 'max_ms' e 'linhas'.
+        """
+        with self._lock:
+            comandos = [dict(e) for e in self._comandos.values()]
+        for estatistica in comandos:
+            estatistica["media_ms"] = estatistica["total_ms"] / estatistica["chamadas"]
+        comandos.sort(key=lambda e: e["total_ms"], reverse=True)
+        return comandos[:n]
+
+    def checkout(self) -> dict:
+        """Retorna as estatísticas de checkout de conexões do pool."""
+        with self._lock:
+            return dict(self._checkout)
+
+    def limpar(self):
+        """Zera todas as estatísticas coletadas."""
+        with self._lock:
+            self._comandos.clear()
+            self._checkout = {"chamadas": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+
+class InstrumentedCursor:
+    """Cursor que mede cada execute/fetch e repassa o resto ao cursor original.
+
+    Se `ao_escrever` for informado, ele é chamado com as tabelas afetadas por
+    cada INSERT/UPDATE/DELETE executado pelo cursor.
+    """
+
+    def __init__(self, cursor, estatisticas: QueryStats, ao_escrever=None):
+        self._cursor = cursor
+        self._estatisticas = estatisticas
+        self._ao_escrever = ao_escrever
+        self._chave = None
+
+    def __getattr__(self, nome):
+        return getattr(self._cursor, nome)
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def _notificar_escrita(self, sql):
+        # Também notifica quando o comando falha: invalidar a mais é inofensivo
+        if self._ao_escrever is not None and eh_escrita(sql):
+            self._ao_escrever(tabelas_do_sql(sql))
+
+    def execute(self, sql, params=None, *args, **kwargs):
+        self._chave = normalizar_sql(sql)
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.execute(sql, params, *args, **kwargs)
+        finally:
+            duracao_ms = (time.perf_counter() - inicio) * 1000
+            linhas = self._cursor.rowcount if not self._cursor.description else 0
+            self._estatisticas.registrar_execucao(self._chave, duracao_ms, linhas or 0)
+            self._notificar_escrita(sql)
+
+    def executemany(self, sql, seq_params, *args, **kwargs):
+        self._chave = normalizar_sql(sql)
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, seq_params, *args, **kwargs)
+        finally:
+            duracao_ms = (time.perf_counter() - inicio) * 1000
+            self._estatisticas.registrar_execucao(
+                self._chave, duracao_ms, self._cursor.rowcount or 0
+            )
+            self._notificar_escrita(sql)
+
+    def _medir_leitura(self, metodo, *args):
+        inicio = time.perf_counter()
+        resultado = metodo(*args)
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        if resultado is None:
+            linhas = 0
+        elif isinstance(resultado, list):
+            linhas = len(resultado)
+        else:
+            linhas = 1
+        if self._chave is not None:
+            self._estatisticas.registrar_leitura(self._chave, duracao_ms, linhas)
+        return resultado
+
+    def fetchone(self):
+        return self._medir_leitura(self._cursor.fetchone)
+
+    def fetchmany(self, size=1):
+        return self._medir_leitura(self._cursor.fetchmany, size)
+
+    def fetchall(self):
+        return self._medir_leitura(self._cursor.fetchall)
@@ -0,0 +1,116 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+_RE_TABELAS = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE)\s+`?(\w+)`?", re.IGNORECASE)
+_RE_ESCRITA = re.compile(r"^\s*(?:INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+
+def tabelas_do_sql(sql: str) -> frozenset:
+    """Retorna as tabelas citadas em um comando (em minúsculas, como no MySQL do projeto)."""
+    return frozenset(nome.lower() for nome in _RE_TABELAS.findall(sql))
+
+
+def eh_escrita(sql: str) -> bool:
+    """Indica se o comando altera dados (INSERT, UPDATE, DELETE ou REPLACE)."""
+    return _RE_ESCRITA.match(sql) is not None
+
+
+class ResultCache:
+    """Cache LRU com TTL de resultados de consultas, invalidado por tabela.
+
+    Cada entrada é indexada pelo SQL + parâmetros e guarda as tabelas que a
+    consulta leu. Uma escrita em qualquer dessas tabelas remove a entrada.
+    Cada tabela tem também um número de versão: uma consulta que começou
+    antes de uma escrita não grava seu resultado (já desatualizado) no cache.
+    """
+
+    def __init__(self, capacidade: int, ttl: float):
+        """Inicializa o cache.
+
+        Args:
+            capacidade (int): Número máximo de resultados guardados.
+            ttl (float): Segundos que um resultado pode ser reaproveitado.
+        """
+        self.capacidade = max(1, capacidade)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()  # chave -> (expira_em, tabelas, linhas)
+        self._versoes = {}
+        self._acertos = 0
+        self._falhas = 0
+        self._invalidacoes = 0
+
+    def versao(self, tabelas: frozenset) -> tuple:
+        """Retorna a versão atual das tabelas, para ser passada a `guardar`."""
+        with self._lock:
+            return tuple(self._versoes.get(tabela, 0) for tabela in sorted(tabelas))
+
+    def obter(self, chave):
+        """Retorna uma cópia das linhas guardadas para `chave`, ou None."""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada[0] < time.monotonic():
+                del self._entradas[chave]
+                entrada = None
+            if entrada is None:
+                self._falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self._acertos += 1
+            linhas = entrada[2]
+        # Os models alteram as linhas recebidas (ex.: cliente.update), então
+        # cada chamada recebe seus próprios dicionários.
+        return [dict(linha) for linha in linhas]
+
+    def guardar(self, chave, tabelas: frozenset, linhas: list, versao: tuple, ttl: float = None):
+        """Guarda o resultado se nenhuma das tabelas mudou desde `versao`."""
+        copia = [dict(linha) for linha in linhas]
+        with self._lock:
+            atual = tuple(self._versoes.get(tabela, 0) for tabela in sorted(tabelas))
+            if atual != versao:
+                return
+            expira_em = time.monotonic() + (self.ttl if ttl is None else ttl)
+            self._entradas[chave] = (expira_em, tabelas, copia)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.capacidade:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, tabelas: frozenset):
+        """Remove os resultados que leram alguma das `tabelas`."""
+        if not tabelas:
+            return
+        with self._lock:
+            for tabela in tabelas:
+                self._versoes[tabela] = self._versoes.get(tabela, 0) + 1
+            removidas = [
+                chave
+                for chave, (_, lidas, _) in self._entradas.items()
+                if lidas & tabelas
+            ]
+            for chave in removidas:
+                del self._entradas[chave]
+            self._invalidacoes += len(removidas)
+
+    def limpar(self):
+        """Remove todos os resultados e zera os contadores."""
+        with self._lock:
+            self._entradas.clear()
+            self._acertos = self._falhas = self._invalidacoes = 0
+
+    def estatisticas(self) -> dict:
+        """Retorna os contadores do cache.
+
+        Returns:
+            dict: 'acertos', 'falhas', 'taxa_acerto', 'invalidacoes' e 'entradas'.
+        """
+        with self._lock:
+            total = self._acertos + self._falhas
+            return {
+                "acertos": self._acertos,
+                "falhas": self._falhas,
+                "taxa_acerto": self._acertos / total if total else 0.0,
+                "invalidacoes": self._invalidacoes,
+                "entradas": len(self._entradas),
+            }
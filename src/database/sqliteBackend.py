@@ -0,0 +1,453 @@
+import datetime
+import decimal
+import functools
+import re
+import sqlite3
+import threading
+
+import mysql.connector
+
+# Backend embarcado usado com DB_BACKEND=sqlite. As conexões imitam a parte da
+# API do mysql-connector usada pelos models (cursor em modo dicionário,
+# lastrowid, rowcount, commit/rollback) e traduzem o dialeto MySQL dos
+# comandos para SQLite, então nenhum model precisa saber qual banco está ativo.
+# Nomes de tabelas já são case-insensitive no SQLite, como no MySQL do projeto.
+# O SQLite não tem particionamento: tabelas particionadas viram tabelas comuns
+# e a manutenção de partições vira um comando sem efeito. Um UPDATE de duas
+# tabelas (UPDATE a JOIN b ... SET) vira um UPDATE ... FROM por tabela alterada.
+
+_RE_LITERAL = re.compile(r"('(?:[^'\\]|\\.|'')*')")
+_RE_GROUP_CONCAT = re.compile(r"\bGROUP_CONCAT\s*\(", re.IGNORECASE)
+_RE_ARGS_GROUP_CONCAT = re.compile(
+    r"^\s*(?P<distinto>DISTINCT\s+)?(?P<valor>.+?)"
+    r"(?:\s+ORDER\s+BY\s+(?P<ordem>.+?)(?:\s+(?P<direcao>ASC|DESC))?)?"
+    r"(?:\s+SEPARATOR\s+(?P<separador>'(?:[^']|'')*'))?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_RE_DATE_FORMAT = re.compile(r"\bDATE_FORMAT\s*\(\s*([^,]+?)\s*,\s*('[^']*')\s*\)", re.IGNORECASE)
+_RE_INSERT_IGNORE = re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE)
+_RE_VALUES_VAZIO = re.compile(r"\(\s*\)\s*VALUES\s*\(\s*\)", re.IGNORECASE)
+_RE_ON_DUPLICATE = re.compile(
+    r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b(?P<atribuicoes>.*)$", re.IGNORECASE | re.DOTALL
+)
+_RE_VALUES_COLUNA = re.compile(r"\bVALUES\s*\(\s*(`?\w+`?)\s*\)", re.IGNORECASE)
+_RE_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE)
+_RE_NOW = re.compile(r"\bNOW\s*\(\s*\d*\s*\)", re.IGNORECASE)
+# Consultas das migrações ao dicionário de dados do MySQL
+_RE_DATABASE = re.compile(r"\bDATABASE\s*\(\s*\)", re.IGNORECASE)
+_RE_INFO_COLUMNS = re.compile(r"\binformation_schema\.COLUMNS\b", re.IGNORECASE)
+_RE_INFO_STATISTICS = re.compile(r"\binformation_schema\.STATISTICS\b", re.IGNORECASE)
+_RE_FROM_DUAL = re.compile(r"\s+FROM\s+DUAL\b", re.IGNORECASE)
+# Partições: cláusula do CREATE TABLE e manutenção (REORGANIZE) das tabelas de histórico
+_RE_PARTITION_BY = re.compile(r"\s*\bPARTITION\s+BY\s+.*?(?=;|\Z)", re.IGNORECASE | re.DOTALL)
+_RE_REORGANIZE = re.compile(
+    r"^\s*ALTER\s+TABLE\s+\S+\s+REORGANIZE\s+PARTITION\b.*$", re.IGNORECASE | re.DOTALL
+)
+_RE_AUTO_INCREMENT = re.compile(
+    r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.IGNORECASE
+)
+_RE_UPDATE_JOIN = re.compile(
+    r"^\s*UPDATE\s+(?P<tabela1>`?\w+`?)\s+(?:AS\s+)?(?P<alias1>\w+)\s+"
+    r"(?:INNER\s+)?JOIN\s+(?P<tabela2>`?\w+`?)\s+(?:AS\s+)?(?P<alias2>\w+)\s+"
+    r"ON\s+(?P<on>.+?)\s+SET\s+(?P<set>.+?)(?:\s+WHERE\s+(?P<where>.+?))?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_RE_ALVO_ATRIBUICAO = re.compile(r"^\s*(\w+)\.(`?\w+`?)\s*=\s*(.+?)\s*$", re.DOTALL)
+
+# information_schema.COLUMNS sobre o catálogo do SQLite. O SQLite guarda datas
+# como texto, com a fração de segundo que vier: a precisão é sempre a máxima.
+_COLUNAS_SQLITE = (
+    "(SELECT 'main' AS TABLE_SCHEMA, m.name COLLATE NOCASE AS TABLE_NAME, "
+    "c.name COLLATE NOCASE AS COLUMN_NAME, 6 AS DATETIME_PRECISION "
+    "FROM sqlite_master m JOIN pragma_table_info(m.name) c WHERE m.type = 'table')"
+)
+# information_schema.STATISTICS: um registro por índice (não por coluna)
+_INDICES_SQLITE = (
+    "(SELECT 'main' AS TABLE_SCHEMA, tbl_name COLLATE NOCASE AS TABLE_NAME, "
+    "name COLLATE NOCASE AS INDEX_NAME FROM sqlite_master WHERE type = 'index')"
+)
+
+# Especificadores do DATE_FORMAT do MySQL que diferem do strftime do SQLite
+_FORMATOS_DATA = {"%i": "%M", "%s": "%S", "%T": "%H:%M:%S"}
+
+_lock_schema = threading.Lock()
+# Mantém aberto um banco ":memory:" compartilhado enquanto o processo viver
+_memoria_compartilhada = {}
+
+
+class _GroupConcat:
+    """Agregação equivalente ao GROUP_CONCAT do MySQL (DISTINCT, ORDER BY e SEPARATOR)."""
+
+    def __init__(self):
+        self.itens = []
+
+    def step(self, valor, chave, separador, distinto, decrescente):
+        if valor is not None:
+            self.separador, self.distinto, self.decrescente = separador, distinto, decrescente
+            self.itens.append((chave, str(valor)))
+
+    def finalize(self):
+        if not self.itens:
+            return None
+        itens = self.itens
+        if self.distinto:
+            itens = list({valor: (chave, valor) for chave, valor in itens}.values())
+        if any(chave is not None for chave, _ in itens):
+            itens.sort(key=lambda item: (item[0] is None, item[0]), reverse=bool(self.decrescente))
+        return self.separador.join(valor for _, valor in itens)
+
+
+def _fora_de_literais(sql: str, funcao) -> str:
+    """Aplica `funcao` apenas aos trechos do SQL que não são strings literais."""
+    partes = _RE_LITERAL.split(sql)
+    return "".join(
+        parte if indice % 2 else funcao(parte) for indice, parte in enumerate(partes)
+    )
+
+
+def _fecha_parenteses(sql: str, inicio: int) -> int:
+    """Retorna a posição do ')' que fecha o '(' aberto antes de `inicio`."""
+    nivel, posicao, em_literal = 1, inicio, False
+    while posicao < len(sql):
+        caractere = sql[posicao]
+        if caractere == "'":
+            em_literal = not em_literal
+        elif not em_literal:
+            if caractere == "(":
+                nivel += 1
+            elif caractere == ")":
+                nivel -= 1
+                if nivel == 0:
+                    return posicao
+        posicao += 1
+    raise mysql.connector.errors.ProgrammingError(msg=f"Parênteses desbalanceados: {sql}")
+
+
+def _traduzir_group_concat(sql: str) -> str:
+    saida, posicao = [], 0
+    for encontrado in _RE_GROUP_CONCAT.finditer(sql):
+        if encontrado.start() < posicao:
+            continue
+        fim = _fecha_parenteses(sql, encontrado.end())
+        argumentos = _RE_ARGS_GROUP_CONCAT.match(sql[encontrado.end() : fim])
+        valor = argumentos.group("valor")
+        saida.append(sql[posicao : encontrado.start()])
+        saida.append(
+            "GROUP_CONCAT_MYSQL({}, {}, {}, {}, {})".format(
+                valor,
+                argumentos.group("ordem") or "NULL",
+                argumentos.group("separador") or "','",
+                1 if argumentos.group("distinto") else 0,
+                1 if (argumentos.group("direcao") or "").upper() == "DESC" else 0,
+            )
+        )
+        posicao = fim + 1
+    saida.append(sql[posicao:])
+    return "".join(saida)
+
+
+def _dividir_no_nivel_zero(texto: str, separador: str = ",") -> list:
+    """Divide `texto` nos separadores fora de parênteses e de strings literais."""
+    partes, nivel, em_literal, inicio = [], 0, False, 0
+    for posicao, caractere in enumerate(texto):
+        if caractere == "'":
+            em_literal = not em_literal
+        elif not em_literal:
+            if caractere == "(":
+                nivel += 1
+            elif caractere == ")":
+                nivel -= 1
+            elif caractere == separador and nivel == 0:
+                partes.append(texto[inicio:posicao])
+                inicio = posicao + 1
+    partes.append(texto[inicio:])
+    return partes
+
+
+def _contar_parametros(trecho: str) -> int:
+    return sum(
+        parte.count("%s")
+        for indice, parte in enumerate(_RE_LITERAL.split(trecho))
+        if not indice % 2
+    )
+
+
+def dividir_update_join(sql: str, params: tuple):
+    """Divide um UPDATE de duas tabelas do MySQL em um UPDATE ... FROM por tabela.
+
+    `UPDATE a x JOIN b y ON cond SET x.c = e1, y.d = e2 WHERE filtro` vira
+    `UPDATE a AS x SET c = e1 FROM b AS y WHERE (cond) AND (filtro)` e o
+    equivalente para b, na ordem em que as tabelas aparecem no SET. Cada
+    comando recebe os seus parâmetros. As expressões são avaliadas depois da
+    alteração da tabela anterior, então não devem depender de colunas que o
+    mesmo comando altera na outra tabela.
+
+    Args:
+        sql (str): Comando como está nos models.
+        params (tuple): Valores dos placeholders.
+
+    Returns:
+        list | None: [(sql, params)] dos comandos, ou None se `sql` não é um
+            UPDATE de duas tabelas.
+    """
+    encontrado = _RE_UPDATE_JOIN.match(sql)
+    if encontrado is None:
+        return None
+    params = tuple(params or ())
+    tabelas = {
+        encontrado.group("alias1"): (encontrado.group("tabela1"), encontrado.group("alias2")),
+        encontrado.group("alias2"): (encontrado.group("tabela2"), encontrado.group("alias1")),
+    }
+    on, where = encontrado.group("on"), encontrado.group("where")
+    n_on = _contar_parametros(on)
+    params_on = params[:n_on]
+    posicao = n_on
+
+    atribuicoes = {}
+    for atribuicao in _dividir_no_nivel_zero(encontrado.group("set")):
+        alvo = _RE_ALVO_ATRIBUICAO.match(atribuicao)
+        if alvo is None or alvo.group(1) not in tabelas:
+            raise mysql.connector.errors.ProgrammingError(
+                msg=f"Atribuição sem tabela no UPDATE com JOIN: {atribuicao.strip()}"
+            )
+        n = _contar_parametros(alvo.group(3))
+        lista = atribuicoes.setdefault(alvo.group(1), ([], []))
+        lista[0].append(f"{alvo.group(2)} = {alvo.group(3)}")
+        lista[1].extend(params[posicao : posicao + n])
+        posicao += n
+    params_where = params[posicao:]
+
+    comandos = []
+    for alias, (sets, params_set) in atribuicoes.items():
+        tabela, outro_alias = tabelas[alias]
+        outra_tabela = tabelas[outro_alias][0]
+        condicao = f"({on})" + (f" AND ({where})" if where else "")
+        comandos.append(
+            (
+                f"UPDATE {tabela} AS {alias} SET {', '.join(sets)} "
+                f"FROM {outra_tabela} AS {outro_alias} WHERE {condicao}",
+                (*params_set, *params_on, *params_where),
+            )
+        )
+    return comandos
+
+
+def _traduzir_on_duplicate(encontrado) -> str:
+    # Sem alvo, o ON CONFLICT vale para qualquer chave única, como no MySQL;
+    # VALUES(col) é o valor que seria inserido, que no SQLite se chama excluded.col
+    atribuicoes = _RE_VALUES_COLUNA.sub(r"excluded.\1", encontrado.group("atribuicoes"))
+    return f"ON CONFLICT DO UPDATE SET{atribuicoes}"
+
+
+def _traduzir_date_format(encontrado) -> str:
+    formato = encontrado.group(2)
+    for mysql_fmt, sqlite_fmt in _FORMATOS_DATA.items():
+        formato = formato.replace(mysql_fmt, sqlite_fmt)
+    return f"strftime({formato}, {encontrado.group(1)})"
+
+
+@functools.lru_cache(maxsize=512)
+def traduzir_sql(sql: str) -> str:
+    """Traduz um comando escrito para o MySQL para o dialeto do SQLite.
+
+    Args:
+        sql (str): Comando como está nos models.
+
+    Returns:
+        str: Comando equivalente para o SQLite.
+    """
+    if _RE_REORGANIZE.match(sql):
+        return "SELECT 1"
+    texto = _RE_DATE_FORMAT.sub(_traduzir_date_format, sql)
+    texto = _traduzir_group_concat(texto)
+    texto = _RE_INSERT_IGNORE.sub("INSERT OR IGNORE", texto)
+    texto = _RE_VALUES_VAZIO.sub("DEFAULT VALUES", texto)
+    texto = _RE_ON_DUPLICATE.sub(_traduzir_on_duplicate, texto)
+    # O SQLite bloqueia o banco inteiro na escrita; não há bloqueio por linha
+    texto = _RE_FOR_UPDATE.sub("", texto)
+    texto = _RE_NOW.sub("strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')", texto)
+    texto = _RE_DATABASE.sub("'main'", texto)
+    texto = _RE_INFO_COLUMNS.sub(_COLUNAS_SQLITE, texto)
+    texto = _RE_INFO_STATISTICS.sub(_INDICES_SQLITE, texto)
+    texto = _RE_FROM_DUAL.sub("", texto)
+    # CREATE TABLE das migrações
+    texto = _RE_AUTO_INCREMENT.sub("INTEGER PRIMARY KEY AUTOINCREMENT", texto)
+    texto = _RE_PARTITION_BY.sub("", texto)
+    return _fora_de_literais(texto, lambda trecho: trecho.replace("%s", "?"))
+
+
+def traduzir_schema(ddl: str) -> str:
+    """Traduz o DDL do modelo lógico (MySQL) para o SQLite."""
+    ddl = _RE_AUTO_INCREMENT.sub("INTEGER PRIMARY KEY AUTOINCREMENT", ddl)
+    return _RE_PARTITION_BY.sub("", ddl)
+
+
+def _converter_erro(erro: sqlite3.Error) -> mysql.connector.Error:
+    """Converte um erro do sqlite3 na exceção equivalente do mysql-connector."""
+    if isinstance(erro, sqlite3.IntegrityError):
+        classe = mysql.connector.errors.IntegrityError
+    elif isinstance(erro, sqlite3.OperationalError):
+        classe = mysql.connector.errors.OperationalError
+    elif isinstance(erro, sqlite3.ProgrammingError):
+        classe = mysql.connector.errors.ProgrammingError
+    else:
+        classe = mysql.connector.errors.DatabaseError
+    return classe(msg=str(erro))
+
+
+class SQLiteCursor:
+    """Cursor SQLite com a interface do cursor do mysql-connector."""
+
+    def __init__(self, cursor: sqlite3.Cursor, dicionario: bool):
+        self._cursor = cursor
+        self._dicionario = dicionario
+        self._rowcount = None
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount if self._rowcount is None else self._rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def execute(self, sql, params=None, *args, **kwargs):
+        self._rowcount = None
+        try:
+            comandos = dividir_update_join(sql, params)
+            if comandos is None:
+                self._cursor.execute(traduzir_sql(sql), tuple(params or ()))
+                return
+            # Soma das duas tabelas. Aqui são as linhas encontradas; o MySQL
+            # (sem FOUND_ROWS) conta só as alteradas, então os models não
+            # usam este número para saber se a linha existe
+            self._rowcount = 0
+            for comando, parametros in comandos:
+                self._cursor.execute(traduzir_sql(comando), parametros)
+                self._rowcount += max(self._cursor.rowcount, 0)
+        except sqlite3.Error as e:
+            raise _converter_erro(e) from e
+
+    def executemany(self, sql, seq_params, *args, **kwargs):
+        try:
+            self._cursor.executemany(traduzir_sql(sql), [tuple(p) for p in seq_params])
+        except sqlite3.Error as e:
+            raise _converter_erro(e) from e
+
+    def _linha(self, linha):
+        if linha is None or not self._dicionario:
+            return linha
+        return {coluna[0]: valor for coluna, valor in zip(self._cursor.description, linha)}
+
+    def fetchone(self):
+        return self._linha(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._linha(linha) for linha in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._linha(linha) for linha in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Conexão SQLite com a interface da conexão do mysql-connector."""
+
+    def __init__(self, caminho: str):
+        self._caminho = caminho
+        self._conexao = None
+        self.reconnect()
+
+    def cursor(self, dictionary=False, **kwargs):
+        # prepared/buffered não se aplicam: o sqlite3 já mantém um cache de
+        # statements por conexão e sempre entrega as linhas localmente.
+        return SQLiteCursor(self._conexao.cursor(), dictionary)
+
+    def commit(self):
+        self._conexao.commit()
+
+    def rollback(self):
+        self._conexao.rollback()
+
+    def is_connected(self):
+        return self._conexao is not None
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        if self._conexao is None:
+            if not reconnect:
+                raise mysql.connector.errors.InterfaceError(msg="Conexão SQLite fechada")
+            self.reconnect()
+
+    def reconnect(self, attempts=1, delay=0):
+        uri = self._caminho.startswith("file:")
+        try:
+            self._conexao = sqlite3.connect(
+                self._caminho,
+                uri=uri,
+                timeout=30,
+                check_same_thread=False,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+            )
+        except sqlite3.Error as e:
+            raise _converter_erro(e) from e
+        self._conexao.create_aggregate("GROUP_CONCAT_MYSQL", 5, _GroupConcat)
+        self._conexao.execute("PRAGMA foreign_keys = ON")
+
+    def close(self):
+        if self._conexao is not None:
+            self._conexao.close()
+            self._conexao = None
+
+
+def _converter_data(valor: bytes):
+    texto = valor.decode()
+    try:
+        if len(texto) <= 10:
+            return datetime.date.fromisoformat(texto)
+        return datetime.datetime.fromisoformat(texto)
+    except ValueError:
+        return texto
+
+
+sqlite3.register_adapter(datetime.date, lambda data: data.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda data: data.isoformat(" "))
+sqlite3.register_adapter(decimal.Decimal, float)
+for _tipo in ("DATE", "DATETIME", "TIMESTAMP"):
+    sqlite3.register_converter(_tipo, _converter_data)
+
+
+def conectar(caminho: str, arquivo_schema: str) -> SQLiteConnection:
+    """Abre uma conexão SQLite, criando as tabelas do modelo lógico se preciso.
+
+    Args:
+        caminho (str): Arquivo do banco. ":memory:" cria um banco em memória
+            compartilhado entre as conexões do pool.
+        arquivo_schema (str): Script SQL (MySQL) com a criação das tabelas.
+
+    Returns:
+        SQLiteConnection: Conexão pronta para uso pelo pool.
+    """
+    if caminho == ":memory:":
+        caminho = "file:coffeshop?mode=memory&cache=shared"
+        with _lock_schema:
+            if caminho not in _memoria_compartilhada:
+                _memoria_compartilhada[caminho] = sqlite3.connect(
+                    caminho, uri=True, check_same_thread=False
+                )
+
+    conexao = SQLiteConnection(caminho)
+    with _lock_schema:
+        bruta = conexao._conexao
+        existe = bruta.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Pedidos' COLLATE NOCASE"
+        ).fetchone()
+        if not existe:
+            with open(arquivo_schema, encoding="utf-8") as arquivo:
+                bruta.executescript(traduzir_schema(arquivo.read()))
+    return conexao
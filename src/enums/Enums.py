@@ -36,3 +36,28 @@ class Cargos(Enum):
     def get_choices(cls):
         """Retorna opções para formulários/combobox"""
         return [(member.name, member.value) for member in cls]
+
+
+class StatusPedido(Enum):
+    """Etapas de um pedido, da mesa até a entrega"""
+
+    PENDENTE = "pendente"  # Registrado, aguardando a cozinha
+    EM_PREPARO = "em_preparo"  # Sendo preparado na cozinha
+    PRONTO = "pronto"  # Pronto para ser levado à mesa
+    ENTREGUE = "entregue"  # Entregue ao cliente
+    CANCELADO = "cancelado"  # Cancelado antes da entrega
+
+    @classmethod
+    def get_choices(cls):
+        """Retorna opções para formulários/combobox"""
+        return [(member.value, member.name.replace("_", " ").title()) for member in cls]
+
+    @classmethod
+    def ativos(cls):
+        """Status dos pedidos que ainda estão na fila da cozinha"""
+        return (cls.PENDENTE.value, cls.EM_PREPARO.value)
+
+    @classmethod
+    def abertos(cls):
+        """Status dos pedidos que ainda não foram entregues nem cancelados"""
+        return (cls.PENDENTE.value, cls.EM_PREPARO.value, cls.PRONTO.value)
@@ -22,13 +22,13 @@ class Address:
         """
 
         try:
-            self.db.abrirConexao()
             if endereco and endereco.strip():
-                sql = "INSERT INTO enderecos(endereco) VALUES(%s);"
-                data: tuple = (endereco,)
-                self.db.cursor.execute(sql, data)
-                self.db.connection.commit()
-                newID = self.db.cursor.lastrowid
+                with self.db.conexao() as cursor:
+                    sql = "INSERT INTO enderecos(endereco) VALUES(%s);"
+                    data: tuple = (endereco,)
+                    cursor.execute(sql, data)
+                    self.db.commit()
+                    newID = cursor.lastrowid
                 print("✅ Endereco inserido com sucesso")
                 return newID
             else:
@@ -36,8 +36,6 @@ class Address:
                 return None  # Retornar None para indicar falha ou ausência de inserção
         except mysql.connector.Error as e:
             print(f"❌ Erro ao inserir endereco na tabela: \n{e}")
-        finally:
-            self.db.fecharConexao()
 
     def AtualizarEndereco(self, id_endereco: int, novo_endereco: str):
         """
@@ -52,7 +50,6 @@ class Address:
         """
 
         try:
-            self.db.abrirConexao()
             valores_dict = {}
             if id_endereco is not None:
                 valores_dict["id_endereco"] = id_endereco
@@ -64,8 +61,6 @@ class Address:
             )
         except mysql.connector.Error as e:
             print("❌ ocorreu um erro ao atualizar o Endereço.")
-        finally:
-            self.db.fecharConexao()
 
     def buscar_endereco_por_id(
         self, ids_endereco: int | list[int]
@@ -90,19 +85,15 @@ class Address:
             mysql.connector.Error: Se ocorrer erro na consulta ao banco de dados.
         """
         try:
-            self.db.abrirConexao()
-
             if isinstance(ids_endereco, list):
                 if not ids_endereco:
                     return []
                 placeholders = ", ".join(["%s"] * len(ids_endereco))
                 sql = f"SELECT * FROM enderecos WHERE id_endereco IN ({placeholders})"
-                self.db.cursor.execute(sql, ids_endereco)
-                return self.db.cursor.fetchall()
+                return self.db.consultarComCache(sql, ids_endereco)
 
             sql = "SELECT * FROM enderecos WHERE id_endereco = %s"
-            self.db.cursor.execute(sql, (ids_endereco,))
-            endereco = self.db.cursor.fetchone()
+            endereco = self.db.consultarPreparado(sql, (ids_endereco,), unico=True)
 
             if endereco:
                 print(f"✅ Endereço encontrado: ID {ids_endereco}")
@@ -114,8 +105,6 @@ class Address:
         except mysql.connector.Error as e:
             print(f"❌ Erro ao buscar endereço por ID: \n{e}")
             raise
-        finally:
-            self.db.fecharConexao()
 
     def deletarEndereco(self, id_endereco: int):
         """Deleta um endereço do banco de dados.
@@ -127,12 +116,10 @@ class Address:
             mysql.connector.Error: Se ocorrer erro ao deletar o cliente.
         """
         try:
-            self.db.abrirConexao()
-            sql = "DELETE FROM enderecos WHERE id_endereco = %s"
-            self.db.cursor.execute(sql, (id_endereco,))
-            self.db.connection.commit()
+            with self.db.conexao() as cursor:
+                sql = "DELETE FROM enderecos WHERE id_endereco = %s"
+                cursor.execute(sql, (id_endereco,))
+                self.db.commit()
             print(f"✅ Endereço com id({id_endereco}) deletado com sucesso.")
         except mysql.connector.Error as e:
             print(f"❌ Erro ao deletar o Endereço: \n {e}")
-        finally:
-            self.db.fecharConexao()
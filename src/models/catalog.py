@@ -0,0 +1,115 @@
+# SESSÃO CATÁLOGO
+from src.database.connectFromDB import Database
+from src.utils.catalogCache import CatalogCache
+from src.utils.priceHistory import PriceHistory
+
+# O carimbo é uma única linha; cada gravação em pratos, preços ou ingredientes
+# o incrementa na mesma transação da alteração.
+_SQL_VERSAO = "SELECT versao FROM Catalogo_Versao WHERE id = 1"
+_SQL_INCREMENTAR_VERSAO = (
+    "INSERT INTO Catalogo_Versao (id, versao) VALUES (1, 1) "
+    "ON DUPLICATE KEY UPDATE versao = versao + 1"
+)
+
+_SQL_PRATOS = "SELECT p.id, p.nome, pr.preco FROM Pratos p JOIN Precos pr ON pr.id = p.fk_preco"
+_SQL_PRATO_INGREDIENTES = "SELECT prato_id, ingrediente_id FROM Prato_Ingredientes"
+_SQL_INGREDIENTES = "SELECT id, nome FROM Ingredientes"
+_SQL_HISTORICO = (
+    "SELECT prato_id, preco, vigente_desde FROM Precos_Historico "
+    "ORDER BY prato_id, vigente_desde, id"
+)
+
+
+class Catalog:
+    # Catálogo em memória compartilhado por todas as instâncias (e telas)
+    _cache = CatalogCache()
+    # Histórico de preços, recarregado pelo mesmo carimbo
+    _historico = PriceHistory()
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def registrarAlteracao(self):
+        """
+        Incrementa o carimbo do catálogo.
+
+        Deve ser chamado dentro da conexão/transação do comando que alterou
+        pratos, preços ou ingredientes, antes do commit, para que os leitores
+        (deste e dos outros terminais) recarreguem o catálogo.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na gravação.
+        """
+        with self.db.conexao() as cursor:
+            cursor.execute(_SQL_INCREMENTAR_VERSAO)
+
+    def versao(self) -> int:
+        """
+        Carimbo atual do catálogo no banco (uma busca pela chave primária).
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        row = self.db.consultarPreparado(_SQL_VERSAO, unico=True)
+        return row["versao"] if row else 0
+
+    def atual(self) -> CatalogCache:
+        """
+        Retorna o catálogo em memória, recarregado se o carimbo mudou.
+
+        Com o carimbo igual ao da última carga, custa só a leitura do carimbo;
+        as consultas de pratos, preços e ingredientes rodam apenas depois de
+        uma alteração no catálogo.
+
+        Returns:
+            CatalogCache: O catálogo atualizado.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        cache = Catalog._cache
+        with cache.lock:
+            # Lido antes das consultas: uma alteração no meio muda o carimbo
+            # e o catálogo é recarregado de novo na próxima leitura
+            versao = self.versao()
+            if cache.versao != versao:
+                self._carregar(versao)
+        return cache
+
+    def historico(self) -> PriceHistory:
+        """
+        Retorna o histórico de preços em memória, recarregado se o carimbo mudou.
+
+        Returns:
+            PriceHistory: O histórico atualizado.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        historico = Catalog._historico
+        with historico.lock:
+            versao = self.versao()
+            if historico.versao != versao:
+                with self.db.conexao() as cursor:
+                    cursor.execute(_SQL_HISTORICO)
+                    linhas = cursor.fetchall()
+                historico.carregar(
+                    [(row["prato_id"], row["preco"], row["vigente_desde"]) for row in linhas],
+                    versao,
+                )
+        return historico
+
+    def _carregar(self, versao):
+        with self.db.conexao() as cursor:
+            cursor.execute(_SQL_PRATOS)
+            pratos = [(row["id"], row["nome"], row["preco"]) for row in cursor.fetchall()]
+            cursor.execute(_SQL_INGREDIENTES)
+            ingredientes = {row["id"]: row["nome"] for row in cursor.fetchall()}
+            cursor.execute(_SQL_PRATO_INGREDIENTES)
+            ingredientes_por_prato = {}
+            for row in cursor.fetchall():
+                ingredientes_por_prato.setdefault(row["prato_id"], []).append(
+                    row["ingrediente_id"]
+                )
+        Catalog._cache.carregar(pratos, ingredientes, ingredientes_por_prato, versao)
+        print(f"📚 Catálogo carregado (versão {versao}): {len(pratos)} prato(s).")
@@ -1,5 +1,4 @@
 from datetime import date
-from tkinter import messagebox
 import mysql
 import mysql.connector
 
@@ -45,33 +44,30 @@ class Collaborator:
         self.fk_telefone: int = None
         self.fk_endereco: str = None
         try:
-
-            self.fk_telefone = self.phones.inserirTelefone(novo_numero=telefone)
-            self.fk_endereco = self.address.inserirEndereco(endereco=endereco)
-            self.db.abrirConexao()
-            sql = """
-            INSERT INTO colaboradores
-            (cpf, nome, dataAd, nivelSistem, funcao, fk_telefone, fk_endereco)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            data: tuple = (
-                cpf,
-                nome,
-                dataAd,
-                nivelSystem,
-                funcao,
-                self.fk_telefone,
-                self.fk_endereco,
-            )
-            self.db.cursor.execute(sql, data)
-            self.db.connection.commit()
+            # Telefone, endereço e colaborador são gravados na mesma transação:
+            # se qualquer inserção falhar, nada fica para trás no banco.
+            with self.db.transaction() as cursor:
+                self.fk_telefone = self.phones.inserirTelefone(novo_numero=telefone)
+                self.fk_endereco = self.address.inserirEndereco(endereco=endereco)
+                sql = """
+                INSERT INTO colaboradores
+                (cpf, nome, dataAd, nivelSistem, funcao, fk_telefone, fk_endereco)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """
+                data: tuple = (
+                    cpf,
+                    nome,
+                    dataAd,
+                    nivelSystem,
+                    funcao,
+                    self.fk_telefone,
+                    self.fk_endereco,
+                )
+                cursor.execute(sql, data)
             print("✅ Colaborador inserido com sucesso")
         except mysql.connector.Error as e:
-            self.phones.deletarTelefone(self.fk_telefone)
-            self.address.deletarEndereco(self.fk_endereco)
+            self.fk_telefone, self.fk_endereco = None, None
             raise ValueError(f"❌ Erro ao inserir um novo colaborador: \n{e}")
-        finally:
-            self.db.fecharConexao()
 
     def atualizarColaborador(
         self,
@@ -103,50 +99,50 @@ class Collaborator:
             no banco de dados.
         """
         try:
-            self.db.abrirConexao()
-            valores_dict = {}
-            if novo_nome is not None:
-                valores_dict["nome"] = novo_nome
-            if nova_data_AD is not None:
-                valores_dict["dataAd"] = nova_data_AD
-            if novo_nivel_system is not None:
-                valores_dict["nivelSistem"] = novo_nivel_system
-            if nova_funcao is not None:
-                valores_dict["funcao"] = nova_funcao
-
-            if valores_dict:
-                set_clause = ", ".join(f"{key} = %s" for key in valores_dict.keys())
-                sql = f"UPDATE colaboradores SET {set_clause} WHERE cpf = %s"
-                values = list(valores_dict.values()) + [cpf]
-                self.db.cursor.execute(sql, values)
-                self.db.connection.commit()
-
-            if novo_telefone is not None:
-                id_telefone_customer = self.db.searchIDFromDataBase(
-                    cpf, coluna="fk_telefone", tabela="colaboradores"
-                )
-                if id_telefone_customer is not None:
-                    self.db.atualizarRegistro(
-                        "telefones",
-                        {"telefone": novo_telefone},
-                        "id_telefone",
-                        id_telefone_customer,
+            with self.db.conexao() as cursor:
+                valores_dict = {}
+                if novo_nome is not None:
+                    valores_dict["nome"] = novo_nome
+                if nova_data_AD is not None:
+                    valores_dict["dataAd"] = nova_data_AD
+                if novo_nivel_system is not None:
+                    valores_dict["nivelSistem"] = novo_nivel_system
+                if nova_funcao is not None:
+                    valores_dict["funcao"] = nova_funcao
+
+                if valores_dict:
+                    set_clause = ", ".join(
+                        f"{key} = %s" for key in valores_dict.keys()
                     )
-            if novo_endereco is not None:
-                id_endereco = self.db.searchIDFromDataBase(
-                    cpf, coluna="fk_endereco", tabela="colaboradores"
-                )
-                if id_endereco is not None:
-                    self.db.atualizarRegistro(
-                        tabela="enderecos",
-                        valores_dict={"endereco": novo_endereco},
-                        campo_where="id_endereco",
-                        valor_where=id_endereco,
+                    sql = f"UPDATE colaboradores SET {set_clause} WHERE cpf = %s"
+                    values = list(valores_dict.values()) + [cpf]
+                    cursor.execute(sql, values)
+                    self.db.commit()
+
+                if novo_telefone is not None:
+                    id_telefone_customer = self.db.searchIDFromDataBase(
+                        cpf, coluna="fk_telefone", tabela="colaboradores"
+                    )
+                    if id_telefone_customer is not None:
+                        self.db.atualizarRegistro(
+                            "telefones",
+                            {"telefone": novo_telefone},
+                            "id_telefone",
+                            id_telefone_customer,
+                        )
+                if novo_endereco is not None:
+                    id_endereco = self.db.searchIDFromDataBase(
+                        cpf, coluna="fk_endereco", tabela="colaboradores"
                     )
+                    if id_endereco is not None:
+                        self.db.atualizarRegistro(
+                            tabela="enderecos",
+                            valores_dict={"endereco": novo_endereco},
+                            campo_where="id_endereco",
+                            valor_where=id_endereco,
+                        )
         except mysql.connector.Error as e:
             print(f"❌ ocorreu um erro ao atualizar o cliente: \a {e}")
-        finally:
-            self.db.fecharConexao()
 
     def deletarColaborador(self, cpf_colaborador: int):
         """
@@ -160,15 +156,13 @@ class Collaborator:
         """
 
         try:
-            self.db.abrirConexao()
-            sql = "DELETE FROM colaboradores WHERE cpf = %s"
-            self.db.cursor.execute(sql, (cpf_colaborador,))
-            self.db.connection.commit()
+            with self.db.conexao() as cursor:
+                sql = "DELETE FROM colaboradores WHERE cpf = %s"
+                cursor.execute(sql, (cpf_colaborador,))
+                self.db.commit()
             print(f"✅ Colaborador com CPF:({cpf_colaborador}) excluído com sucesso.")
         except mysql.connector.Error as e:
             print(f"❌ Erro ao excluir o colaborador:\n{e}")
-        finally:
-            self.db.fecharConexao()
 
     def cpf_existe(self, cpf: str) -> bool:
         """
@@ -184,7 +178,6 @@ class Collaborator:
             ValueError: Se o CPF for inválido
         """
         try:
-            self.db.abrirConexao()
             # Remove caracteres não numéricos e valida formato básico
             cpf_limpo = "".join(filter(str.isdigit, cpf))
             if len(cpf_limpo) != 11:
@@ -192,10 +185,9 @@ class Collaborator:
 
             # Consulta segura com parâmetros para evitar SQL injection
             sql = "SELECT COUNT(1) AS total FROM colaboradores WHERE cpf = %s"
-            self.db.cursor.execute(sql, (cpf_limpo,))
 
-            # Obtém o resultado (fetchone retorna uma tupla, ex: (1,))
-            resultado = self.db.cursor.fetchone()
+            # Obtém o resultado como dicionário, ex: {'total': 1}
+            resultado = self.db.consultarPreparado(sql, (cpf_limpo,), unico=True)
 
             # Retorna True se count > 0
             return resultado["total"] > 0 if resultado else False
@@ -203,8 +195,6 @@ class Collaborator:
             raise ValueError(f"Erro ao verificar CPF: \a {str(e)}")
         except mysql.connector.Error as e:
             raise ValueError(f"Erro ao validar cpf: \a {e}")
-        finally:
-            self.db.fecharConexao()
 
     def recuperar_colaboradores(self) -> list:
         """Recupera todos os colaboradores da tabela 'colaboradores' no MySQL
@@ -213,58 +203,53 @@ class Collaborator:
             list: Lista de dicionários com os dados dos colaboradores
         """
         try:
-            self.db.abrirConexao()
-            # Executa a consulta SQL
-            self.db.cursor.execute(
+            # Executa a consulta SQL (reaproveitada até alguém alterar colaboradores)
+            resultados = self.db.consultarComCache(
+                """
+                SELECT 
+                    cpf,
+                    nome,
+                    DATE_FORMAT(dataAd, '%d/%m/%Y') as data_admissao,
+                    nivelSistem,
+                    funcao,
+                    fk_telefone,
+                    fk_endereco
+                FROM colaboradores
+                ORDER BY nome
                 """
-            SELECT 
-                cpf,
-                nome,
-                DATE_FORMAT(dataAd, '%d/%m/%Y') as data_admissao,
-                nivelSistem,
-                funcao,
-                fk_telefone,
-                fk_endereco
-            FROM colaboradores
-            ORDER BY nome
-            """
             )
 
-            # Obtém os resultados
-            resultados = self.db.cursor.fetchall()
-
             return resultados
 
         except mysql.connector.Error as e:
-            messagebox.showerror("Erro", f"Falha ao recuperar colaboradores: {str(e)}")
+            print(f"❌ Falha ao recuperar colaboradores: \n{e}")
             return []
-        finally:
-            self.db.fecharConexao()
 
     def recuperar_colaboradores_completos(self) -> list:
         """Versão otimizada que reduz o número de consultas ao banco"""
         try:
-            self.db.abrirConexao()
-            # 1. Recupera todos os colaboradores
-            colaboradores = self.recuperar_colaboradores()
-
-            # 2. Coleta todos os IDs únicos de telefones e endereços
-            telefones_ids = {
-                c["fk_telefone"] for c in colaboradores if c.get("fk_telefone")
-            }
-            enderecos_ids = {
-                c["fk_endereco"] for c in colaboradores if c.get("fk_endereco")
-            }
-
-            # 3. Busca todos os telefones e endereços de uma só vez
-            telefones = {
-                t["id_telefone"]: t
-                for t in self.phones.buscar_telefone_por_id(list(telefones_ids))
-            }
-            enderecos = {
-                e["id_endereco"]: e
-                for e in self.address.buscar_endereco_por_id(list(enderecos_ids))
-            }
+            # Uma única conexão do pool atende as três consultas
+            with self.db.conexao():
+                # 1. Recupera todos os colaboradores
+                colaboradores = self.recuperar_colaboradores()
+
+                # 2. Coleta todos os IDs únicos de telefones e endereços
+                telefones_ids = {
+                    c["fk_telefone"] for c in colaboradores if c.get("fk_telefone")
+                }
+                enderecos_ids = {
+                    c["fk_endereco"] for c in colaboradores if c.get("fk_endereco")
+                }
+
+                # 3. Busca todos os telefones e endereços de uma só vez
+                telefones = {
+                    t["id_telefone"]: t
+                    for t in self.phones.buscar_telefone_por_id(list(telefones_ids))
+                }
+                enderecos = {
+                    e["id_endereco"]: e
+                    for e in self.address.buscar_endereco_por_id(list(enderecos_ids))
+                }
 
             # 4. Combina os dados
             for colab in colaboradores:
@@ -295,5 +280,3 @@ class Collaborator:
             return []
         except mysql.connector.Error as e:
             raise Exception(f"Erro ao recuperar dados completos: {e}")
-        finally:
-            self.db.fecharConexao()
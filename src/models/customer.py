@@ -1,11 +1,20 @@
 # SESSÃO CLIENTE:
-from tkinter import messagebox
 import mysql
 import mysql.connector
 
 from src.database.connectFromDB import Database
 from src.models.phones import Phones
 
+# Consulta compartilhada pela versão em lista e pela versão em streaming
+_SQL_CLIENTES = """
+    SELECT
+        cpf,
+        nome,
+        fk_telefone
+    FROM clientes
+    ORDER BY nome
+"""
+
 
 class Customers:
     def __init__(self, db: Database, phone: Phones):
@@ -24,17 +33,15 @@ class Customers:
             mysql.connector.Error: Se ocorrer um erro ao inserir o cliente.
         """
         try:
-            fk_telefone = self.phones.inserirTelefone(telefone)
-            self.db.abrirConexao()
-            sql = "INSERT INTO clientes (cpf, nome, fk_telefone) VALUES (%s,%s,%s)"
-            data: tuple = (cpf, nome, fk_telefone)
-            self.db.cursor.execute(sql, data)
-            self.db.connection.commit()
+            # Telefone e cliente são gravados na mesma transação
+            with self.db.transaction() as cursor:
+                fk_telefone = self.phones.inserirTelefone(telefone)
+                sql = "INSERT INTO clientes (cpf, nome, fk_telefone) VALUES (%s,%s,%s)"
+                data: tuple = (cpf, nome, fk_telefone)
+                cursor.execute(sql, data)
             print(f"✅ {nome} foi adicionado com sucesso!")
         except mysql.connector.Error as e:
             print(f"❌ Erro ao inserir o novo cliente: \n {e}")
-        finally:
-            self.db.fecharConexao()
 
     def atualizarCliente(
         self,
@@ -54,31 +61,29 @@ class Customers:
             mysql.connector.Error: Se ocorrer erro ao atualizar o cliente.
         """
         try:
-            self.db.abrirConexao()
-            valores_dict = {}
-            if novo_nome is not None:
-                valores_dict["nome"] = novo_nome
-
-            if valores_dict:
-                self.db.atualizarRegistro("clientes", valores_dict, "cpf", cpf)
-
-            if novo_telefone is not None:
-                id_telefone = self.db.searchIDFromDataBase(
-                    cpf, coluna="fk_telefone", tabela="clientes"
-                )
-                if id_telefone is not None:
-                    self.db.atualizarRegistro(
-                        "telefones",
-                        {"telefone": novo_telefone},
-                        "id_telefone",
-                        id_telefone,
+            with self.db.conexao():
+                valores_dict = {}
+                if novo_nome is not None:
+                    valores_dict["nome"] = novo_nome
+
+                if valores_dict:
+                    self.db.atualizarRegistro("clientes", valores_dict, "cpf", cpf)
+
+                if novo_telefone is not None:
+                    id_telefone = self.db.searchIDFromDataBase(
+                        cpf, coluna="fk_telefone", tabela="clientes"
                     )
+                    if id_telefone is not None:
+                        self.db.atualizarRegistro(
+                            "telefones",
+                            {"telefone": novo_telefone},
+                            "id_telefone",
+                            id_telefone,
+                        )
         except (
             mysql.connector.Error
         ):  # Genérico, idealmente tratar especificamente ou relançar
             print("❌ ocorreu um erro ao atualizar o cliente.")
-        finally:
-            self.db.fecharConexao()
 
     def deletarCliente(self, cpf: int):
         """Deleta um cliente do banco de dados.
@@ -90,15 +95,13 @@ class Customers:
             mysql.connector.Error: Se ocorrer erro ao deletar o cliente.
         """
         try:
-            self.db.abrirConexao()
-            sql = "DELETE FROM clientes WHERE cpf = %s;"
-            self.db.cursor.execute(sql, (cpf,))
-            self.db.connection.commit()
+            with self.db.conexao() as cursor:
+                sql = "DELETE FROM clientes WHERE cpf = %s;"
+                cursor.execute(sql, (cpf,))
+                self.db.commit()
             print("✅ Cliente deletado com sucesso.")
         except mysql.connector.Error as e:
             print(f"❌ Erro ao deletar o Cliente: \n {e}")
-        finally:
-            self.db.fecharConexao()
 
     def recuperar_clientes(self) -> list:
         """Recupera todos os clientes da tabela 'clientes' no MySQL
@@ -107,42 +110,44 @@ class Customers:
             list: Lista de dicionários com os dados dos clientes
         """
         try:
-            self.db.abrirConexao()
-            self.db.cursor.execute(
-                """
-            SELECT 
-                cpf,
-                nome,
-                fk_telefone
-            FROM clientes
-            ORDER BY nome
-            """
-            )
-            resultados = self.db.cursor.fetchall()
-            return resultados
+            return self.db.consultarComCache(_SQL_CLIENTES)
 
         except mysql.connector.Error as e:
-            messagebox.showerror("Erro", f"Falha ao recuperar clientes: {str(e)}")
+            print(f"❌ Falha ao recuperar clientes: \n{e}")
             return []
-        finally:
-            self.db.fecharConexao()
 
-    def recuperar_clientes_completos(self) -> list:
-        """Recupera os dados de clientes com informações de telefone."""
-        try:
-            self.db.abrirConexao()
+    def iterar_clientes(self, tamanho_lote: int = 500):
+        """Versão em streaming de `recuperar_clientes` para exportações e relatórios.
+
+        Args:
+            tamanho_lote (int): Linhas buscadas no servidor a cada fetchmany.
 
-            # 1. Recupera todos os clientes
-            clientes = self.recuperar_clientes()
+        Yields:
+            dict: Um cliente por vez, com cpf, nome e fk_telefone.
 
-            # 2. Coleta todos os IDs únicos de telefones
-            telefones_ids = {c["fk_telefone"] for c in clientes if c.get("fk_telefone")}
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        yield from self.db.iterarConsulta(_SQL_CLIENTES, tamanho_lote=tamanho_lote)
 
-            # 3. Busca todos os telefones de uma só vez
-            telefones = {
-                t["id_telefone"]: t
-                for t in self.phones.buscar_telefone_por_id(list(telefones_ids))
-            }
+    def recuperar_clientes_completos(self) -> list:
+        """Recupera os dados de clientes com informações de telefone."""
+        try:
+            # Uma única conexão do pool atende as duas consultas
+            with self.db.conexao():
+                # 1. Recupera todos os clientes
+                clientes = self.recuperar_clientes()
+
+                # 2. Coleta todos os IDs únicos de telefones
+                telefones_ids = {
+                    c["fk_telefone"] for c in clientes if c.get("fk_telefone")
+                }
+
+                # 3. Busca todos os telefones de uma só vez
+                telefones = {
+                    t["id_telefone"]: t
+                    for t in self.phones.buscar_telefone_por_id(list(telefones_ids))
+                }
 
             # 4. Combina os dados
             for cliente in clientes:
@@ -163,8 +168,6 @@ class Customers:
             return []
         except mysql.connector.Error as e:
             raise Exception(f"Erro ao recuperar dados completos dos clientes: {e}")
-        finally:
-            self.db.fecharConexao()
 
     def cpf_existe_cliente(self, cpf: str) -> bool:
         """
@@ -180,8 +183,6 @@ class Customers:
             ValueError: Se o CPF for inválido
         """
         try:
-            self.db.abrirConexao()
-
             # Remove caracteres não numéricos
             cpf_limpo = "".join(filter(str.isdigit, cpf))
             if len(cpf_limpo) != 11:
@@ -189,8 +190,7 @@ class Customers:
 
             # Consulta na tabela 'clientes'
             sql = "SELECT COUNT(1) AS total FROM clientes WHERE cpf = %s"
-            self.db.cursor.execute(sql, (cpf_limpo,))
-            resultado = self.db.cursor.fetchone()
+            resultado = self.db.consultarPreparado(sql, (cpf_limpo,), unico=True)
 
             return resultado["total"] > 0 if resultado else False
 
@@ -198,5 +198,3 @@ class Customers:
             raise ValueError(f"Erro ao verificar CPF: \n{str(e)}")
         except mysql.connector.Error as e:
             raise ValueError(f"Erro ao validar CPF: \n{e}")
-        finally:
-            self.db.fecharConexao()
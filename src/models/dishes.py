@@ -1,15 +1,34 @@
 # SESSÃO PRATOS
-from MySQLdb import DatabaseError, Error
 import mysql, mysql.connector
 
 from src.database.connectFromDB import Database
+from src.models.catalog import Catalog
 from src.models.prices import Prices
 
+# Pratos por UPDATE na atualização em lote
+_LOTE_PRATOS = 200
+
+# Consulta da versão em streaming (exportações); as telas leem do catálogo em memória
+_SQL_PRATOS_COMPLETOS = """
+    SELECT
+        p.id,
+        p.nome,
+        pr.preco AS preco,
+        GROUP_CONCAT(i.nome ORDER BY i.nome SEPARATOR ', ') AS ingredientes
+    FROM pratos p
+    JOIN precos pr ON pr.id = p.fk_preco
+    LEFT JOIN Prato_Ingredientes pi ON pi.prato_id = p.id
+    LEFT JOIN ingredientes i ON i.id = pi.ingrediente_id
+    GROUP BY p.id, p.nome, pr.preco
+    ORDER BY p.nome
+"""
+
 
 class Dishes:
     def __init__(self, db: Database):
         self.db = db
         self.price = Prices(self.db)
+        self.catalogo = Catalog(self.db)
 
     def inserirPrato(self, nome: str, preco: float):
         """
@@ -26,19 +45,19 @@ class Dishes:
             mysql.connector.Error: Se ocorrer um erro ao executar a inserção no banco.
         """
         try:
-            fk_preco = self.price.inserirPreco(preco)
-            self.db.abrirConexao()
-            sql = "INSERT INTO Pratos (nome, fk_preco) VALUES (%s, %s)"
-            self.db.cursor.execute(sql, (nome, fk_preco))
-            self.db.connection.commit()
-            newID = self.db.cursor.lastrowid
+            # Preço e prato são gravados na mesma transação
+            with self.db.transaction() as cursor:
+                fk_preco = self.price.inserirPreco(preco)
+                sql = "INSERT INTO Pratos (nome, fk_preco) VALUES (%s, %s)"
+                cursor.execute(sql, (nome, fk_preco))
+                newID = cursor.lastrowid
+                self.price.registrarHistorico(pratos_ids=[newID])
+                self.catalogo.registrarAlteracao()
             print(f"✅ Prato (ID: {newID}, Nome: {nome}) inserido com sucesso.")
             return newID
         except mysql.connector.Error as e:
             print(f"❌ Erro ao inserir prato: \n{e}")
             return None
-        finally:
-            self.db.fecharConexao()
 
     def adicionarIngredienteAoPrato(self, prato_id: int, ingrediente_id: int):
         """
@@ -55,10 +74,11 @@ class Dishes:
             mysql.connector.Error: Se ocorrer um erro durante a inserção na tabela de junção.
         """
         try:
-            self.db.abrirConexao()
-            sql = "INSERT INTO Prato_Ingredientes (prato_id, ingrediente_id) VALUES (%s, %s)"
-            self.db.cursor.execute(sql, (prato_id, ingrediente_id))
-            self.db.connection.commit()
+            with self.db.conexao() as cursor:
+                sql = "INSERT INTO Prato_Ingredientes (prato_id, ingrediente_id) VALUES (%s, %s)"
+                cursor.execute(sql, (prato_id, ingrediente_id))
+                self.catalogo.registrarAlteracao()
+                self.db.commit()
             print(
                 f"✅ Ingrediente (ID: {ingrediente_id}) adicionado ao Prato (ID: {prato_id}) com sucesso."
             )
@@ -68,8 +88,109 @@ class Dishes:
                 f"❌ Erro ao adicionar ingrediente (ID: {ingrediente_id}) ao Prato (ID: {prato_id}): \n{e}"
             )
             return False
-        finally:
-            self.db.fecharConexao()
+
+    def adicionarIngredientesAoPrato(
+        self, prato_id: int, ingredientes_ids: list, ignorar_duplicados: bool = False
+    ):
+        """
+        Associa vários ingredientes a um prato com um único INSERT na tabela Prato_Ingredientes.
+
+        Args:
+            prato_id (int): O ID do prato.
+            ingredientes_ids (list): Lista com os IDs dos ingredientes.
+            ignorar_duplicados (bool): Se True, associações já existentes são ignoradas
+                (INSERT IGNORE) em vez de fazer toda a inserção falhar.
+
+        Returns:
+            bool: True se a associação foi bem-sucedida, False caso contrário.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer um erro durante a inserção na tabela de junção.
+        """
+        # Remove IDs repetidos mantendo a ordem de seleção
+        ids = list(dict.fromkeys(ingredientes_ids or []))
+        if not ids:
+            return True
+
+        try:
+            with self.db.transaction():
+                inseridos = self.db.inserirRegistros(
+                    "Prato_Ingredientes",
+                    ["prato_id", "ingrediente_id"],
+                    [(prato_id, ingrediente_id) for ingrediente_id in ids],
+                    ignorar_duplicados=ignorar_duplicados,
+                )
+                if inseridos:
+                    self.catalogo.registrarAlteracao()
+            print(
+                f"✅ {inseridos} ingrediente(s) adicionado(s) ao Prato (ID: {prato_id}) com sucesso."
+            )
+            return True
+        except mysql.connector.Error as e:
+            print(
+                f"❌ Erro ao adicionar ingredientes {ids} ao Prato (ID: {prato_id}): \n{e}"
+            )
+            return False
+
+    def definirIngredientesDoPrato(self, prato_id: int, ingredientes_ids: list):
+        """
+        Deixa em Prato_Ingredientes exatamente os ingredientes `ingredientes_ids`.
+
+        Lê os ingredientes atuais uma vez e aplica só a diferença: um DELETE
+        para os que saíram e um INSERT de múltiplos VALUES para os que
+        entraram, na mesma transação.
+
+        Args:
+            prato_id (int): O ID do prato.
+            ingredientes_ids (list): IDs de todos os ingredientes que o prato deve ter.
+
+        Returns:
+            bool: True se a atualização foi bem-sucedida, False caso contrário.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer um erro durante a atualização.
+        """
+        desejados = list(
+            dict.fromkeys(int(ingrediente_id) for ingrediente_id in ingredientes_ids or [])
+        )
+
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    "SELECT ingrediente_id FROM Prato_Ingredientes WHERE prato_id = %s FOR UPDATE",
+                    (prato_id,),
+                )
+                atuais = {row["ingrediente_id"] for row in cursor.fetchall()}
+
+                remover = [
+                    ingrediente_id for ingrediente_id in atuais if ingrediente_id not in desejados
+                ]
+                incluir = [
+                    ingrediente_id for ingrediente_id in desejados if ingrediente_id not in atuais
+                ]
+
+                if remover:
+                    cursor.execute(
+                        "DELETE FROM Prato_Ingredientes WHERE prato_id = %s "
+                        f"AND ingrediente_id IN ({', '.join(['%s'] * len(remover))})",
+                        (prato_id, *remover),
+                    )
+                if incluir:
+                    self.db.inserirRegistros(
+                        "Prato_Ingredientes",
+                        ["prato_id", "ingrediente_id"],
+                        [(prato_id, ingrediente_id) for ingrediente_id in incluir],
+                    )
+                if remover or incluir:
+                    self.catalogo.registrarAlteracao()
+            print(
+                f"✅ Ingredientes do Prato (ID: {prato_id}): {len(incluir)} incluído(s), "
+                f"{len(remover)} removido(s)."
+            )
+            return True
+        except mysql.connector.Error as e:
+            print(f"❌ Erro ao definir ingredientes do Prato (ID: {prato_id}): \n{e}")
+            return False
 
     def removerIngredienteDoPrato(self, prato_id: int, ingrediente_id: int):
         """
@@ -86,11 +207,15 @@ class Dishes:
             mysql.connector.Error: Se ocorrer um erro durante a deleção na tabela de junção.
         """
         try:
-            self.db.abrirConexao()
-            sql = "DELETE FROM Prato_Ingredientes WHERE prato_id = %s AND ingrediente_id = %s"
-            self.db.cursor.execute(sql, (prato_id, ingrediente_id))
-            self.db.connection.commit()
-            if self.db.cursor.rowcount > 0:
+            with self.db.conexao() as cursor:
+                sql = "DELETE FROM Prato_Ingredientes WHERE prato_id = %s AND ingrediente_id = %s"
+                cursor.execute(sql, (prato_id, ingrediente_id))
+                removidos = cursor.rowcount
+                if removidos > 0:
+                    self.catalogo.registrarAlteracao()
+                self.db.commit()
+
+            if removidos > 0:
                 print(
                     f"✅ Ingrediente (ID: {ingrediente_id}) removido do Prato (ID: {prato_id}) com sucesso."
                 )
@@ -105,19 +230,27 @@ class Dishes:
                 f"❌ Erro ao remover ingrediente (ID: {ingrediente_id}) do Prato (ID: {prato_id}): \n{e}"
             )
             return False
-        finally:
-            self.db.fecharConexao()
 
     def atualizarPrato(
-        self, id_prato: int, novo_nome: str = None, novo_preco: float = None
+        self,
+        id_prato: int,
+        novo_nome: str = None,
+        novo_preco: float = None,
+        ingredientes_ids: list = None,
     ):
         """
         Atualiza os dados de um prato existente.
 
+        Nome e preço são gravados por um único UPDATE de Pratos com Precos
+        (só se mudaram). Com `ingredientes_ids`, a troca de ingredientes entra
+        na mesma transação.
+
         Args:
             id_prato (int): O ID do prato a ser atualizado.
             novo_nome (str, optional): O novo nome do prato.
             novo_preco (float, optional): O novo preço para o prato.
+            ingredientes_ids (list, optional): IDs de todos os ingredientes que o
+                prato deve ter (ver definirIngredientesDoPrato).
 
         Returns:
             bool: True se a atualização foi bem-sucedida, False caso contrário.
@@ -125,33 +258,103 @@ class Dishes:
         Raises:
             mysql.connector.Error: Se ocorrer um erro durante a atualização.
         """
-        try:
+        if novo_nome is None and novo_preco is None and ingredientes_ids is None:
+            print("⚠️ Nenhum campo fornecido para atualizar o prato.")
+            return False
 
-            fk_preco = self.get_fk_preco_by_prato_id(id_prato)
-            self.price.atualizarPreco(fk_preco, novo_preco)
-            self.db.abrirConexao()
-            valores_dict = {}
-            if novo_nome is not None:
-                valores_dict["nome"] = novo_nome
-
-            if valores_dict:
-                try:
-                    self.db.atualizarRegistro("Pratos", valores_dict, "id", id_prato)
-                    return True
-                except mysql.connector.Error as e:
+        try:
+            with self.db.transaction():
+                if not self.atualizarPratos({id_prato: (novo_nome, novo_preco)}):
+                    print(f"⚠️ Prato (ID: {id_prato}) não encontrado.")
                     return False
-            else:
-                print("⚠️ Nenhum campo fornecido para atualizar o prato.")
-                return False
-        except mysql.connector.Error:
-            return
-        finally:
-            self.db.fecharConexao()
+                if ingredientes_ids is not None:
+                    self.definirIngredientesDoPrato(id_prato, ingredientes_ids)
+            return True
+        except mysql.connector.Error as e:
+            print(f"❌ Erro ao atualizar Prato (ID: {id_prato}): \n{e}")
+            return False
+
+    def atualizarPratos(self, alteracoes: dict, tamanho_lote: int = _LOTE_PRATOS) -> int:
+        """
+        Atualiza nome e/ou preço de vários pratos (ex.: reajuste do cardápio).
+
+        Cada lote de pratos é lido e travado pela chave primária e os que
+        mudaram de fato são gravados por um único UPDATE de Pratos com Precos,
+        com um CASE por coluna, seguido do registro dos novos preços no
+        histórico; todos os lotes e o carimbo do catálogo vão na mesma transação.
+
+        Args:
+            alteracoes (dict): {id_prato: (novo_nome, novo_preco)}; None mantém o valor atual.
+            tamanho_lote (int): Máximo de pratos por UPDATE.
+
+        Returns:
+            int: Quantidade de pratos encontrados, alterados ou não (0 se nenhum existe).
+
+        Raises:
+            mysql.connector.Error: Se ocorrer um erro durante a atualização.
+        """
+        alteracoes = {
+            int(prato_id): (nome, None if preco is None else float(preco))
+            for prato_id, (nome, preco) in alteracoes.items()
+        }
+        if not alteracoes:
+            return 0
+
+        ids = list(alteracoes)
+        encontrados = alterados = 0
+        with self.db.transaction() as cursor:
+            for inicio in range(0, len(ids), tamanho_lote):
+                lote = ids[inicio : inicio + tamanho_lote]
+                # O rowcount do UPDATE conta só as linhas alteradas (não as
+                # encontradas), então a existência vem desta leitura
+                cursor.execute(
+                    "SELECT p.id, p.nome, pr.preco FROM Pratos p "
+                    "JOIN Precos pr ON pr.id = p.fk_preco "
+                    f"WHERE p.id IN ({', '.join(['%s'] * len(lote))}) FOR UPDATE",
+                    lote,
+                )
+                atuais = {row["id"]: (row["nome"], row["preco"]) for row in cursor.fetchall()}
+                encontrados += len(atuais)
+
+                atribuicoes, params, mudaram, precos_mudaram = [], [], set(), []
+                for indice, coluna in enumerate(("p.nome", "pr.preco")):
+                    casos = [
+                        (prato_id, alteracoes[prato_id][indice])
+                        for prato_id in atuais
+                        if alteracoes[prato_id][indice] is not None
+                        and alteracoes[prato_id][indice] != atuais[prato_id][indice]
+                    ]
+                    if casos:
+                        atribuicoes.append(
+                            f"{coluna} = CASE p.id "
+                            + " ".join(["WHEN %s THEN %s"] * len(casos))
+                            + f" ELSE {coluna} END"
+                        )
+                        params.extend(valor for caso in casos for valor in caso)
+                        mudaram.update(prato_id for prato_id, _ in casos)
+                        if coluna == "pr.preco":
+                            precos_mudaram = [prato_id for prato_id, _ in casos]
+                if not mudaram:
+                    continue
+
+                cursor.execute(
+                    "UPDATE Pratos p JOIN Precos pr ON pr.id = p.fk_preco "
+                    f"SET {', '.join(atribuicoes)} "
+                    f"WHERE p.id IN ({', '.join(['%s'] * len(mudaram))})",
+                    (*params, *sorted(mudaram)),
+                )
+                alterados += len(mudaram)
+                self.price.registrarHistorico(pratos_ids=precos_mudaram)
+            if alterados:
+                self.catalogo.registrarAlteracao()
+                print(f"✅ {alterados} prato(s) atualizado(s).")
+        return encontrados
 
     def deletarPrato(self, id_prato: int):
         """
         Deleta um prato da tabela Pratos e suas associações.
         Isso removerá o prato de Prato_Ingredientes, Pedido_Pratos e Cardapio_Pratos primeiro.
+        O histórico de preços (Precos_Historico) é mantido para os pedidos arquivados.
 
         Args:
             id_prato (int): O ID do prato a ser deletado.
@@ -163,21 +366,26 @@ class Dishes:
             mysql.connector.Error: Se ocorrer um erro durante a deleção.
         """
         try:
-            self.db.abrirConexao()
-            # Remover de tabelas de junção
-            tabelas_juncao = ["Prato_Ingredientes", "Pedido_Pratos", "Cardapio_Pratos"]
-            for tabela in tabelas_juncao:
-                sql_remove_assoc = f"DELETE FROM {tabela} WHERE prato_id = %s"
-                self.db.cursor.execute(sql_remove_assoc, (id_prato,))
-
-            # Deletar o prato
-            sql_delete_prato = "DELETE FROM Pratos WHERE id = %s"
-            self.db.cursor.execute(sql_delete_prato, (id_prato,))
-
-            self.db.connection.commit()
+            # Associações e prato saem juntos ou nada é removido
+            with self.db.transaction() as cursor:
+                # Remover de tabelas de junção
+                tabelas_juncao = [
+                    "Prato_Ingredientes",
+                    "Pedido_Pratos",
+                    "Cardapio_Pratos",
+                ]
+                for tabela in tabelas_juncao:
+                    sql_remove_assoc = f"DELETE FROM {tabela} WHERE prato_id = %s"
+                    cursor.execute(sql_remove_assoc, (id_prato,))
+
+                # Deletar o prato
+                sql_delete_prato = "DELETE FROM Pratos WHERE id = %s"
+                cursor.execute(sql_delete_prato, (id_prato,))
+                deletados = cursor.rowcount
+                self.catalogo.registrarAlteracao()
 
             # A verificação do rowcount aqui se refere apenas à última operação (DELETE FROM Pratos)
-            if self.db.cursor.rowcount > 0:
+            if deletados > 0:
                 print(
                     f"✅ Prato (ID: {id_prato}) e suas associações deletados com sucesso."
                 )
@@ -189,46 +397,58 @@ class Dishes:
                 )
                 return False  # Ou True se considerar a limpeza das associações um sucesso parcial.
         except mysql.connector.Error as e:
-            self.connection.rollback()
             print(f"❌ Erro ao deletar prato (ID: {id_prato}): \n{e}")
             return False
-        finally:
-            self.db.fecharConexao()
 
     def recuperar_pratos_completos(self) -> list:
         """
         Recupera todos os pratos com nome, preço e ingredientes agregados.
 
+        Lê do catálogo em memória (`Catalog.atual`): o banco só é consultado
+        de novo depois de alguma alteração em pratos, preços ou ingredientes.
+
         Returns:
-            list: Lista de dicionários contendo os dados dos pratos e seus ingredientes.
+            list: Lista de dicionários {id, nome, preco, ingredientes,
+                ingredientes_ids}, ordenada pelo nome, com os nomes dos
+                ingredientes separados por vírgula (None se não houver).
         """
         try:
-            self.db.abrirConexao()
-
-            sql = """
-            SELECT
-                p.id,
-                p.nome,
-                pr.preco AS preco,
-                GROUP_CONCAT(i.nome ORDER BY i.nome SEPARATOR ', ') AS ingredientes
-            FROM pratos p
-            JOIN precos pr ON pr.id = p.fk_preco
-            LEFT JOIN Prato_Ingredientes pi ON pi.prato_id = p.id
-            LEFT JOIN ingredientes i ON i.id = pi.ingrediente_id
-            GROUP BY p.id, p.nome, pr.preco
-            ORDER BY p.nome;
-            """
-
-            self.db.cursor.execute(sql)
-            resultados = self.db.cursor.fetchall()
-
-            return resultados
+            catalogo = self.catalogo.atual()
+            return [
+                {
+                    "id": prato.id,
+                    "nome": prato.nome,
+                    "preco": prato.preco,
+                    "ingredientes": ", ".join(
+                        catalogo.nome_ingrediente(ingrediente_id)
+                        for ingrediente_id in prato.ingredientes
+                    )
+                    or None,
+                    "ingredientes_ids": list(prato.ingredientes),
+                }
+                for prato in catalogo.pratos()
+            ]
 
         except mysql.connector.Error as e:
             print(f"❌ Erro ao recuperar pratos completos:\n{e}")
             return []
-        finally:
-            self.db.fecharConexao()
+
+    def iterar_pratos_completos(self, tamanho_lote: int = 500):
+        """
+        Versão em streaming de `recuperar_pratos_completos` para exportações e relatórios.
+
+        Args:
+            tamanho_lote (int): Linhas buscadas no servidor a cada fetchmany.
+
+        Yields:
+            dict: Um prato por vez, com id, nome, preco e ingredientes.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        yield from self.db.iterarConsulta(
+            _SQL_PRATOS_COMPLETOS, tamanho_lote=tamanho_lote
+        )
 
     def recuperar_pratos_para_pedido(self, pedido_id: int) -> dict:
         """
@@ -241,7 +461,6 @@ class Dishes:
            dict: {'id': int, 'nome': str, 'preco': Decimal}.
         """
         try:
-            self.db.abrirConexao()
             # Monta a query: pratos que não possuem associação em Pedido_Pratos para este pedido
             sql = """
                 SELECT p.id, p.nome, pr.preco AS preco 
@@ -252,8 +471,9 @@ class Dishes:
                 WHERE pp.prato_id IS NULL
                 ORDER BY p.nome
                 """
-            self.db.cursor.execute(sql, (pedido_id,))
-            rows = self.db.cursor.fetchall()
+            with self.db.conexao() as cursor:
+                cursor.execute(sql, (pedido_id,))
+                rows = cursor.fetchall()
 
             pratos_disponiveis = [
                 {"id": row["id"], "nome": row["nome"], "preco": row["preco"]}
@@ -266,9 +486,6 @@ class Dishes:
             print(f"❌ Erro ao recuperar pratos para pedido {pedido_id}: \n{e}")
             return []
 
-        finally:
-            self.db.fecharConexao()
-
     def recuperar_ingredientes(self) -> list:
         """
         Recupera todos os ingredientes da tabela Ingredientes.
@@ -277,28 +494,20 @@ class Dishes:
             list: Lista de dicionários com id e nome de cada ingrediente.
         """
         try:
-            self.db.abrirConexao()
-            self.db.cursor.execute("SELECT id, nome FROM Ingredientes ORDER BY nome")
-            return self.db.cursor.fetchall()
+            return [
+                {"id": ingrediente_id, "nome": nome}
+                for ingrediente_id, nome in self.catalogo.atual().ingredientes()
+            ]
         except mysql.connector.Error as e:
             print(f"❌ Erro ao recuperar ingredientes:\n{e}")
             return []
-        finally:
-            self.db.fecharConexao()
 
     def get_fk_preco_by_prato_id(self, prato_id: int) -> int | None:
         """
         Retorna o fk_preco (id da tabela Precos) para o dado prato_id.
         """
-        try:
-            self.db.abrirConexao()
-            sql = "SELECT fk_preco FROM Pratos WHERE id = %s"
-            self.db.cursor.execute(sql, (prato_id,))
-            row = self.db.cursor.fetchone()
-            if not row:
-                return None
-            # Se o cursor estiver em dictionary=True:
-            return row["fk_preco"]
-            # Se não for em dict mode, row[0]
-        finally:
-            self.db.fecharConexao()
+        sql = "SELECT fk_preco FROM Pratos WHERE id = %s"
+        row = self.db.consultarPreparado(sql, (prato_id,), unico=True)
+        if not row:
+            return None
+        return row["fk_preco"]
@@ -2,11 +2,13 @@
 import mysql, mysql.connector
 
 from src.database.connectFromDB import Database
+from src.models.catalog import Catalog
 
 
 class Ingredients:
     def __init__(self, db: Database):
         self.db = db
+        self.catalogo = Catalog(self.db)
 
     def inserirIngrediente(self, nome: str):
         """
@@ -22,10 +24,12 @@ class Ingredients:
             mysql.connector.Error: Se ocorrer um erro ao executar a inserção no banco.
         """
         try:
-            sql = "INSERT INTO Ingredientes (nome) VALUES (%s)"
-            self.db.cursor.execute(sql, (nome,))
-            self.db.connection.commit()
-            newID = self.db.cursor.lastrowid
+            with self.db.conexao() as cursor:
+                sql = "INSERT INTO Ingredientes (nome) VALUES (%s)"
+                cursor.execute(sql, (nome,))
+                newID = cursor.lastrowid
+                self.catalogo.registrarAlteracao()
+                self.db.commit()
             print(f"✅ Ingrediente (ID: {newID}, Nome: {nome}) inserido com sucesso.")
             return newID
         except mysql.connector.Error as e:
@@ -47,9 +51,11 @@ class Ingredients:
             mysql.connector.Error: Se ocorrer um erro durante a atualização.
         """
         try:
-            self.db.atualizarRegistro(
-                "Ingredientes", {"nome": novo_nome}, "id", id_ingrediente
-            )
+            with self.db.transaction():
+                self.db.atualizarRegistro(
+                    "Ingredientes", {"nome": novo_nome}, "id", id_ingrediente
+                )
+                self.catalogo.registrarAlteracao()
             return True
         except mysql.connector.Error as e:
             return False
@@ -71,19 +77,21 @@ class Ingredients:
             mysql.connector.Error: Se ocorrer um erro durante a deleção.
         """
         try:
-            # Primeiro, remover das associações em Prato_Ingredientes
-            sql_remove_assoc = (
-                "DELETE FROM Prato_Ingredientes WHERE ingrediente_id = %s"
-            )
-            self.db.cursor.execute(sql_remove_assoc, (id_ingrediente,))
-            # Não precisa de commit aqui se o próximo comando for na mesma transação (auto-commit off)
-            # Mas para garantir, vamos commitar se houver auto-commit ou fazer tudo em uma transação explícita.
-            self.db.connection.commit()  # Depende da configuração de auto-commit
-
-            sql = "DELETE FROM Ingredientes WHERE id = %s"
-            self.db.cursor.execute(sql, (id_ingrediente,))
-            self.db.connection.commit()  # Commit final
-            if self.db.cursor.rowcount > 0:
+            with self.db.conexao() as cursor:
+                # Primeiro, remover das associações em Prato_Ingredientes
+                sql_remove_assoc = (
+                    "DELETE FROM Prato_Ingredientes WHERE ingrediente_id = %s"
+                )
+                cursor.execute(sql_remove_assoc, (id_ingrediente,))
+
+                sql = "DELETE FROM Ingredientes WHERE id = %s"
+                cursor.execute(sql, (id_ingrediente,))
+                deletados = cursor.rowcount
+                self.catalogo.registrarAlteracao()
+                # Commit único: associações e ingrediente saem juntos
+                self.db.commit()
+
+            if deletados > 0:
                 print(
                     f"✅ Ingrediente (ID: {id_ingrediente}) e suas associações deletados com sucesso."
                 )
@@ -94,6 +102,6 @@ class Ingredients:
                 )
                 return False
         except mysql.connector.Error as e:
+            # A conexão é devolvida ao pool com rollback, desfazendo tudo
             print(f"❌ Erro ao deletar ingrediente (ID: {id_ingrediente}): \n{e}")
-            self.db.connection.rollback()  # Se algo deu errado, desfazer
             return False
@@ -28,18 +28,16 @@ class Login:
             password (str): Senha do usuário.
         """
         try:
-            self.db.abrirConexao()
-            sql = "INSERT INTO login (cpf, senha) VALUES (%s, %s)"
-            params = (
-                cpf,
-                password,
-            )
-            self.db.cursor.execute(sql, params)
-            self.db.connection.commit()
+            with self.db.conexao() as cursor:
+                sql = "INSERT INTO login (cpf, senha) VALUES (%s, %s)"
+                params = (
+                    cpf,
+                    password,
+                )
+                cursor.execute(sql, params)
+                self.db.commit()
         except mysql.connector.Error as e:
             raise ValueError(f"❌ Erro ao inserir login : \a {e}")
-        finally:
-            self.db.fecharConexao()
 
     def validate_login(self, cpf: str, password: str) -> dict:
         """
@@ -59,12 +57,9 @@ class Login:
         mysql.connector.Error: Em caso de falha na consulta ao banco.
         """
         try:
-            self.db.abrirConexao()
-
             # 1) Verifica existência do CPF e obtém a senha cadastrada
             sql = "SELECT senha FROM login WHERE cpf = %s"
-            self.db.cursor.execute(sql, (cpf,))
-            row = self.db.cursor.fetchone()
+            row = self.db.consultarPreparado(sql, (cpf,), unico=True)
 
             # Se não achou, retorna flags: CPF não existe
             if row is None:
@@ -82,9 +77,6 @@ class Login:
             # propagando erro de banco
             raise RuntimeError(f"Erro ao verificar login: {e.msg}") from e
 
-        finally:
-            self.db.fecharConexao()
-
     def searchDataFromPerson(self, cpf: str, colaborador: bool = True) -> dict:
         """Metodo para recuperar os dados de uma pessoa do banco
 
@@ -102,19 +94,14 @@ class Login:
             person: dict = {}
             tabela: str = "colaboradores" if colaborador else "clientes"
 
-            if not self.db.connection.is_connected():
-                self.db.connection.reconnect()
-                self.db.cursor = self.db.connection.cursor(dictionary=True)
-
             # verificação do valor da tabela
             if tabela not in ("colaboradores", "cliente"):
                 raise ValueError("❌Tabela invalida!")
 
-            sql = f"SELECT * FROM {tabela} WHERE cpf = %s"
-            self.db.cursor.execute(sql, (cpf,))
-            person["pessoa"] = self.db.cursor.fetchone()
-
-            self.db.fecharConexao()
+            with self.db.conexao() as cursor:
+                sql = f"SELECT * FROM {tabela} WHERE cpf = %s"
+                cursor.execute(sql, (cpf,))
+                person["pessoa"] = cursor.fetchone()
 
             return person if person else None
         except mysql.connector.Error as e:
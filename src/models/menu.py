@@ -2,11 +2,13 @@
 import mysql, mysql.connector
 
 from src.database.connectFromDB import Database
+from src.models.catalog import Catalog
 
 
 class Menu:
     def __init__(self, db: Database):
         self.db = db
+        self.catalogo = Catalog(self.db)
 
     def criarCardapio(self):
         """
@@ -20,18 +22,16 @@ class Menu:
             mysql.connector.Error: Se ocorrer um erro ao executar a inserção no banco.
         """
         try:
-            self.db.abrirConexao()
-            sql = "INSERT INTO Cardapio () VALUES ()"  # Ou "INSERT INTO Cardapio (id) VALUES (NULL)"
-            self.db.cursor.execute(sql)
-            self.db.connection.commit()
-            newID = self.cursor.lastrowid
+            with self.db.conexao() as cursor:
+                sql = "INSERT INTO Cardapio () VALUES ()"  # Ou "INSERT INTO Cardapio (id) VALUES (NULL)"
+                cursor.execute(sql)
+                self.db.commit()
+                newID = cursor.lastrowid
             print(f"✅ Novo Cardápio (ID: {newID}) criado com sucesso.")
             return newID
         except mysql.connector.Error as e:
             print(f"❌ Erro ao criar novo cardápio: \n{e}")
             return None
-        finally:
-            self.db.fecharConexao()
 
     def adicionarPratoAoCardapio(self, cardapio_id: int, prato_id: int):
         """
@@ -48,10 +48,10 @@ class Menu:
             mysql.connector.Error: Se ocorrer um erro durante a inserção na tabela de junção.
         """
         try:
-            self.db.abrirConexao()
-            sql = "INSERT INTO Cardapio_Pratos (cardapio_id, prato_id) VALUES (%s, %s)"
-            self.db.cursor.execute(sql, (cardapio_id, prato_id))
-            self.db.connection.commit()
+            with self.db.conexao() as cursor:
+                sql = "INSERT INTO Cardapio_Pratos (cardapio_id, prato_id) VALUES (%s, %s)"
+                cursor.execute(sql, (cardapio_id, prato_id))
+                self.db.commit()
             print(
                 f"✅ Prato (ID: {prato_id}) adicionado ao Cardápio (ID: {cardapio_id}) com sucesso."
             )
@@ -61,8 +61,46 @@ class Menu:
                 f"❌ Erro ao adicionar prato (ID: {prato_id}) ao Cardápio (ID: {cardapio_id}): \n{e}"
             )
             return False
-        finally:
-            self.db.fecharConexao()
+
+    def adicionarPratosAoCardapio(
+        self, cardapio_id: int, pratos_ids: list, ignorar_duplicados: bool = False
+    ):
+        """
+        Associa vários pratos a um cardápio com um único INSERT na tabela Cardapio_Pratos.
+
+        Args:
+            cardapio_id (int): O ID do cardápio.
+            pratos_ids (list): Lista com os IDs dos pratos.
+            ignorar_duplicados (bool): Se True, associações já existentes são ignoradas
+                (INSERT IGNORE) em vez de fazer toda a inserção falhar.
+
+        Returns:
+            bool: True se a associação foi bem-sucedida, False caso contrário.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer um erro durante a inserção na tabela de junção.
+        """
+        # Remove IDs repetidos mantendo a ordem de seleção
+        ids = list(dict.fromkeys(pratos_ids or []))
+        if not ids:
+            return True
+
+        try:
+            inseridos = self.db.inserirRegistros(
+                "Cardapio_Pratos",
+                ["cardapio_id", "prato_id"],
+                [(cardapio_id, prato_id) for prato_id in ids],
+                ignorar_duplicados=ignorar_duplicados,
+            )
+            print(
+                f"✅ {inseridos} prato(s) adicionado(s) ao Cardápio (ID: {cardapio_id}) com sucesso."
+            )
+            return True
+        except mysql.connector.Error as e:
+            print(
+                f"❌ Erro ao adicionar pratos {ids} ao Cardápio (ID: {cardapio_id}): \n{e}"
+            )
+            return False
 
     def removerPratoDoCardapio(self, cardapio_id: int, prato_id: int):
         """
@@ -79,11 +117,13 @@ class Menu:
             mysql.connector.Error: Se ocorrer um erro durante a deleção na tabela de junção.
         """
         try:
-            self.db.abrirConexao()
-            sql = "DELETE FROM Cardapio_Pratos WHERE cardapio_id = %s AND prato_id = %s"
-            self.db.cursor.execute(sql, (cardapio_id, prato_id))
-            self.db.connection.commit()
-            if self.db.cursor.rowcount > 0:
+            with self.db.conexao() as cursor:
+                sql = "DELETE FROM Cardapio_Pratos WHERE cardapio_id = %s AND prato_id = %s"
+                cursor.execute(sql, (cardapio_id, prato_id))
+                self.db.commit()
+                removidos = cursor.rowcount
+
+            if removidos > 0:
                 print(
                     f"✅ Prato (ID: {prato_id}) removido do Cardápio (ID: {cardapio_id}) com sucesso."
                 )
@@ -98,8 +138,6 @@ class Menu:
                 f"❌ Erro ao remover prato (ID: {prato_id}) do Cardápio (ID: {cardapio_id}): \n{e}"
             )
             return False
-        finally:
-            self.db.fecharConexao()
 
     def deletarCardapio(self, id_cardapio: int):
         """
@@ -115,18 +153,19 @@ class Menu:
             mysql.connector.Error: Se ocorrer um erro durante a deleção.
         """
         try:
-            self.db.abrirConexao()
-            # Remover de Cardapio_Pratos primeiro
-            sql_remove_assoc = "DELETE FROM Cardapio_Pratos WHERE cardapio_id = %s"
-            self.db.cursor.execute(sql_remove_assoc, (id_cardapio,))
+            with self.db.conexao() as cursor:
+                # Remover de Cardapio_Pratos primeiro
+                sql_remove_assoc = "DELETE FROM Cardapio_Pratos WHERE cardapio_id = %s"
+                cursor.execute(sql_remove_assoc, (id_cardapio,))
 
-            # Deletar o cardápio
-            sql_delete_cardapio = "DELETE FROM Cardapio WHERE id = %s"
-            self.db.cursor.execute(sql_delete_cardapio, (id_cardapio,))
+                # Deletar o cardápio
+                sql_delete_cardapio = "DELETE FROM Cardapio WHERE id = %s"
+                cursor.execute(sql_delete_cardapio, (id_cardapio,))
 
-            self.db.connection.commit()
+                self.db.commit()
+                deletados = cursor.rowcount  # Refere-se ao DELETE FROM Cardapio
 
-            if self.db.cursor.rowcount > 0:  # Refere-se ao DELETE FROM Cardapio
+            if deletados > 0:
                 print(
                     f"✅ Cardápio (ID: {id_cardapio}) e seus pratos associados deletados com sucesso."
                 )
@@ -135,17 +174,17 @@ class Menu:
                 print(f"⚠️ Cardápio (ID: {id_cardapio}) não encontrado para deleção.")
                 return False
         except mysql.connector.Error as e:
-            self.db.connection.rollback()
             print(f"❌ Erro ao deletar cardápio (ID: {id_cardapio}): \n{e}")
             return False
-        finally:
-            self.db.fecharConexao()
 
     def recuperar_cardapio_completo(self) -> dict:
         """
         Busca no banco de dados todos os pratos associados ao último cardápio criado,
         incluindo seus preços.
 
+        Do banco vêm só os ids dos pratos do cardápio; nome e preço vêm do
+        catálogo em memória (`Catalog.atual`).
+
         Returns:
             dict: {
                 'id': ultimo_cardapio_id
@@ -156,29 +195,23 @@ class Menu:
             }
         """
         try:
-            # Primeiro pegamos o ultimo id do cardapio no banco,levamos em consideração que o cardapio utilizado é o ultimo
-            self.db.abrirConexao()
-            sql_max = "SELECT MAX(id) FROM cardapio"
-            self.db.cursor.execute(sql_max)
-            result = self.db.cursor.fetchone()
-            if not result or result["MAX(id)"] is None:
-                return {"id": None, "pratos": []}
-            ultimo_id = result["MAX(id)"]
-
-            # Após pega o ultimo id do fazemos dois JOIN para juntar os dados dos pratos apartir da tabela cardapio_pratos
-            sql = (
-                "SELECT p.id, p.nome, pr.preco AS preco "
-                "FROM Pratos p "
-                "JOIN Cardapio_Pratos cp ON p.id = cp.prato_id "
-                "JOIN Precos pr ON p.fk_preco = pr.id "
-                "WHERE cp.cardapio_id = %s"
-            )
-            self.db.cursor.execute(sql, (ultimo_id,))
-            rows = self.db.cursor.fetchall()
+            with self.db.conexao():
+                # Primeiro pegamos o ultimo id do cardapio no banco,levamos em consideração que o cardapio utilizado é o ultimo
+                sql_max = "SELECT MAX(id) FROM cardapio"
+                result = self.db.consultarComCache(sql_max)
+                if not result or result[0]["MAX(id)"] is None:
+                    return {"id": None, "pratos": []}
+                ultimo_id = result[0]["MAX(id)"]
+
+                # Após pegar o ultimo id buscamos os pratos dele em cardapio_pratos
+                sql = "SELECT prato_id FROM Cardapio_Pratos WHERE cardapio_id = %s"
+                rows = self.db.consultarComCache(sql, (ultimo_id,))
+                catalogo = self.catalogo.atual()
             # print(f"pratos encontrados: {rows}")
             pratos = [
-                {"id": row["id"], "nome": row["nome"], "preco": row["preco"]}
-                for row in rows
+                {"id": prato.id, "nome": prato.nome, "preco": prato.preco}
+                for prato in (catalogo.prato(row["prato_id"]) for row in rows)
+                if prato is not None
             ]
 
             return {"id": ultimo_id, "pratos": pratos}
@@ -186,5 +219,3 @@ class Menu:
         except mysql.connector.Error as e:
             print(f"❌ Erro ao recuperar último cardápio completo: \n{e}")
             return {"id": None, "pratos": []}
-        finally:
-            self.db.fecharConexao()
@@ -1,12 +1,405 @@
 # SESSÃO PEDIDOS
+import heapq
+import math
+import os
+import sys
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+from operator import itemgetter
+from time import sleep
+
 import mysql, mysql.connector
 
 from src.database.connectFromDB import Database
+from src.database.eventLog import EventLog
+from src.enums.Enums import StatusPedido
+from src.models.catalog import Catalog
+from src.utils.changeMarker import ChangeMarker
+from src.utils.kitchenQueue import KitchenQueue
+from src.utils.openTables import OpenTables
+
+# Tabelas de pedidos em uso (quentes) e de pedidos arquivados (histórico).
+# Pedidos entregues antigos saem das primeiras para as segundas, veja
+# `Orders.arquivarPedidos`; cada pedido está em apenas uma delas.
+_ORIGENS = (
+    ("Pedidos", "Pedido_Pratos"),
+    ("Pedidos_Historico", "Pedido_Pratos_Historico"),
+)
+# Pedidos entregues arquivados por transação
+_LOTE_ARQUIVAMENTO = 500
+# Ids por UPDATE na mudança de status em lote
+_LOTE_STATUS = 500
+# Registros de Pedidos_Alteracoes lidos para montar o primeiro marcador: os ids
+# que faltam entre eles podem ser transações ainda não confirmadas
+_JANELA_MARCADOR = 200
+# Segundos que o mapa de contas das mesas responde sem conferir alterações
+# feitas por outros terminais
+_IDADE_MAXIMA_CONTAS = 2.0
+# Tabelas lidas pela conta das mesas: escritas locais nas de pedidos são
+# sincronizadas pelo registro de alterações; nas do cardápio (nome dos pratos)
+# o mapa é recarregado. Os preços são os do histórico no momento do pedido,
+# então mudanças de preço não alteram as contas já abertas.
+_TABELAS_PEDIDOS = frozenset({"pedidos", "pedido_pratos"})
+_TABELAS_CARDAPIO = frozenset({"pratos"})
+# Partição já existente / fora de ordem (ER_SAME_NAME_PARTITION e
+# ER_RANGE_NOT_INCREASING_ERROR): o mês já tem onde ficar
+_ERROS_PARTICAO_EXISTENTE = {1517, 1493}
+
+
+def _linhas_por_pedido(linhas) -> dict:
+    """Agrupa as linhas de _SQL_CONTA em {id_pedido: (num_mesa, linhas)}."""
+    pedidos = {}
+    for row in linhas:
+        pedido = pedidos.setdefault(row["id_pedido"], (row["num_mesa"], []))
+        pedido[1].append(row)
+    return pedidos
+
+
+def _precificar(linhas, historico) -> list:
+    """Preenche o preço das linhas de _SQL_CONTA com o do prato no momento do pedido."""
+    for row in linhas:
+        row["preco"] = historico.preco_em(row["prato_id"], row["criado_em"])
+    return linhas
+
+
+def _resumir_conta(num_mesa, linhas) -> dict:
+    """Soma as linhas de _SQL_CONTA (já precificadas) de uma mesa em uma conta,
+    por prato e preço."""
+    pedidos, itens = set(), {}
+    for row in linhas:
+        pedidos.add(row["id_pedido"])
+        if row["prato_id"] is None:
+            continue
+        chave = (row["prato_id"], row["preco"])
+        item = itens.get(chave)
+        if item is None:
+            item = itens[chave] = {
+                "prato_id": row["prato_id"],
+                "prato": row["prato"],
+                "quantidade": 0,
+                "preco": row["preco"] or 0,
+            }
+        item["quantidade"] += row["quantidade"]
+    for item in itens.values():
+        item["subtotal"] = item["quantidade"] * item["preco"]
+    return {
+        "num_mesa": num_mesa,
+        "pedidos": sorted(pedidos),
+        "itens": list(itens.values()),
+        "total": sum(item["subtotal"] for item in itens.values()),
+    }
+
+
+class PedidoDesatualizadoError(RuntimeError):
+    """Levantada quando o pedido mudou (em outro terminal) depois de ser lido para edição."""
+
+    def __init__(self, pedido_id: int, versao: int):
+        super().__init__(
+            f"O pedido {pedido_id} foi alterado em outro terminal. "
+            "Confira os dados atualizados e repita a alteração."
+        )
+        self.pedido_id = pedido_id
+        self.versao = versao
+
+
+def _select_pedidos(pedidos: str, pedido_pratos: str) -> str:
+    """SELECT dos pedidos das tabelas indicadas, uma linha por (pedido, prato).
+
+    Traz o id do prato em vez do nome e dos ingredientes; pedidos sem pratos
+    vêm com prato_id NULL.
+    """
+    return f"""
+    SELECT
+        p.id_pedido,
+        p.numMesa AS 'numero_da_mesa',
+        c.nome AS 'nome_do_colaborador',
+        p.status_pedido,
+        p.criado_em,
+        p.versao,
+        pp.prato_id,
+        pp.quantidade
+    FROM {pedidos} p
+    LEFT JOIN Colaboradores c ON p.fk_colaborador = c.cpf
+    LEFT JOIN {pedido_pratos} pp ON p.id_pedido = pp.pedido_id
+"""
+
+
+_SELECT_PEDIDOS = _select_pedidos(*_ORIGENS[0])
+# Ordenada por pedido para o agrupamento em streaming
+_SQL_PEDIDOS = _SELECT_PEDIDOS + "    ORDER BY p.id_pedido, pp.prato_id\n"
+
+# Uma linha por (prato, ingrediente); pratos sem ingredientes vêm com ingrediente NULL
+_SELECT_PRATOS = """
+    SELECT pr.id AS prato_id, pr.nome AS prato, i.nome AS ingrediente
+    FROM Pratos pr
+    LEFT JOIN Prato_Ingredientes pi ON pr.id = pi.prato_id
+    LEFT JOIN Ingredientes i ON pi.ingrediente_id = i.id
+"""
+_SQL_PRATOS = _SELECT_PRATOS + "    ORDER BY pr.id, i.nome\n"
+
+# Linhas (pedido, prato) dos pedidos em aberto; o preço vem do histórico, veja
+# `_precificar`. Pedidos sem pratos vêm com prato_id NULL. Os placeholders são
+# os status abertos.
+_SQL_CONTA = f"""
+    SELECT
+        p.id_pedido,
+        p.numMesa AS num_mesa,
+        p.criado_em,
+        pp.prato_id,
+        pr.nome AS prato,
+        pp.quantidade
+    FROM Pedidos p
+    LEFT JOIN Pedido_Pratos pp ON p.id_pedido = pp.pedido_id
+    LEFT JOIN Pratos pr ON pp.prato_id = pr.id
+    WHERE p.status_pedido IN ({', '.join(['%s'] * len(StatusPedido.abertos()))})
+"""
+
+
+def _intern(valor):
+    """Interna strings repetidas (nomes, status) para que todas as linhas usem o mesmo objeto."""
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+def _agrupar_pedidos(linhas):
+    """Agrupa as linhas de _SELECT_PEDIDOS (ordenadas por id_pedido) em pedidos normalizados.
+
+    Yields:
+        tuple: (id_pedido, pedido), com 'pratos' no formato {prato_id: quantidade}.
+    """
+    for pedido_id, linhas_pedido in groupby(linhas, key=itemgetter("id_pedido")):
+        primeira = next(linhas_pedido)
+        pratos = {}
+        if primeira["prato_id"] is not None:
+            pratos[primeira["prato_id"]] = primeira["quantidade"]
+        pratos.update((row["prato_id"], row["quantidade"]) for row in linhas_pedido)
+        yield pedido_id, {
+            "numero_da_mesa": primeira["numero_da_mesa"],
+            "nome_do_colaborador": _intern(primeira["nome_do_colaborador"]),
+            "status_pedido": _intern(primeira["status_pedido"]),
+            "criado_em": primeira["criado_em"],
+            "versao": primeira["versao"],
+            "valor_total": 0,
+            "pratos": pratos,
+        }
+
+
+def _indexar_pratos(linhas) -> dict:
+    """Agrupa as linhas de _SELECT_PRATOS (ordenadas por prato) no dicionário prato -> ingredientes."""
+    pratos = {}
+    for prato_id, linhas_prato in groupby(linhas, key=itemgetter("prato_id")):
+        linhas_prato = list(linhas_prato)
+        ingredientes = dict.fromkeys(
+            _intern(row["ingrediente"]) for row in linhas_prato if row["ingrediente"] is not None
+        )
+        pratos[prato_id] = {
+            "prato": _intern(linhas_prato[0]["prato"]),
+            "ingredientes": tuple(ingredientes),
+        }
+    return pratos
+
+
+def expandir_pedidos(pedidos: dict, pratos: dict) -> dict:
+    """Converte o payload normalizado no formato de `Orders.recuperar_pedidos`.
+
+    Args:
+        pedidos (dict): {id_pedido: pedido} com 'pratos' no formato {prato_id: quantidade}.
+        pratos (dict): {prato_id: {'prato': str, 'ingredientes': tuple}}.
+
+    Returns:
+        dict: {id_pedido: pedido} com 'pratos' como
+            [{'id', 'prato', 'quantidade', 'ingredientes'}].
+    """
+    return {
+        pedido_id: {
+            **pedido,
+            "pratos": [
+                {
+                    "id": prato_id,
+                    "prato": pratos[prato_id]["prato"],
+                    "quantidade": quantidade,
+                    "ingredientes": list(pratos[prato_id]["ingredientes"]),
+                }
+                for prato_id, quantidade in pedido["pratos"].items()
+                if prato_id in pratos
+            ],
+        }
+        for pedido_id, pedido in pedidos.items()
+    }
+
+
+def _filtros_pedidos(status, num_mesa, fk_colaborador, data_inicio, data_fim):
+    """Monta as condições do WHERE (em Pedidos) dos filtros da listagem de pedidos."""
+    condicoes, params = [], []
+    if status:
+        condicoes.append("status_pedido = %s")
+        params.append(status)
+    if num_mesa is not None:
+        condicoes.append("numMesa = %s")
+        params.append(num_mesa)
+    if fk_colaborador is not None:
+        condicoes.append("fk_colaborador = %s")
+        params.append(fk_colaborador)
+    if data_inicio is not None:
+        condicoes.append("criado_em >= %s")
+        params.append(datetime.combine(data_inicio, time.min))
+    if data_fim is not None:
+        condicoes.append("criado_em < %s")
+        params.append(datetime.combine(data_fim + timedelta(days=1), time.min))
+    return condicoes, params
+
+
+def _sql_pedidos_por_ids(quantidade: int) -> str:
+    """_SELECT_PEDIDOS restrito a `quantidade` ids, do mais recente para o mais antigo."""
+    placeholders = ", ".join(["%s"] * quantidade)
+    return (
+        _SELECT_PEDIDOS
+        + f"    WHERE p.id_pedido IN ({placeholders})\n"
+        + "    ORDER BY p.id_pedido DESC, pp.prato_id\n"
+    )
+
+
+def _sql_pratos_por_ids(quantidade: int) -> str:
+    """_SELECT_PRATOS restrito a `quantidade` ids de pratos."""
+    placeholders = ", ".join(["%s"] * quantidade)
+    return _SELECT_PRATOS + f"    WHERE pr.id IN ({placeholders})\n    ORDER BY pr.id, i.nome\n"
+
+
+def _filtro_periodo(coluna: str, data_inicio: date, data_fim: date):
+    """Monta o WHERE de um período (data_fim inclusive) sobre `coluna`."""
+    condicoes, params = [], []
+    if data_inicio is not None:
+        condicoes.append(f"{coluna} >= %s")
+        params.append(datetime.combine(data_inicio, time.min))
+    if data_fim is not None:
+        condicoes.append(f"{coluna} < %s")
+        params.append(datetime.combine(data_fim + timedelta(days=1), time.min))
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    return where, tuple(params)
+
+
+def _com_totais(pedidos, historico):
+    """Preenche valor_total dos pedidos (id_pedido, pedido) à medida que passam,
+    com os preços do histórico no momento de cada pedido."""
+    for pedido_id, pedido in pedidos:
+        pedido["valor_total"] = historico.total(pedido["pratos"], pedido["criado_em"])
+        yield pedido_id, pedido
+
+
+def _tempos_em_status(eventos):
+    """Tempo que o pedido ficou em cada status, a partir dos seus eventos em ordem.
+
+    Eventos seguidos com o mesmo status (ex.: pedido editado sem mudar o status)
+    contam como um só. O último status não tem duração.
+
+    Yields:
+        tuple: (status, entrada (datetime), segundos no status).
+    """
+    anterior = None
+    for evento in eventos:
+        if anterior is not None and evento["status"] == anterior["status"]:
+            continue
+        if anterior is not None:
+            segundos = (evento["registrado_em"] - anterior["registrado_em"]).total_seconds()
+            yield anterior["status"], anterior["registrado_em"], segundos
+        anterior = evento
+
+
+def _percentis(valores: list) -> dict:
+    """Quantidade e percentis 50/95/99 (método nearest-rank) de uma lista de durações."""
+    ordenados = sorted(valores)
+    total = len(ordenados)
+    return {
+        "n": total,
+        **{
+            f"p{p}": ordenados[max(0, math.ceil(p / 100 * total) - 1)]
+            for p in (50, 95, 99)
+        },
+    }
 
 
 class Orders:
+    # Fila da cozinha compartilhada por todas as instâncias de Orders
+    _fila = KitchenQueue()
+    # Meses (ano, mês) que já têm partição nas tabelas de histórico
+    _particoes = set()
+    # Contas em aberto por mesa, compartilhadas por todas as instâncias
+    _mesas = OpenTables()
+    # Eventos de status gravados em lotes em Pedidos_Eventos, compartilhados por
+    # todas as instâncias. Configurável por DB_EVENTOS_LOTE (eventos por INSERT,
+    # padrão 50) e DB_EVENTOS_INTERVALO (segundos máximos em memória, padrão 5).
+    _eventos = None
+
     def __init__(self, db: Database):
         self.db = db
+        self.catalogo = Catalog(self.db)
+        if Orders._eventos is None:
+            Orders._eventos = EventLog(
+                db,
+                "Pedidos_Eventos",
+                ["pedido_id", "status", "registrado_em"],
+                tamanho_lote=int(os.getenv("DB_EVENTOS_LOTE", 50)),
+                intervalo=float(os.getenv("DB_EVENTOS_INTERVALO", 5)),
+            )
+
+    def _registrarAlteracao(self, pedido_id: int, excluido: bool = False, versao: int = None):
+        """
+        Registra em Pedidos_Alteracoes que o pedido mudou (ou foi excluído) e
+        incrementa a versão do pedido.
+
+        Deve ser chamado dentro da conexão/transação do comando que alterou o
+        pedido, antes do commit, para que o registro só exista se a alteração existir.
+
+        Com `versao`, o incremento é condicional (UPDATE ... WHERE versao = %s):
+        a linha do pedido fica bloqueada até o fim da transação, e uma edição
+        concorrente feita a partir da mesma versão espera e depois falha.
+
+        Args:
+            pedido_id (int): O ID do pedido alterado.
+            excluido (bool): True se o pedido foi excluído.
+            versao (int, optional): Versão que o pedido deve ter agora.
+
+        Returns:
+            int | None: Com `versao`, a nova versão do pedido (`versao` + 1).
+
+        Raises:
+            PedidoDesatualizadoError: Se o pedido não está mais em `versao`.
+        """
+        with self.db.conexao() as cursor:
+            if versao is not None:
+                cursor.execute(
+                    "UPDATE Pedidos SET versao = versao + 1 WHERE id_pedido = %s AND versao = %s",
+                    (pedido_id, versao),
+                )
+                if cursor.rowcount == 0:
+                    raise PedidoDesatualizadoError(pedido_id, versao)
+            elif not excluido:
+                cursor.execute(
+                    "UPDATE Pedidos SET versao = versao + 1 WHERE id_pedido = %s",
+                    (pedido_id,),
+                )
+            cursor.execute(
+                "INSERT INTO Pedidos_Alteracoes (pedido_id, excluido) VALUES (%s, %s)",
+                (pedido_id, excluido),
+            )
+        return None if versao is None else versao + 1
+
+    def _registrarEvento(self, pedido_id: int, status: str, momento: datetime = None):
+        """
+        Registra que o pedido entrou em `status`, para o relatório de tempos.
+
+        O horário é o da mudança, mas o evento só entra na fila de gravação
+        (Pedidos_Eventos, em lotes) depois do commit; se a alteração for
+        desfeita, o evento é descartado.
+
+        Args:
+            pedido_id (int): O ID do pedido.
+            status (str): Novo status do pedido.
+            momento (datetime, optional): Horário da mudança. Padrão: agora.
+        """
+        momento = momento or datetime.now().replace(microsecond=0)
+        eventos = Orders._eventos
+        self.db.aoConfirmar(lambda: eventos.registrar(pedido_id, status, momento))
 
     def inserirPedido(
         self,
@@ -31,37 +424,37 @@ class Orders:
             mysql.connector.Error: Se ocorrer um erro ao executar a inserção no banco.
         """
         try:
-            # Criação do pedido
-            self.db.abrirConexao()
-            sql = "INSERT INTO Pedidos (numMesa, fk_colaborador,status_pedido) VALUES (%s, %s, %s)"
-            self.db.cursor.execute(sql, (num_mesa, fk_colaborador, status))
-            self.db.connection.commit()
-            newID = self.db.cursor.lastrowid
-            print(f"✅ Pedido (ID: {newID}) para mesa {num_mesa} inserido com sucesso.")
-            # ----------------------------------------------------------------------------
-            # Adicionar pratos ao pedido
-            try:
-                for prato_id in pratos:
-                    self.adicionarPratoAoPedido(newID, prato_id)
-                    print(
-                        f"✅ Prato (ID: {prato_id}) adicionado ao pedido {newID} com sucesso."
-                    )
-            except mysql.connector.Error as e:
-                raise RuntimeError(f"Falha na inserção do pedido: {e.msg}") from e
+            # Cabeçalho e pratos são gravados juntos, com um único commit
+            with self.db.transaction() as cursor:
+                # Criação do pedido
+                # criado_em vem do relógio do servidor, o mesmo das vigências
+                # de Precos_Historico, com microssegundos
+                sql = "INSERT INTO Pedidos (numMesa, fk_colaborador,status_pedido, criado_em) VALUES (%s, %s, %s, NOW(6))"
+                cursor.execute(sql, (num_mesa, fk_colaborador, status))
+                newID = cursor.lastrowid
+                self._registrarAlteracao(newID)
+                self._registrarEvento(newID, status or StatusPedido.PENDENTE.value)
+                # ----------------------------------------------------------------------------
+                # Adicionar pratos ao pedido em um único INSERT (a alteração
+                # já foi registrada acima)
+                if pratos:
+                    self._inserirPratos(newID, pratos, ignorar_duplicados=False)
 
+            print(f"✅ Pedido (ID: {newID}) para mesa {num_mesa} inserido com sucesso.")
             return newID
         except mysql.connector.Error as e:
             raise RuntimeError(f"Falha na inserção do pedido: {e.msg}") from e
-        finally:
-            self.db.fecharConexao()
 
-    def adicionarPratoAoPedido(self, pedido_id: int, prato_id: int):
+    def adicionarPratoAoPedido(self, pedido_id: int, prato_id: int, quantidade: int = 1):
         """
         Associa um prato a um pedido na tabela Pedido_Pratos.
 
+        Se o prato já está no pedido, a quantidade é somada à existente.
+
         Args:
             pedido_id (int): O ID do pedido.
             prato_id (int): O ID do prato.
+            quantidade (int): Quantas unidades do prato adicionar.
 
         Returns:
             bool: True se a associação foi bem-sucedida, False caso contrário.
@@ -70,12 +463,17 @@ class Orders:
             mysql.connector.Error: Se ocorrer um erro durante a inserção na tabela de junção.
         """
         try:
-            self.db.abrirConexao()
-            sql = "INSERT INTO Pedido_Pratos (pedido_id, prato_id) VALUES (%s, %s)"
-            self.db.cursor.execute(sql, (pedido_id, prato_id))
-            self.db.connection.commit()
+            with self.db.conexao() as cursor:
+                sql = (
+                    "INSERT INTO Pedido_Pratos (pedido_id, prato_id, quantidade) "
+                    "VALUES (%s, %s, %s) "
+                    "ON DUPLICATE KEY UPDATE quantidade = quantidade + VALUES(quantidade)"
+                )
+                cursor.execute(sql, (pedido_id, prato_id, quantidade))
+                self._registrarAlteracao(pedido_id)
+                self.db.commit()
             print(
-                f"✅ Prato (ID: {prato_id}) adicionado ao Pedido (ID: {pedido_id}) com sucesso."
+                f"✅ {quantidade}x Prato (ID: {prato_id}) adicionado ao Pedido (ID: {pedido_id}) com sucesso."
             )
             return True
         except mysql.connector.Error as e:
@@ -83,8 +481,60 @@ class Orders:
                 f"❌ Erro ao adicionar prato (ID: {prato_id}) ao Pedido (ID: {pedido_id}): \n{e}"
             )
             return False
-        finally:
-            self.db.fecharConexao()
+
+    def adicionarPratosAoPedido(
+        self, pedido_id: int, pratos_ids: list, ignorar_duplicados: bool = False
+    ):
+        """
+        Associa vários pratos a um pedido com um único INSERT na tabela Pedido_Pratos.
+
+        Um ID repetido na lista conta como mais uma unidade do prato. Pratos que
+        já estão no pedido têm a quantidade somada (ON DUPLICATE KEY UPDATE).
+
+        Args:
+            pedido_id (int): O ID do pedido.
+            pratos_ids (list): Lista com os IDs dos pratos.
+            ignorar_duplicados (bool): Se True, pratos que já estão no pedido são
+                mantidos como estão (INSERT IGNORE) em vez de terem a quantidade somada.
+
+        Returns:
+            bool: True se a associação foi bem-sucedida, False caso contrário.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer um erro durante a inserção na tabela de junção.
+        """
+        if not pratos_ids:
+            return True
+
+        try:
+            with self.db.transaction():
+                self._inserirPratos(pedido_id, pratos_ids, ignorar_duplicados)
+                self._registrarAlteracao(pedido_id)
+            return True
+        except mysql.connector.Error as e:
+            print(
+                f"❌ Erro ao adicionar pratos {list(dict.fromkeys(pratos_ids))} "
+                f"ao Pedido (ID: {pedido_id}): \n{e}"
+            )
+            return False
+
+    def _inserirPratos(self, pedido_id: int, pratos_ids: list, ignorar_duplicados: bool):
+        """
+        INSERT de múltiplos VALUES de `adicionarPratosAoPedido`, sem registrar a
+        alteração: quem chama registra uma vez por edição.
+        """
+        # Quantidade por prato, mantendo a ordem de seleção
+        quantidades = Counter(pratos_ids)
+        self.db.inserirRegistros(
+            "Pedido_Pratos",
+            ["pedido_id", "prato_id", "quantidade"],
+            [(pedido_id, prato_id, quantidade) for prato_id, quantidade in quantidades.items()],
+            ignorar_duplicados=ignorar_duplicados,
+            somar_duplicados=None if ignorar_duplicados else ["quantidade"],
+        )
+        print(
+            f"✅ {quantidades.total()} prato(s) adicionado(s) ao Pedido (ID: {pedido_id}) com sucesso."
+        )
 
     def atualizarPedido(
         self,
@@ -93,21 +543,38 @@ class Orders:
         novo_fk_colaborador: int = None,
         novo_status: str = None,
         novos_pratos: list = None,
+        pratos=None,
+        versao: int = None,
     ):
         """
         Atualiza os dados de um pedido existente.
 
+        Com `versao`, a atualização só é gravada se ninguém alterou o pedido
+        desde que ele foi lido (controle de concorrência otimista); caso
+        contrário nada é gravado e PedidoDesatualizadoError é levantada. Cada
+        chamada incrementa a versão uma única vez.
+
         Args:
             id_pedido (int): O ID do pedido a ser atualizado.
             novo_num_mesa (int, optional): O novo número da mesa.
             novo_fk_colaborador (int, optional): O novo CPF do colaborador.
             novo_status(str): novo status do pedido.
+            novos_pratos (list, optional): Pratos a acrescentar; os que já estão
+                no pedido são mantidos como estão.
+            pratos (dict | list, optional): Conjunto final de pratos do pedido,
+                {prato_id: quantidade} ou lista de ids (id repetido = mais uma
+                unidade). Pratos fora do conjunto são removidos. Veja
+                `_reconciliarPratos`.
+            versao (int, optional): Versão do pedido lida pelo chamador
+                (campo 'versao' de `recuperar_pedidos`).
 
         Returns:
-            bool: True se a atualização foi bem-sucedida, False caso contrário.
+            int | bool: Com `versao`, a nova versão do pedido (a passar na
+                próxima edição); sem `versao`, True. False se nenhum dado foi fornecido.
 
         Raises:
-            mysql.connector.Error: Se ocorrer um erro durante a atualização.
+            PedidoDesatualizadoError: Se o pedido não está mais em `versao`.
+            RuntimeError: Se ocorrer um erro durante a atualização.
         """
         try:
             # Atualiza dados do pedido, se houver campos
@@ -119,23 +586,46 @@ class Orders:
             if novo_status is not None:
                 valores_dict["status_pedido"] = novo_status
 
-            if valores_dict:
-                self.db.atualizarRegistro(
-                    "pedidos", valores_dict, "id_pedido", id_pedido
-                )
-                print(f"✅ Pedido {id_pedido} atualizado com sucesso.")
-
-            # Adiciona novos pratos, se houver
-            if novos_pratos:
-                for prato_id in novos_pratos:
-                    self.adicionarPratoAoPedido(id_pedido, prato_id)
-                    print(
-                        f"✅ Prato (ID: {prato_id}) adicionado ao pedido {id_pedido}."
+            # Campos, pratos e registro de alteração entram juntos ou nada entra
+            with self.db.transaction() as cursor:
+                # Confere a versão antes de qualquer escrita; este é o único
+                # incremento da versão nesta edição
+                nova_versao = None
+                if versao is not None:
+                    nova_versao = self._registrarAlteracao(id_pedido, versao=versao)
+
+                # O formulário sempre envia o status: só vira evento se mudou
+                status_mudou = False
+                if novo_status is not None:
+                    cursor.execute(
+                        "SELECT status_pedido FROM Pedidos WHERE id_pedido = %s FOR UPDATE",
+                        (id_pedido,),
                     )
+                    atual = cursor.fetchone()
+                    status_mudou = atual is not None and atual["status_pedido"] != novo_status
 
-            # Retorna True se pelo menos uma ação foi feita
-            if valores_dict or novos_pratos:
-                return True
+                pratos_alterados = False
+                if pratos is not None:
+                    pratos_alterados = self._reconciliarPratos(cursor, id_pedido, pratos)
+
+                if valores_dict:
+                    self.db.atualizarRegistro(
+                        "pedidos", valores_dict, "id_pedido", id_pedido
+                    )
+                    if status_mudou:
+                        self._registrarEvento(id_pedido, novo_status)
+                    print(f"✅ Pedido {id_pedido} atualizado com sucesso.")
+
+                # Adiciona novos pratos, se houver
+                if novos_pratos:
+                    self._inserirPratos(id_pedido, novos_pratos, ignorar_duplicados=True)
+
+                if versao is None and (valores_dict or pratos_alterados or novos_pratos):
+                    self._registrarAlteracao(id_pedido)
+
+            # Retorna a nova versão (ou True) se pelo menos uma ação foi feita
+            if valores_dict or novos_pratos or pratos is not None:
+                return nova_versao if versao is not None else True
             else:
                 print("⚠️ Nenhum dado fornecido para atualizar ou adicionar.")
                 return False
@@ -143,6 +633,146 @@ class Orders:
         except mysql.connector.Error as e:
             raise RuntimeError(f"Erro ao atualizar o pedido: {e.msg}") from e
 
+    def atualizarStatusEmLote(
+        self,
+        ids: list,
+        novo_status: str,
+        num_mesa: int = None,
+        tamanho_lote: int = _LOTE_STATUS,
+    ) -> int:
+        """
+        Muda o status de vários pedidos de uma vez, ex.: ao fechar uma mesa.
+
+        Os pedidos são bloqueados e atualizados com um único
+        UPDATE ... WHERE id_pedido IN (...) por lote de `tamanho_lote` ids, e
+        o registro de alterações é gravado com um único INSERT por lote.
+        Tudo roda em uma transação. Pedidos que já estão em `novo_status`
+        ficam como estão. Com `num_mesa`, os pedidos da mesa são selecionados
+        e bloqueados por uma única consulta.
+
+        Args:
+            ids (list): IDs dos pedidos. Pode ser None quando `num_mesa` é informado.
+            novo_status (str): Novo status dos pedidos.
+            num_mesa (int, optional): Muda todos os pedidos em aberto da mesa
+                (pendentes, em preparo e prontos).
+            tamanho_lote (int): IDs por UPDATE.
+
+        Returns:
+            int: Quantidade de pedidos alterados.
+
+        Raises:
+            RuntimeError: Se ocorrer um erro durante a atualização.
+        """
+        if num_mesa is not None:
+            abertos = StatusPedido.abertos()
+            condicoes = [
+                (
+                    f"numMesa = %s AND status_pedido IN ({', '.join(['%s'] * len(abertos))})",
+                    (num_mesa, *abertos),
+                )
+            ]
+        else:
+            ids = list(dict.fromkeys(int(pedido_id) for pedido_id in ids or []))
+            tamanho_lote = max(1, tamanho_lote)
+            condicoes = [
+                (f"id_pedido IN ({', '.join(['%s'] * len(lote))})", lote)
+                for lote in (
+                    ids[inicio : inicio + tamanho_lote]
+                    for inicio in range(0, len(ids), tamanho_lote)
+                )
+            ]
+
+        try:
+            total = 0
+            momento = datetime.now().replace(microsecond=0)
+            with self.db.transaction() as cursor:
+                for condicao, params in condicoes:
+                    # Bloqueia os pedidos que vão mudar
+                    cursor.execute(
+                        f"SELECT id_pedido FROM Pedidos WHERE {condicao} "
+                        "AND status_pedido <> %s FOR UPDATE",
+                        (*params, novo_status),
+                    )
+                    lote = [row["id_pedido"] for row in cursor.fetchall()]
+                    if not lote:
+                        continue
+                    cursor.execute(
+                        "UPDATE Pedidos SET status_pedido = %s, versao = versao + 1 "
+                        f"WHERE id_pedido IN ({', '.join(['%s'] * len(lote))})",
+                        (novo_status, *lote),
+                    )
+                    self.db.inserirRegistros(
+                        "Pedidos_Alteracoes",
+                        ["pedido_id", "excluido"],
+                        [(pedido_id, False) for pedido_id in lote],
+                    )
+                    for pedido_id in lote:
+                        self._registrarEvento(pedido_id, novo_status, momento)
+                    total += len(lote)
+
+            print(f"✅ {total} pedido(s) alterado(s) para '{novo_status}'.")
+            return total
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Erro ao atualizar o status dos pedidos: {e.msg}") from e
+
+    def _reconciliarPratos(self, cursor, id_pedido: int, pratos) -> bool:
+        """
+        Deixa em Pedido_Pratos exatamente o conjunto de pratos `pratos`.
+
+        Compara com os pratos gravados e aplica só a diferença: um DELETE para
+        os que saíram e um INSERT de múltiplos VALUES (ON DUPLICATE KEY UPDATE)
+        para os que entraram ou mudaram de quantidade. Deve rodar dentro da
+        transação do chamador.
+
+        Args:
+            cursor: Cursor da transação.
+            id_pedido (int): O ID do pedido.
+            pratos (dict | list): {prato_id: quantidade} ou lista de ids, em que
+                um id repetido conta como mais uma unidade.
+
+        Returns:
+            bool: True se algum prato foi incluído, removido ou mudou de quantidade.
+        """
+        desejados = dict(pratos) if isinstance(pratos, dict) else Counter(pratos)
+        desejados = {
+            int(prato_id): int(quantidade)
+            for prato_id, quantidade in desejados.items()
+            if int(quantidade) > 0
+        }
+
+        cursor.execute(
+            "SELECT prato_id, quantidade FROM Pedido_Pratos WHERE pedido_id = %s FOR UPDATE",
+            (id_pedido,),
+        )
+        atuais = {row["prato_id"]: row["quantidade"] for row in cursor.fetchall()}
+
+        remover = [prato_id for prato_id in atuais if prato_id not in desejados]
+        gravar = [
+            (id_pedido, prato_id, quantidade)
+            for prato_id, quantidade in desejados.items()
+            if atuais.get(prato_id) != quantidade
+        ]
+
+        if remover:
+            cursor.execute(
+                f"DELETE FROM Pedido_Pratos WHERE pedido_id = %s "
+                f"AND prato_id IN ({', '.join(['%s'] * len(remover))})",
+                (id_pedido, *remover),
+            )
+        if gravar:
+            self.db.inserirRegistros(
+                "Pedido_Pratos",
+                ["pedido_id", "prato_id", "quantidade"],
+                gravar,
+                atualizar_duplicados=["quantidade"],
+            )
+        if remover or gravar:
+            print(
+                f"✅ Pratos do Pedido (ID: {id_pedido}): {len(gravar)} incluído(s)/alterado(s), "
+                f"{len(remover)} removido(s)."
+            )
+        return bool(remover or gravar)
+
     def deletarPedido(self, id_pedido: int):
         """
         Deleta um pedido da tabela Pedidos e suas associações em Pedido_Pratos.
@@ -157,18 +787,21 @@ class Orders:
             mysql.connector.Error: Se ocorrer um erro durante a deleção.
         """
         try:
-            self.db.abrirConexao()
-            # Remover de Pedido_Pratos primeiro
-            sql_remove_assoc = "DELETE FROM Pedido_Pratos WHERE pedido_id = %s"
-            self.db.cursor.execute(sql_remove_assoc, (id_pedido,))
+            with self.db.conexao() as cursor:
+                # Remover de Pedido_Pratos primeiro
+                sql_remove_assoc = "DELETE FROM Pedido_Pratos WHERE pedido_id = %s"
+                cursor.execute(sql_remove_assoc, (id_pedido,))
 
-            # Deletar o pedido
-            sql_delete_pedido = "DELETE FROM Pedidos WHERE id_pedido = %s"
-            self.db.cursor.execute(sql_delete_pedido, (id_pedido,))
+                # Deletar o pedido
+                sql_delete_pedido = "DELETE FROM Pedidos WHERE id_pedido = %s"
+                cursor.execute(sql_delete_pedido, (id_pedido,))
+                deletados = cursor.rowcount  # Refere-se ao DELETE FROM Pedidos
 
-            self.db.connection.commit()
+                if deletados > 0:
+                    self._registrarAlteracao(id_pedido, excluido=True)
+                self.db.commit()
 
-            if self.db.cursor.rowcount > 0:  # Refere-se ao DELETE FROM Pedidos
+            if deletados > 0:
                 print(
                     f"✅ Pedido (ID: {id_pedido}) e seus pratos associados deletados com sucesso."
                 )
@@ -177,11 +810,8 @@ class Orders:
                 print(f"⚠️ Pedido (ID: {id_pedido}) não encontrado para deleção.")
                 return False
         except mysql.connector.Error as e:
-            self.db.connection.rollback()
             print(f"❌ Erro ao deletar pedido (ID: {id_pedido}): \n{e}")
             return False
-        finally:
-            self.db.fecharConexao()
 
     def removerPratoDoPedido(self, pedido_id: int, prato_id: int):
         """
@@ -198,11 +828,16 @@ class Orders:
             mysql.connector.Error: Se ocorrer um erro durante a deleção na tabela de junção.
         """
         try:
-            self.db.abrirConexao()
-            sql = "DELETE FROM Pedido_Pratos WHERE pedido_id = %s AND prato_id = %s"
-            self.db.cursor.execute(sql, (pedido_id, prato_id))
-            self.db.connection.commit()
-            if self.db.cursor.rowcount > 0:
+            with self.db.conexao() as cursor:
+                sql = "DELETE FROM Pedido_Pratos WHERE pedido_id = %s AND prato_id = %s"
+                cursor.execute(sql, (pedido_id, prato_id))
+                removidos = cursor.rowcount
+
+                if removidos > 0:
+                    self._registrarAlteracao(pedido_id)
+                self.db.commit()
+
+            if removidos > 0:
                 print(
                     f"✅ Prato (ID: {prato_id}) removido do Pedido (ID: {pedido_id}) com sucesso."
                 )
@@ -217,8 +852,6 @@ class Orders:
                 f"❌ Erro ao remover prato (ID: {prato_id}) do Pedido (ID: {pedido_id}): \n{e}"
             )
             return False
-        finally:
-            self.db.fecharConexao()
 
     def recuperar_pedidos(self) -> dict:
         """Obtém todos os pedidos do sistema com seus pratos e ingredientes associados.
@@ -236,8 +869,13 @@ class Orders:
                 - numero_da_mesa (int): Número da mesa do pedido
                 - nome_do_colaborador (str): Nome do colaborador que registrou o pedido
                 - status_pedido(str) : status atual do pedido
+                - criado_em (datetime | None): quando o pedido foi registrado
+                - versao (int): versão do pedido, para `atualizarPedido(versao=...)`
+                - valor_total (float): soma de quantidade x preço dos pratos no momento do pedido
                 - pratos (list): Lista de dicionários contendo:
+                    - id (int): ID do prato
                     - prato (str): Nome do prato
+                    - quantidade (int): Unidades do prato no pedido
                     - ingredientes (list): Lista de nomes de ingredientes do prato
             Retorna None caso ocorra algum erro na conexão com o banco de dados.
 
@@ -245,53 +883,628 @@ class Orders:
             mysql.connector.Error: Exceção original do MySQL Connector (capturada internamente)
         """
         try:
-            self.db.abrirConexao()
-            sql = """
-             SELECT
-                p.id_pedido,
-                p.numMesa AS 'numero_da_mesa',
-                c.nome AS 'nome_do_colaborador',
-                p.status_pedido,
-                pr.nome AS 'prato',
-                GROUP_CONCAT(DISTINCT i.nome SEPARATOR ', ') AS 'ingredientes'
-            FROM Pedidos p
-            INNER JOIN Colaboradores c ON p.fk_colaborador = c.cpf
-            INNER JOIN Pedido_Pratos pp ON p.id_pedido = pp.pedido_id
-            INNER JOIN Pratos pr ON pp.prato_id = pr.id
-            INNER JOIN Prato_Ingredientes pi ON pr.id = pi.prato_id
-            INNER JOIN Ingredientes i ON pi.ingrediente_id = i.id
-            GROUP BY p.id_pedido, p.numMesa, c.nome, p.status_pedido, pr.nome
-            ORDER BY p.id_pedido;
-            """
-            self.db.cursor.execute(sql)
-            resultado = self.db.cursor.fetchall()
-
-            # Formata os resultados para melhor visualização
-            pedidos_agrupados = {}
-            for row in resultado:
-                pedido_id = row["id_pedido"]
-                if pedido_id not in pedidos_agrupados:
-                    pedidos_agrupados[pedido_id] = {
-                        "numero_da_mesa": row["numero_da_mesa"],
-                        "nome_do_colaborador": row["nome_do_colaborador"],
-                        "status_pedido": row["status_pedido"],
-                        "pratos": [],
-                    }
-
-                pedidos_agrupados[pedido_id]["pratos"].append(
-                    {
-                        "prato": row["prato"],
-                        "ingredientes": (
-                            row["ingredientes"].split(", ")
-                            if row["ingredientes"]
-                            else []
-                        ),
-                    }
-                )
-
-            return pedidos_agrupados
+            return expandir_pedidos(
+                **self._normalizar(self.db.consultarComCache(_SQL_PEDIDOS))
+            )
         except mysql.connector.Error as e:
             print(f"❌ Erro ao recuperar último cardápio completo: \n{e}")
             return {"id": None, "pratos": []}
-        finally:
-            self.db.fecharConexao()
+
+    def recuperar_pedidos_normalizado(self) -> dict:
+        """Obtém todos os pedidos sem repetir os dados dos pratos em cada pedido.
+
+        Cada pedido traz apenas os ids dos seus pratos; nome e ingredientes de
+        cada prato aparecem uma única vez em 'pratos', com strings internadas.
+        Para listas grandes isso reduz o volume lido do banco e a memória usada
+        em relação a `recuperar_pedidos`. `expandir_pedidos` converte o
+        resultado para o formato de `recuperar_pedidos`.
+
+        Returns:
+            dict: {
+                'pedidos': {id_pedido: {numero_da_mesa, nome_do_colaborador,
+                    status_pedido, criado_em, versao, valor_total,
+                    'pratos': {prato_id: quantidade}}},
+                'pratos': {prato_id: {'prato': str, 'ingredientes': tuple}}
+            }
+        """
+        try:
+            return self._normalizar(self.db.consultarComCache(_SQL_PEDIDOS))
+        except mysql.connector.Error as e:
+            print(f"❌ Erro ao recuperar pedidos: \n{e}")
+            return {"pedidos": {}, "pratos": {}}
+
+    def _normalizar(self, linhas_pedidos, consultar=None) -> dict:
+        """Monta o payload normalizado a partir das linhas de _SELECT_PEDIDOS.
+
+        Os totais vêm do histórico de preços em memória, sem outra consulta.
+
+        Args:
+            linhas_pedidos (list): Linhas de _SELECT_PEDIDOS ordenadas por pedido.
+            consultar (callable, optional): Função (sql, params) -> linhas usada
+                para buscar os pratos. Padrão: `self.db.consultarComCache`.
+        """
+        consultar = consultar or self.db.consultarComCache
+        pedidos = dict(_com_totais(_agrupar_pedidos(linhas_pedidos), self.catalogo.historico()))
+        if not pedidos:
+            return {"pedidos": pedidos, "pratos": {}}
+
+        ids_pratos = sorted(
+            {prato_id for pedido in pedidos.values() for prato_id in pedido["pratos"]}
+        )
+        pratos = {}
+        if ids_pratos:
+            pratos = _indexar_pratos(consultar(_sql_pratos_por_ids(len(ids_pratos)), ids_pratos))
+        return {"pedidos": pedidos, "pratos": pratos}
+
+    def recuperar_pedidos_pagina(
+        self,
+        limite: int = 50,
+        apos_id: int = None,
+        status: str = None,
+        num_mesa: int = None,
+        fk_colaborador: int = None,
+        data_inicio: date = None,
+        data_fim: date = None,
+        com_marcador: bool = False,
+    ) -> dict:
+        """Obtém uma página de pedidos, do mais recente para o mais antigo.
+
+        A paginação é por keyset em id_pedido: a próxima página começa depois
+        do último id recebido, então o custo de cada página não cresce com o
+        histórico (ao contrário de OFFSET). Os filtros são aplicados no banco.
+
+        Args:
+            limite (int): Quantidade máxima de pedidos na página.
+            apos_id (int, optional): `proximo` da página anterior; None para a primeira.
+            status (str, optional): Apenas pedidos com este status.
+            num_mesa (int, optional): Apenas pedidos desta mesa.
+            fk_colaborador (int, optional): Apenas pedidos deste colaborador (CPF).
+            data_inicio (date, optional): Apenas pedidos criados a partir desta data.
+            data_fim (date, optional): Apenas pedidos criados até esta data (inclusive).
+            com_marcador (bool): Se True, lê também `marcador_atual`, antes da
+                página e na mesma conexão, e a página vem direto do banco (sem o
+                cache de resultados, que não vê gravações de outros terminais).
+                O que mudar entre as duas leituras volta em `recuperar_pedidos_desde`.
+
+        Returns:
+            dict: {
+                'pedidos': {id_pedido: pedido} no formato de `recuperar_pedidos`,
+                'proximo': id a passar em `apos_id`, ou None se não houver mais páginas,
+                'marcador': marcador para `recuperar_pedidos_desde` (None sem `com_marcador`)
+            }
+        """
+        condicoes, params = _filtros_pedidos(
+            status, num_mesa, fk_colaborador, data_inicio, data_fim
+        )
+        if apos_id is not None:
+            condicoes.insert(0, "id_pedido < %s")
+            params.insert(0, apos_id)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+        try:
+            with self.db.conexao() as cursor:
+                marcador = self.marcador_atual() if com_marcador else None
+
+                def consultar(sql, params):
+                    if not com_marcador:
+                        return self.db.consultarComCache(sql, params)
+                    cursor.execute(sql, params)
+                    return cursor.fetchall()
+
+                # 1. Ids da página (um a mais para saber se existe próxima página)
+                sql_ids = f"SELECT id_pedido FROM Pedidos {where} ORDER BY id_pedido DESC LIMIT %s"
+                ids = [row["id_pedido"] for row in consultar(sql_ids, (*params, limite + 1))]
+                tem_mais = len(ids) > limite
+                ids = ids[:limite]
+                if not ids:
+                    return {"pedidos": {}, "proximo": None, "marcador": marcador}
+
+                # 2. Pratos e ingredientes apenas dos pedidos da página
+                payload = self._normalizar(
+                    consultar(_sql_pedidos_por_ids(len(ids)), ids), consultar
+                )
+            return {
+                "pedidos": expandir_pedidos(**payload),
+                "proximo": ids[-1] if tem_mais else None,
+                "marcador": marcador,
+            }
+        except mysql.connector.Error as e:
+            print(f"❌ Erro ao recuperar página de pedidos: \n{e}")
+            return {"pedidos": {}, "proximo": None, "marcador": None}
+
+    def recuperar_pedido(self, id_pedido: int):
+        """
+        Relê um único pedido, ex.: depois de PedidoDesatualizadoError.
+
+        Args:
+            id_pedido (int): O ID do pedido.
+
+        Returns:
+            dict | None: O pedido no formato de `recuperar_pedidos`, ou None se
+                ele foi excluído.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        with self.db.conexao() as cursor:
+            return self._pedidos_por_ids(cursor, [{"id_pedido": id_pedido}]).get(id_pedido)
+
+    def marcador_atual(self) -> ChangeMarker:
+        """
+        Retorna o marcador da última alteração de pedidos registrada.
+
+        Deve ser obtido antes de carregar a lista, para depois ser passado a
+        `recuperar_pedidos_desde`.
+
+        Returns:
+            ChangeMarker: Maior id de Pedidos_Alteracoes e os ids abaixo dele
+                ainda não confirmados (veja ChangeMarker).
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        with self.db.conexao() as cursor:
+            return self._marcadorInicial(cursor)
+
+    def _marcadorInicial(self, cursor) -> ChangeMarker:
+        """Marcador a partir dos últimos registros de Pedidos_Alteracoes."""
+        cursor.execute(
+            "SELECT id FROM Pedidos_Alteracoes ORDER BY id DESC LIMIT %s", (_JANELA_MARCADOR,)
+        )
+        return ChangeMarker.inicial(row["id"] for row in cursor.fetchall())
+
+    def _lerAlteracoes(self, cursor, marcador: ChangeMarker, colunas: str = "id, pedido_id"):
+        """
+        Lê os registros de Pedidos_Alteracoes ainda não vistos a partir de
+        `marcador`: os posteriores a ele e os das suas lacunas.
+
+        Um int é aceito como marcador sem lacunas (ex.: 0 para ler tudo).
+
+        Returns:
+            tuple: (registros em ordem de id, novo marcador).
+        """
+        if isinstance(marcador, int):
+            marcador = ChangeMarker(marcador)
+        condicao, params = marcador.condicao()
+        cursor.execute(
+            f"SELECT {colunas} FROM Pedidos_Alteracoes WHERE {condicao} ORDER BY id", params
+        )
+        registros = cursor.fetchall()
+        return registros, marcador.avancar(row["id"] for row in registros)
+
+    def recuperar_pedidos_desde(
+        self,
+        marcador: int,
+        status: str = None,
+        num_mesa: int = None,
+        fk_colaborador: int = None,
+        data_inicio: date = None,
+        data_fim: date = None,
+    ) -> dict:
+        """
+        Obtém apenas os pedidos incluídos, alterados ou excluídos depois de `marcador`.
+
+        Quando nada mudou, custa uma única busca na chave primária de
+        Pedidos_Alteracoes (a faixa depois do marcador e as suas lacunas, para
+        não perder uma alteração confirmada depois de outra com id maior). Os filtros são os mesmos de `recuperar_pedidos_pagina`:
+        um pedido alterado que deixou de atender aos filtros (ou que não aparece
+        mais na listagem) vem em 'excluidos', para sair da tela.
+
+        Args:
+            marcador (ChangeMarker): Marcador de `marcador_atual` ou da chamada anterior.
+            status, num_mesa, fk_colaborador, data_inicio, data_fim: Filtros da listagem.
+
+        Returns:
+            dict: {
+                'marcador': ChangeMarker, a ser passado na próxima chamada,
+                'alterados': {id_pedido: pedido} no formato de `recuperar_pedidos`,
+                'excluidos': list de ids a remover da tela
+            }
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        with self.db.conexao() as cursor:
+            registros, marcador = self._lerAlteracoes(
+                cursor, marcador, "id, pedido_id, excluido"
+            )
+            if not registros:
+                return {"marcador": marcador, "alterados": {}, "excluidos": []}
+
+            # Vale o último registro de cada pedido
+            ultimo_estado = {row["pedido_id"]: bool(row["excluido"]) for row in registros}
+            ids = [pedido_id for pedido_id, excluido in ultimo_estado.items() if not excluido]
+
+            alterados = {}
+            if ids:
+                condicoes, params = _filtros_pedidos(
+                    status, num_mesa, fk_colaborador, data_inicio, data_fim
+                )
+                condicoes.insert(0, f"id_pedido IN ({', '.join(['%s'] * len(ids))})")
+                cursor.execute(
+                    f"SELECT id_pedido FROM Pedidos WHERE {' AND '.join(condicoes)}",
+                    (*ids, *params),
+                )
+                alterados = self._pedidos_por_ids(cursor, cursor.fetchall())
+
+        return {
+            "marcador": marcador,
+            "alterados": alterados,
+            "excluidos": [pedido_id for pedido_id in ultimo_estado if pedido_id not in alterados],
+        }
+
+    def fila_cozinha(self) -> list:
+        """
+        Obtém os pedidos ativos da cozinha (pendentes e em preparo), do mais antigo ao mais novo.
+
+        A primeira chamada carrega os pedidos ativos pelo índice
+        idx_pedidos_status. As seguintes só leem Pedidos_Alteracoes depois do
+        último marcador e atualizam a fila em memória com as mudanças de status,
+        de qualquer terminal. O custo depende do número de pedidos ativos e de
+        alterações, não do tamanho do histórico.
+
+        Returns:
+            list: [(id_pedido, pedido)], com o pedido no formato de `recuperar_pedidos`.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        fila = Orders._fila
+        ativos = StatusPedido.ativos()
+        filtro_ativos = f"status_pedido IN ({', '.join(['%s'] * len(ativos))})"
+
+        with fila.lock, self.db.conexao() as cursor:
+            if fila.marcador is None:
+                # O marcador vem antes dos pedidos: o que mudar entre as duas
+                # consultas é aplicado de novo na próxima sincronização.
+                marcador = self._marcadorInicial(cursor)
+                cursor.execute(f"SELECT id_pedido FROM Pedidos WHERE {filtro_ativos}", ativos)
+                fila.carregar(self._pedidos_por_ids(cursor, cursor.fetchall()), marcador)
+                return fila.pedidos()
+
+            registros, marcador = self._lerAlteracoes(cursor, fila.marcador)
+            alterados = list(dict.fromkeys(row["pedido_id"] for row in registros))
+            ativos_alterados = {}
+            if alterados:
+                cursor.execute(
+                    f"SELECT id_pedido FROM Pedidos WHERE id_pedido IN "
+                    f"({', '.join(['%s'] * len(alterados))}) AND {filtro_ativos}",
+                    (*alterados, *ativos),
+                )
+                ativos_alterados = self._pedidos_por_ids(cursor, cursor.fetchall())
+            fila.atualizar(alterados, ativos_alterados, marcador)
+            return fila.pedidos()
+
+    def contaDaMesa(
+        self, num_mesa: int, usar_cache: bool = True, max_idade: float = _IDADE_MAXIMA_CONTAS
+    ) -> dict:
+        """
+        Conta em aberto de uma mesa: pedidos pendentes, em preparo e prontos,
+        com os pratos somados por prato e preço. O preço de cada prato é o do
+        histórico no momento do pedido.
+
+        A resposta vem do mapa em memória mesa -> pedidos em aberto. O mapa é
+        carregado com uma única consulta e ressincronizado (apenas os pedidos
+        alterados) logo depois de qualquer gravação de pedidos feita por este
+        processo, ou quando tem mais de `max_idade` segundos, para refletir os
+        outros terminais. Gravações no nome dos pratos recarregam o mapa.
+
+        Args:
+            num_mesa (int): Número da mesa.
+            usar_cache (bool): Se False, consulta direto o banco com uma única
+                consulta pelo índice idx_pedidos_mesa_status.
+            max_idade (float): Segundos que o mapa vale sem conferir alterações.
+
+        Returns:
+            dict: {
+                'num_mesa': int,
+                'pedidos': list de ids dos pedidos em aberto,
+                'itens': [{'prato_id', 'prato', 'quantidade', 'preco', 'subtotal'}],
+                'total': soma dos subtotais
+            }
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        if not usar_cache:
+            with self.db.conexao() as cursor:
+                cursor.execute(
+                    _SQL_CONTA + "    AND p.numMesa = %s\n",
+                    (*StatusPedido.abertos(), num_mesa),
+                )
+                linhas = cursor.fetchall()
+            return _resumir_conta(num_mesa, _precificar(linhas, self.catalogo.historico()))
+
+        mesas = Orders._mesas
+        with mesas.lock:
+            # Lidas antes das consultas: uma escrita no meio muda a versão e
+            # provoca nova sincronização na próxima chamada
+            versao_pedidos = self.db.resultados.versao(_TABELAS_PEDIDOS)
+            versao_cardapio = self.db.resultados.versao(_TABELAS_CARDAPIO)
+            if mesas.marcador is None or mesas.versao_cardapio != versao_cardapio:
+                self._carregarMesas(versao_pedidos, versao_cardapio)
+            elif mesas.versao_pedidos != versao_pedidos or mesas.vencido(max_idade):
+                self._sincronizarMesas(versao_pedidos)
+            return _resumir_conta(num_mesa, mesas.linhas(num_mesa))
+
+    def _carregarMesas(self, versao_pedidos, versao_cardapio):
+        """Carrega no mapa de contas todos os pedidos em aberto (chamado com o lock do mapa)."""
+        with self.db.conexao() as cursor:
+            # O marcador vem antes dos pedidos: o que mudar entre as duas
+            # consultas é aplicado de novo na próxima sincronização.
+            marcador = self._marcadorInicial(cursor)
+            cursor.execute(_SQL_CONTA, StatusPedido.abertos())
+            linhas = _precificar(cursor.fetchall(), self.catalogo.historico())
+            Orders._mesas.carregar(
+                _linhas_por_pedido(linhas), marcador, versao_pedidos, versao_cardapio
+            )
+
+    def _sincronizarMesas(self, versao_pedidos):
+        """Relê no mapa de contas só os pedidos alterados desde o marcador."""
+        mesas = Orders._mesas
+        with self.db.conexao() as cursor:
+            registros, marcador = self._lerAlteracoes(cursor, mesas.marcador)
+            if not registros:
+                mesas.atualizar((), {}, marcador, versao_pedidos)
+                return
+            alterados = list(dict.fromkeys(row["pedido_id"] for row in registros))
+            cursor.execute(
+                _SQL_CONTA + f"    AND p.id_pedido IN ({', '.join(['%s'] * len(alterados))})\n",
+                (*StatusPedido.abertos(), *alterados),
+            )
+            linhas = _precificar(cursor.fetchall(), self.catalogo.historico())
+            mesas.atualizar(
+                alterados,
+                _linhas_por_pedido(linhas),
+                marcador,
+                versao_pedidos,
+            )
+
+    def relatorio_tempos_status(self, data_inicio: date = None, data_fim: date = None) -> dict:
+        """
+        Percentis do tempo que os pedidos passam em cada status, por prato e por hora.
+
+        O tempo em um status vai do evento que levou o pedido a ele até o evento
+        seguinte (ex.: pendente -> em_preparo é o tempo de espera da cozinha).
+        Um pedido conta para cada prato que contém; a hora é a de entrada no status.
+
+        Args:
+            data_inicio (date, optional): Apenas eventos a partir desta data.
+            data_fim (date, optional): Apenas eventos até esta data (inclusive).
+
+        Returns:
+            dict: {
+                'por_prato': {nome_do_prato: {status: {'n', 'p50', 'p95', 'p99'}}},
+                'por_hora': {hora (0-23): {status: {'n', 'p50', 'p95', 'p99'}}}
+            }, com os percentis em segundos.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        # Eventos ainda em memória também entram no relatório
+        Orders._eventos.descarregar()
+
+        where, params = _filtro_periodo("registrado_em", data_inicio, data_fim)
+
+        # 1. Tempos por pedido, lendo os eventos em streaming
+        tempos = {}
+        eventos = self.db.iterarConsulta(
+            f"SELECT pedido_id, status, registrado_em FROM Pedidos_Eventos {where} "
+            "ORDER BY pedido_id, registrado_em, id",
+            params,
+        )
+        for pedido_id, eventos_pedido in groupby(eventos, key=itemgetter("pedido_id")):
+            tempos[pedido_id] = list(_tempos_em_status(eventos_pedido))
+
+        # 2. Pratos dos pedidos do período, em uso ou já arquivados
+        pratos_por_pedido = {}
+        for _, pedido_pratos in _ORIGENS:
+            for row in self.db.consultarComCache(
+                f"SELECT DISTINCT pp.pedido_id, pr.nome FROM {pedido_pratos} pp "
+                "JOIN Pratos pr ON pp.prato_id = pr.id "
+                f"WHERE pp.pedido_id IN (SELECT pedido_id FROM Pedidos_Eventos {where})",
+                params,
+            ):
+                pratos_por_pedido.setdefault(row["pedido_id"], []).append(row["nome"])
+
+        # 3. Agrupa as durações e calcula os percentis
+        por_prato, por_hora = {}, {}
+        for pedido_id, tempos_pedido in tempos.items():
+            for status, entrada, segundos in tempos_pedido:
+                por_hora.setdefault(entrada.hour, {}).setdefault(status, []).append(segundos)
+                for prato in pratos_por_pedido.get(pedido_id, []):
+                    por_prato.setdefault(prato, {}).setdefault(status, []).append(segundos)
+
+        def resumir(grupos):
+            return {
+                grupo: {status: _percentis(valores) for status, valores in por_status.items()}
+                for grupo, por_status in sorted(grupos.items())
+            }
+
+        return {"por_prato": resumir(por_prato), "por_hora": resumir(por_hora)}
+
+    def _pedidos_por_ids(self, cursor, linhas_ids: list) -> dict:
+        """Carrega pratos e ingredientes dos pedidos cujos ids estão em `linhas_ids`."""
+        ids = [row["id_pedido"] for row in linhas_ids]
+        if not ids:
+            return {}
+
+        def consultar(sql, params):
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+        return expandir_pedidos(
+            **self._normalizar(consultar(_sql_pedidos_por_ids(len(ids)), ids), consultar)
+        )
+
+    def iterar_pedidos(self, tamanho_lote: int = 500):
+        """Percorre os pedidos em streaming, um pedido completo por vez.
+
+        As linhas vêm do banco em lotes de `tamanho_lote` (cursor sem buffer),
+        ordenadas por id_pedido, e são agrupadas à medida que chegam. A memória
+        usada não depende do tamanho do histórico de pedidos.
+
+        Args:
+            tamanho_lote (int): Linhas buscadas no servidor a cada fetchmany.
+
+        Yields:
+            tuple: (id_pedido, pedido), com o pedido no mesmo formato de `recuperar_pedidos`.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        # O catálogo de pratos é pequeno: carregado uma vez, serve a todos os pedidos
+        pratos = _indexar_pratos(self.db.consultarComCache(_SQL_PRATOS))
+        # O histórico de preços é carregado antes, porque a conexão fica ocupada
+        # pelo cursor sem buffer durante o streaming
+        historico = self.catalogo.historico()
+        linhas = self.db.iterarConsulta(_SQL_PEDIDOS, tamanho_lote=tamanho_lote)
+        for pedido_id, pedido in _com_totais(_agrupar_pedidos(linhas), historico):
+            yield pedido_id, expandir_pedidos({pedido_id: pedido}, pratos)[pedido_id]
+
+    def iterar_pedidos_periodo(
+        self, data_inicio: date = None, data_fim: date = None, tamanho_lote: int = 500
+    ):
+        """Percorre em streaming os pedidos criados no período, em uso e arquivados.
+
+        Para relatórios: une Pedidos/Pedido_Pratos e o histórico
+        (Pedidos_Historico/Pedido_Pratos_Historico) sem que quem chama precise
+        saber onde cada pedido está. Cada tabela é lida pelo seu próprio cursor
+        em streaming, com o período no WHERE (no histórico isso limita a leitura
+        às partições dos meses pedidos), e os dois fluxos são intercalados por id.
+        Um pedido arquivado enquanto a leitura acontece pode aparecer duas vezes
+        ou nenhuma.
+
+        Args:
+            data_inicio (date, optional): Apenas pedidos criados a partir desta data.
+            data_fim (date, optional): Apenas pedidos criados até esta data (inclusive).
+            tamanho_lote (int): Linhas buscadas no servidor a cada fetchmany.
+
+        Yields:
+            tuple: (id_pedido, pedido), em ordem de id, no formato de `recuperar_pedidos`.
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na consulta.
+        """
+        where, params = _filtro_periodo("p.criado_em", data_inicio, data_fim)
+        pratos = _indexar_pratos(self.db.consultarComCache(_SQL_PRATOS))
+        historico = self.catalogo.historico()
+
+        fluxos = []
+        for pedidos, pedido_pratos in _ORIGENS:
+            linhas = self.db.iterarConsulta(
+                _select_pedidos(pedidos, pedido_pratos)
+                + f"    {where}\n    ORDER BY p.id_pedido, pp.prato_id\n",
+                params,
+                tamanho_lote=tamanho_lote,
+            )
+            fluxos.append(_com_totais(_agrupar_pedidos(linhas), historico))
+
+        for pedido_id, pedido in heapq.merge(*fluxos, key=itemgetter(0)):
+            yield pedido_id, expandir_pedidos({pedido_id: pedido}, pratos)[pedido_id]
+
+    def arquivarPedidos(
+        self, dias: int = 90, tamanho_lote: int = _LOTE_ARQUIVAMENTO, pausa: float = 0.2
+    ) -> int:
+        """
+        Move os pedidos entregues há mais de `dias` dias para o histórico.
+
+        Pedidos e pratos vão para Pedidos_Historico/Pedido_Pratos_Historico
+        (particionadas por mês de criação) em lotes de `tamanho_lote`, cada lote
+        na sua própria transação curta, com `pausa` segundos entre os lotes; os
+        bloqueios nunca duram mais que um lote. Cada pedido movido recebe um
+        registro de exclusão em Pedidos_Alteracoes, para sair das telas abertas.
+        Pedidos sem data de criação (anteriores à coluna criado_em) não são movidos.
+
+        Args:
+            dias (int): Idade mínima, em dias, dos pedidos arquivados.
+            tamanho_lote (int): Pedidos movidos por transação.
+            pausa (float): Segundos de espera entre um lote e o próximo.
+
+        Returns:
+            int: Quantidade de pedidos arquivados.
+
+        Raises:
+            mysql.connector.Error: Se um lote falhar (os lotes anteriores continuam arquivados).
+        """
+        limite = datetime.combine(date.today() - timedelta(days=dias), time.min)
+        arquivados = 0
+        while True:
+            with self.db.conexao() as cursor:
+                cursor.execute(
+                    "SELECT id_pedido, criado_em FROM Pedidos "
+                    "WHERE status_pedido = %s AND criado_em < %s "
+                    "ORDER BY id_pedido LIMIT %s",
+                    (StatusPedido.ENTREGUE.value, limite, tamanho_lote),
+                )
+                candidatos = cursor.fetchall()
+            if not candidatos:
+                break
+
+            # DDL faz commit implícito no MySQL: as partições vêm antes da transação
+            self._garantirParticoes(row["criado_em"] for row in candidatos)
+            arquivados += self._arquivarLote([row["id_pedido"] for row in candidatos])
+
+            if len(candidatos) < tamanho_lote:
+                break
+            sleep(pausa)
+
+        print(f"🗄️ {arquivados} pedido(s) entregue(s) arquivado(s).")
+        return arquivados
+
+    def _garantirParticoes(self, datas):
+        """Cria nas tabelas de histórico as partições mensais que faltam para `datas`."""
+        meses = sorted({(data.year, data.month) for data in datas} - Orders._particoes)
+        for ano, mes in meses:
+            inicio_proximo = date(ano + mes // 12, mes % 12 + 1, 1)
+            for tabela in _ORIGENS[1]:
+                try:
+                    with self.db.conexao() as cursor:
+                        cursor.execute(
+                            f"ALTER TABLE {tabela} REORGANIZE PARTITION p_futuro INTO ("
+                            f"PARTITION p{ano}{mes:02d} VALUES LESS THAN "
+                            f"('{inicio_proximo.isoformat()}'), "
+                            "PARTITION p_futuro VALUES LESS THAN (MAXVALUE))"
+                        )
+                except mysql.connector.Error as e:
+                    if e.errno not in _ERROS_PARTICAO_EXISTENTE:
+                        raise
+            Orders._particoes.add((ano, mes))
+
+    def _arquivarLote(self, ids: list) -> int:
+        """Move um lote de pedidos entregues para o histórico em uma única transação."""
+        with self.db.transaction() as cursor:
+            # Bloqueia os pedidos e descarta os que mudaram de status desde a seleção
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(
+                f"SELECT id_pedido FROM Pedidos WHERE id_pedido IN ({placeholders}) "
+                "AND status_pedido = %s FOR UPDATE",
+                (*ids, StatusPedido.ENTREGUE.value),
+            )
+            ids = [row["id_pedido"] for row in cursor.fetchall()]
+            if not ids:
+                return 0
+            placeholders = ", ".join(["%s"] * len(ids))
+
+            cursor.execute(
+                "INSERT INTO Pedidos_Historico "
+                "(id_pedido, numMesa, fk_colaborador, status_pedido, criado_em, versao, arquivado_em) "
+                "SELECT id_pedido, numMesa, fk_colaborador, status_pedido, criado_em, versao, %s "
+                f"FROM Pedidos WHERE id_pedido IN ({placeholders})",
+                (datetime.now().replace(microsecond=0), *ids),
+            )
+            cursor.execute(
+                "INSERT INTO Pedido_Pratos_Historico (pedido_id, prato_id, quantidade, criado_em) "
+                "SELECT pp.pedido_id, pp.prato_id, pp.quantidade, p.criado_em "
+                "FROM Pedido_Pratos pp JOIN Pedidos p ON pp.pedido_id = p.id_pedido "
+                f"WHERE pp.pedido_id IN ({placeholders})",
+                ids,
+            )
+            cursor.execute(f"DELETE FROM Pedido_Pratos WHERE pedido_id IN ({placeholders})", ids)
+            cursor.execute(f"DELETE FROM Pedidos WHERE id_pedido IN ({placeholders})", ids)
+            self.db.inserirRegistros(
+                "Pedidos_Alteracoes",
+                ["pedido_id", "excluido"],
+                [(pedido_id, True) for pedido_id in ids],
+            )
+        return len(ids)
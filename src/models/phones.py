@@ -19,18 +19,16 @@ class Phones:
             mysql.connector.Error: Se ocorrer erro ao inserir o telefone.
         """
         try:
-            self.db.abrirConexao()
-            sql = "INSERT INTO telefones (telefone) VALUES (%s)"
-            valores = (novo_numero,)
-            self.db.cursor.execute(sql, valores)
-            self.db.connection.commit()
-            newID = self.db.cursor.lastrowid
+            with self.db.conexao() as cursor:
+                sql = "INSERT INTO telefones (telefone) VALUES (%s)"
+                valores = (novo_numero,)
+                cursor.execute(sql, valores)
+                self.db.commit()
+                newID = cursor.lastrowid
             print(f"✅ Telefone: {novo_numero} adicionado com sucesso!")
             return newID
         except mysql.connector.Error as e:
             print(f"❌ Erro ao inserir telefone: \n {e}")
-        finally:
-            self.db.fecharConexao()
 
     def atualizarTelefone(
         self, id_telefone: int, novo_numero: int = None, fk_cliente: str = None
@@ -54,7 +52,6 @@ class Phones:
 
         if valores_dict:
             try:
-                self.db.abrirConexao()
                 self.db.atualizarRegistro(
                     "telefones", valores_dict, "id_telefone", id_telefone
                 )
@@ -63,8 +60,6 @@ class Phones:
             ) as e:  # Adicionado para capturar erro do atualizarRegistro
                 print(f"❌ Erro ao atualizar telefone: \n {e}")
                 # raise
-            finally:
-                self.db.fecharConexao()
 
     def buscar_telefone_por_id(
         self, ids_telefone: int | list[int]
@@ -89,8 +84,6 @@ class Phones:
             mysql.connector.Error: Se ocorrer erro na consulta ao banco de dados.
         """
         try:
-            self.db.abrirConexao()
-
             # Se for uma lista de IDs
             if isinstance(ids_telefone, list):
                 if not ids_telefone:
@@ -98,13 +91,11 @@ class Phones:
 
                 placeholders = ", ".join(["%s"] * len(ids_telefone))
                 sql = f"SELECT * FROM telefones WHERE id_telefone IN ({placeholders})"
-                self.db.cursor.execute(sql, ids_telefone)
-                return self.db.cursor.fetchall()
+                return self.db.consultarComCache(sql, ids_telefone)
 
             # Se for um ID único
             sql = "SELECT * FROM telefones WHERE id_telefone = %s"
-            self.db.cursor.execute(sql, (ids_telefone,))
-            telefone = self.db.cursor.fetchone()
+            telefone = self.db.consultarPreparado(sql, (ids_telefone,), unico=True)
 
             if telefone:
                 print(f"✅ Telefone encontrado: {telefone}")
@@ -116,8 +107,6 @@ class Phones:
         except mysql.connector.Error as e:
             print(f"❌ Erro ao buscar telefone por ID: \n{e}")
             raise
-        finally:
-            self.db.fecharConexao()
 
     def deletarTelefone(self, id_telefone):
         """Deleta um número de telefone.
@@ -129,12 +118,10 @@ class Phones:
             mysql.connector.Error: Se ocorrer erro na exclusão.
         """
         try:
-            self.db.abrirConexao()
-            sql = "DELETE FROM telefones WHERE id_telefone = %s"
-            self.db.cursor.execute(sql, (id_telefone,))
-            self.db.connection.commit()
+            with self.db.conexao() as cursor:
+                sql = "DELETE FROM telefones WHERE id_telefone = %s"
+                cursor.execute(sql, (id_telefone,))
+                self.db.commit()
             print("✅ Número deletado com sucesso.")
         except mysql.connector.Error as e:
             print(f"❌ Erro ao deletar o telefone: \n {e}")
-        finally:
-            self.db.fecharConexao()
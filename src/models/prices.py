@@ -1,12 +1,22 @@
 # SESSÃO PREÇOS
+
 import mysql, mysql.connector
 
 from src.database.connectFromDB import Database
+from src.models.catalog import Catalog
+
+# Copia o preço atual dos pratos filtrados para o histórico
+_SQL_REGISTRAR_HISTORICO = """
+    INSERT INTO Precos_Historico (prato_id, preco, vigente_desde)
+    SELECT p.id, pr.preco, NOW(6)
+    FROM Pratos p JOIN Precos pr ON pr.id = p.fk_preco
+"""
 
 
 class Prices:
     def __init__(self, db: Database):
         self.db = db
+        self.catalogo = Catalog(self.db)
 
     def inserirPreco(self, preco: float):
         """
@@ -22,18 +32,17 @@ class Prices:
             mysql.connector.Error: Se ocorrer um erro ao executar a inserção no banco.
         """
         try:
-            self.db.abrirConexao()
-            sql = "INSERT INTO Precos (preco) VALUES (%s)"
-            self.db.cursor.execute(sql, (preco,))
-            self.db.connection.commit()
-            newID = self.db.cursor.lastrowid
+            with self.db.conexao() as cursor:
+                sql = "INSERT INTO Precos (preco) VALUES (%s)"
+                cursor.execute(sql, (preco,))
+                newID = cursor.lastrowid
+                self.catalogo.registrarAlteracao()
+                self.db.commit()
             print(f"✅ Preço (ID: {newID}, Valor: {preco}) inserido com sucesso.")
             return newID
         except mysql.connector.Error as e:
             print(f"❌ Erro ao inserir preço: \n{e}")
             return None
-        finally:
-            self.db.fecharConexao()
 
     def atualizarPreco(self, id_preco, novo_preco):
         """
@@ -47,12 +56,47 @@ class Prices:
                 id_preco = id_preco[0]
 
             valores_dict = {"preco": float(novo_preco)}
-            self.db.atualizarRegistro("Precos", valores_dict, "id", id_preco)
+            with self.db.transaction() as cursor:
+                cursor.execute("SELECT preco FROM Precos WHERE id = %s FOR UPDATE", (id_preco,))
+                atual = cursor.fetchone()
+                # Preço igual: nada a gravar nem a registrar no histórico
+                if atual is not None and atual["preco"] == valores_dict["preco"]:
+                    return True
+                self.db.atualizarRegistro("Precos", valores_dict, "id", id_preco)
+                self.registrarHistorico(id_preco=id_preco)
+                self.catalogo.registrarAlteracao()
             return True
         except mysql.connector.Error as e:
             print(f"❌ Erro ao atualizar preço (ID: {id_preco}): \n{e}")
             return False
 
+    def registrarHistorico(self, pratos_ids: list = None, id_preco: int = None):
+        """
+        Grava em Precos_Historico o preço atual dos pratos, vigente a partir de agora.
+
+        Deve ser chamado na mesma transação que alterou Precos, depois da
+        alteração, e só para preços que de fato mudaram. Os pratos são indicados pelos ids ou pelo preço que usam.
+        A vigência vem do relógio do servidor, com microssegundos, como Pedidos.criado_em.
+
+        Args:
+            pratos_ids (list, optional): IDs dos pratos.
+            id_preco (int, optional): ID do preço (Pratos.fk_preco).
+
+        Raises:
+            mysql.connector.Error: Se ocorrer erro na gravação.
+        """
+        with self.db.conexao() as cursor:
+            if id_preco is not None:
+                cursor.execute(
+                    _SQL_REGISTRAR_HISTORICO + "    WHERE p.fk_preco = %s\n", (id_preco,)
+                )
+            if pratos_ids:
+                cursor.execute(
+                    _SQL_REGISTRAR_HISTORICO
+                    + f"    WHERE p.id IN ({', '.join(['%s'] * len(pratos_ids))})\n",
+                    tuple(pratos_ids),
+                )
+
     def deletarPreco(self, id_preco: int):
         """
         Deleta um preço da tabela Precos.
@@ -70,11 +114,15 @@ class Prices:
             mysql.connector.Error: Se ocorrer um erro durante a deleção.
         """
         try:
-            self.db.abrirConexao()
-            sql = "DELETE FROM Precos WHERE id = %s"
-            self.db.cursor.execute(sql, (id_preco,))
-            self.db.connection.commit()
-            if self.db.cursor.rowcount > 0:
+            with self.db.conexao() as cursor:
+                sql = "DELETE FROM Precos WHERE id = %s"
+                cursor.execute(sql, (id_preco,))
+                deletados = cursor.rowcount
+                if deletados > 0:
+                    self.catalogo.registrarAlteracao()
+                self.db.commit()
+
+            if deletados > 0:
                 print(f"✅ Preço (ID: {id_preco}) deletado com sucesso.")
                 return True
             else:
@@ -83,5 +131,3 @@ class Prices:
         except mysql.connector.Error as e:
             print(f"❌ Erro ao deletar preço (ID: {id_preco}): \n{e}")
             return False
-        finally:
-            self.db.fecharConexao()
@@ -55,23 +55,107 @@ CREATE TABLE Prato_Ingredientes (
     FOREIGN KEY (ingrediente_id) REFERENCES Ingredientes(id)
 );
 
+-- Histórico de preços: cada preço que o prato já teve, válido de vigente_desde
+-- até a linha seguinte do mesmo prato. Precos guarda só o preço atual. As
+-- datas (e Pedidos.criado_em) vêm do relógio do servidor com microssegundos,
+-- para comparar um pedido com uma mudança de preço do mesmo segundo. Sem
+-- chave estrangeira, como o histórico de pedidos: as linhas ficam quando o
+-- prato é excluído, para os pedidos arquivados continuarem com seus preços.
+CREATE TABLE Precos_Historico (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    prato_id INT NOT NULL,
+    preco DOUBLE,
+    vigente_desde DATETIME(6) NOT NULL
+);
+
+CREATE INDEX idx_precos_historico_prato ON Precos_Historico (prato_id, vigente_desde);
+
+-- Carimbo do catálogo (pratos, preços e ingredientes): uma única linha (id 1),
+-- incrementada a cada alteração para as telas recarregarem o catálogo
+CREATE TABLE Catalogo_Versao (
+    id INT PRIMARY KEY,
+    versao INT NOT NULL DEFAULT 0
+);
+
 -- Pedidos podem ter vários pratos
 CREATE TABLE Pedidos (
     id_pedido INT AUTO_INCREMENT PRIMARY KEY,
     numMesa INT,
     fk_colaborador BIGINT,
+    status_pedido VARCHAR(20) DEFAULT 'pendente',
+    criado_em DATETIME(6),
+    -- Incrementada a cada alteração: uma edição só é gravada se o pedido
+    -- ainda estiver na versão que o terminal leu
+    versao INT NOT NULL DEFAULT 0,
     FOREIGN KEY (fk_colaborador) REFERENCES Colaboradores(cpf)
 );
 
--- Relação muitos-para-muitos: Pedidos e Pratos
+-- Fila da cozinha: busca pedidos por status sem varrer o histórico
+CREATE INDEX idx_pedidos_status ON Pedidos (status_pedido, id_pedido);
+
+-- Conta da mesa: pedidos em aberto de uma mesa sem varrer os demais
+CREATE INDEX idx_pedidos_mesa_status ON Pedidos (numMesa, status_pedido);
+
+-- Relação muitos-para-muitos: Pedidos e Pratos. Pedir o mesmo prato de
+-- novo soma em quantidade em vez de criar outra linha.
 CREATE TABLE Pedido_Pratos (
     pedido_id INT,
     prato_id INT,
+    quantidade INT NOT NULL DEFAULT 1,
     PRIMARY KEY (pedido_id, prato_id),
     FOREIGN KEY (pedido_id) REFERENCES Pedidos(id_pedido),
     FOREIGN KEY (prato_id) REFERENCES Pratos(id)
 );
 
+-- Registro de alterações dos pedidos (inclusão, alteração e exclusão).
+-- O id crescente serve de marcador para buscar apenas o que mudou; sem FK
+-- para que o registro de exclusão continue existindo depois do DELETE.
+CREATE TABLE Pedidos_Alteracoes (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    pedido_id INT NOT NULL,
+    excluido BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+-- Histórico append-only das mudanças de status dos pedidos, usado no
+-- relatório de tempo em cada status. Sem FK, como Pedidos_Alteracoes.
+CREATE TABLE Pedidos_Eventos (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    pedido_id INT NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    registrado_em DATETIME NOT NULL
+);
+
+CREATE INDEX idx_eventos_registrado_em ON Pedidos_Eventos (registrado_em);
+
+-- Pedidos entregues há mais de N dias saem de Pedidos/Pedido_Pratos para o
+-- histórico (Orders.arquivarPedidos). Particionadas por mês de criação: o
+-- arquivamento cria a partição de cada mês a partir de p_futuro. Tabelas
+-- particionadas não aceitam FK, e a coluna da partição precisa estar na PK.
+CREATE TABLE Pedidos_Historico (
+    id_pedido INT NOT NULL,
+    numMesa INT,
+    fk_colaborador BIGINT,
+    status_pedido VARCHAR(20),
+    criado_em DATETIME(6) NOT NULL,
+    versao INT NOT NULL DEFAULT 0,
+    arquivado_em DATETIME NOT NULL,
+    PRIMARY KEY (id_pedido, criado_em)
+)
+PARTITION BY RANGE COLUMNS(criado_em) (
+    PARTITION p_futuro VALUES LESS THAN (MAXVALUE)
+);
+
+CREATE TABLE Pedido_Pratos_Historico (
+    pedido_id INT NOT NULL,
+    prato_id INT NOT NULL,
+    quantidade INT NOT NULL DEFAULT 1,
+    criado_em DATETIME(6) NOT NULL,
+    PRIMARY KEY (pedido_id, prato_id, criado_em)
+)
+PARTITION BY RANGE COLUMNS(criado_em) (
+    PARTITION p_futuro VALUES LESS THAN (MAXVALUE)
+);
+
 -- Cardápio tem vários pratos
 CREATE TABLE Cardapio (
     id INT AUTO_INCREMENT PRIMARY KEY
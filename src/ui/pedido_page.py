@@ -1,6 +1,28 @@
 import tkinter as tk
+from datetime import datetime
 from tkinter import ttk, messagebox
 
+from src.enums.Enums import StatusPedido
+
+STATUS_PEDIDO = [status.value for status in StatusPedido]
+ROTULOS_STATUS = dict(StatusPedido.get_choices())
+
+# Opção dos filtros que não restringe nada
+TODOS = "todos"
+
+
+def _formatar_duracao(segundos: float) -> str:
+    """Duração em minutos e segundos (ex.: 12:05), com horas quando passar de uma."""
+    minutos, segundos = divmod(int(segundos), 60)
+    horas, minutos = divmod(minutos, 60)
+    return f"{horas}h{minutos:02d}:{segundos:02d}" if horas else f"{minutos}:{segundos:02d}"
+
+
+def _rotulo_prato(prato: dict) -> str:
+    """Nome do prato, com a quantidade quando houver mais de uma unidade."""
+    quantidade = prato.get("quantidade") or 1
+    return f"{quantidade}x {prato.get('prato', '')}" if quantidade > 1 else prato.get("prato", "")
+
 
 class PedidoPage:
     def __init__(self, container, limpar_container, main_controller, cor_fundo_janela):
@@ -11,26 +33,34 @@ class PedidoPage:
         self.cor_fundo_janela = cor_fundo_janela  # Cor de fundo
         self.tree = None  # Referência para a Treeview
         self._pedidos_data = {}
+        self._tem_mais = False
+        self._colaboradores = {}
 
-    def criar_lista_pedidos(self, pedidos_data):
+    def criar_lista_pedidos(self, pedidos_data=None, colaboradores=None):
         """Cria a interface gráfica com a lista de pedidos.
 
+        Os pedidos chegam em páginas por `adicionar_pedidos`; ao rolar até o fim
+        da lista a próxima página é pedida ao controller.
+
         Args:
-            pedidos_data (dict): Dicionário no formato:
+            pedidos_data (dict, optional): Pedidos já carregados, no formato:
                 {
                     id_pedido: {
                         'numero_da_mesa': int,
                         'nome_do_colaborador': str,
                         'status_pedido': str,
+                        'criado_em': datetime | None,
                         'pratos': [{'prato': str, 'ingredientes': list}]
                     },
                 }
+            colaboradores (list, optional): Colaboradores para o filtro de atendente.
         """
         # Limpa o container anterior
         self.limpar_container()
 
-        # Armazena os dados recebidos
-        self._pedidos_data = pedidos_data.copy()
+        self._pedidos_data = {}
+        self._tem_mais = False
+        self._colaboradores = {c["nome"]: c["cpf"] for c in colaboradores or []}
 
         # Cria o frame principal
         frame = ttk.Frame(self.container, padding=20, style="Background.TFrame")
@@ -44,13 +74,15 @@ class PedidoPage:
             background=self.cor_fundo_janela,
         ).pack(pady=(0, 15), anchor="w")
 
+        self._criar_filtros(frame)
+
         # Container para a Treeview e scrollbar
         tree_frame = ttk.Frame(frame)
         tree_frame.pack(fill="both", expand=True)
 
         # Scrollbar vertical
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side="right", fill="y")
+        self.scrollbar = ttk.Scrollbar(tree_frame)
+        self.scrollbar.pack(side="right", fill="y")
 
         # Definição das colunas
         columns = (
@@ -59,15 +91,18 @@ class PedidoPage:
             "atendente",
             "pratos",
             "status",
+            "criado_em",
+            "total",
         )
         self.tree = ttk.Treeview(
             tree_frame,
             columns=columns,
             show="headings",
-            yscrollcommand=scrollbar.set,
+            yscrollcommand=self._ao_rolar,
+            selectmode="extended",  # Ctrl/Shift+clique para mudar vários de uma vez
             style="Treeview",
         )
-        scrollbar.config(command=self.tree.yview)
+        self.scrollbar.config(command=self.tree.yview)
 
         # Configuração do cabeçalho
         for col, title, width in [
@@ -76,29 +111,20 @@ class PedidoPage:
             ("atendente", "Atendente", 120),
             ("pratos", "Pratos", 200),
             ("status", "Status", 100),
+            ("criado_em", "Criado em", 110),
+            ("total", "Total", 90),
         ]:
             self.tree.heading(col, text=title, anchor="w")
             self.tree.column(col, width=width, stretch=(col != "id"))
 
         self.tree.pack(fill="both", expand=True)
 
-        # Preenchimento dos dados
-        for pedido_id, dados in pedidos_data.items():
-            # Formata a lista de pratos para exibição
-            lista_pratos = "\n".join([prato["prato"] for prato in dados["pratos"]])
+        self.label_paginacao = ttk.Label(frame, text="Carregando pedidos...")
+        self.label_paginacao.pack(anchor="w", pady=(5, 0))
 
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    pedido_id,  # id
-                    dados["numero_da_mesa"],  # mesa
-                    dados["nome_do_colaborador"],  # atendente
-                    lista_pratos,  # pratos (um por linha)
-                    dados["status_pedido"].capitalize(),  # status
-                ),
-                tags=(dados["status_pedido"],),  # Tag para estilização
-            )
+        # Preenchimento dos dados
+        if pedidos_data:
+            self.adicionar_pedidos(pedidos_data)
 
         # Configura cores por status
         self.tree.tag_configure("pendente", background="#fff3cd")
@@ -119,7 +145,7 @@ class PedidoPage:
             ("Excluir Pedido", self._handler_excluir_pedido),
             (
                 "Atualizar Pedidos",
-                lambda: self.main_controller.recarregarListaPedidos(),
+                lambda: self.main_controller.atualizarListaPedidos(),
             ),
         ]
 
@@ -131,6 +157,375 @@ class PedidoPage:
                 style="TButton",
             ).pack(side="left", padx=5)
 
+        # Mudança de status dos pedidos selecionados ou de uma mesa inteira
+        lote_frame = ttk.Frame(frame)
+        lote_frame.pack(fill="x", pady=(10, 0))
+
+        ttk.Label(lote_frame, text="Status dos selecionados:").pack(side="left", padx=5)
+        self.status_lote = ttk.Combobox(
+            lote_frame, width=14, values=STATUS_PEDIDO, state="readonly"
+        )
+        self.status_lote.set(StatusPedido.ENTREGUE.value)
+        self.status_lote.pack(side="left", padx=5)
+        ttk.Button(
+            lote_frame,
+            text="Aplicar aos Selecionados",
+            command=self._handler_status_selecionados,
+        ).pack(side="left", padx=5)
+        ttk.Button(
+            lote_frame,
+            text="Fechar Mesa",
+            command=self._handler_fechar_mesa,
+            style="Secondary.TButton",
+        ).pack(side="left", padx=5)
+        ttk.Button(
+            lote_frame,
+            text="Conta da Mesa",
+            command=self._handler_conta_mesa,
+        ).pack(side="left", padx=5)
+
+    def _criar_filtros(self, frame):
+        """Cria a barra de filtros (status, mesa, atendente e período)."""
+        filtros_frame = ttk.Frame(frame)
+        filtros_frame.pack(fill="x", pady=(0, 10))
+
+        self.filtros = {}
+        campos = [
+            ("Status:", "status", [TODOS] + STATUS_PEDIDO),
+            ("Mesa:", "num_mesa", None),
+            ("Atendente:", "atendente", [TODOS] + sorted(self._colaboradores)),
+            ("De (dd/mm/aaaa):", "data_inicio", None),
+            ("Até:", "data_fim", None),
+        ]
+        for coluna, (label_text, chave, valores) in enumerate(campos):
+            ttk.Label(filtros_frame, text=label_text).grid(
+                row=0, column=coluna * 2, sticky="w", padx=(5, 2)
+            )
+            if valores is not None:
+                entry = ttk.Combobox(
+                    filtros_frame, width=14, values=valores, state="readonly"
+                )
+                entry.set(TODOS)
+            else:
+                entry = ttk.Entry(filtros_frame, width=11)
+            entry.grid(row=0, column=coluna * 2 + 1, sticky="w", padx=(0, 5))
+            self.filtros[chave] = entry
+
+        ttk.Button(
+            filtros_frame, text="Filtrar", command=self._handler_filtrar
+        ).grid(row=0, column=len(campos) * 2, padx=5)
+        ttk.Button(
+            filtros_frame,
+            text="Limpar",
+            command=self._handler_limpar_filtros,
+            style="Secondary.TButton",
+        ).grid(row=0, column=len(campos) * 2 + 1, padx=5)
+
+    def adicionar_pedidos(self, pedidos_data, limpar=False, tem_mais=False):
+        """Acrescenta uma página de pedidos à lista.
+
+        Args:
+            pedidos_data (dict): Pedidos da página, no formato de `criar_lista_pedidos`.
+            limpar (bool): Se True, remove os pedidos exibidos antes (novo filtro).
+            tem_mais (bool): Se existem mais páginas a carregar.
+        """
+        if self.tree is None or not self.tree.winfo_exists():
+            return
+        if limpar:
+            self.tree.delete(*self.tree.get_children())
+            self._pedidos_data = {}
+
+        self._pedidos_data.update(pedidos_data)
+        self._tem_mais = tem_mais
+
+        for pedido_id, dados in pedidos_data.items():
+            if self.tree.exists(str(pedido_id)):  # já entrou por aplicar_alteracoes
+                continue
+            # iid = id do pedido, para as atualizações incrementais acharem a linha
+            self.tree.insert(
+                "",
+                "end",
+                iid=str(pedido_id),
+                values=self._valores_linha(pedido_id, dados),
+                tags=(dados["status_pedido"],),  # Tag para estilização
+            )
+        self._atualizar_label_paginacao()
+
+    def aplicar_alteracoes(self, alterados, excluidos):
+        """Aplica na lista apenas os pedidos que mudaram desde a última atualização.
+
+        Args:
+            alterados (dict): Pedidos incluídos ou alterados, no formato de `criar_lista_pedidos`.
+            excluidos (list): IDs dos pedidos que devem sair da lista.
+        """
+        if self.tree is None or not self.tree.winfo_exists():
+            return
+
+        for pedido_id in excluidos:
+            if self._pedidos_data.pop(pedido_id, None) is not None:
+                self.tree.delete(str(pedido_id))
+
+        # Só entra na lista o que cabe nas páginas já carregadas; pedidos mais
+        # antigos aparecem ao rolar.
+        menor_carregado = min(self._pedidos_data, default=None)
+        for pedido_id, dados in alterados.items():
+            valores = self._valores_linha(pedido_id, dados)
+            if pedido_id in self._pedidos_data:
+                self.tree.item(str(pedido_id), values=valores, tags=(dados["status_pedido"],))
+            elif not self._tem_mais or menor_carregado is None or pedido_id > menor_carregado:
+                posicao = sum(1 for outro in self._pedidos_data if outro > pedido_id)
+                self.tree.insert(
+                    "",
+                    posicao,
+                    iid=str(pedido_id),
+                    values=valores,
+                    tags=(dados["status_pedido"],),
+                )
+            else:
+                continue
+            self._pedidos_data[pedido_id] = dados
+        self._atualizar_label_paginacao()
+
+    @staticmethod
+    def _valores_linha(pedido_id, dados):
+        """Valores das colunas da Treeview para um pedido."""
+        # Formata a lista de pratos para exibição
+        lista_pratos = "\n".join([_rotulo_prato(prato) for prato in dados["pratos"]])
+        criado_em = dados.get("criado_em")
+        return (
+            pedido_id,  # id
+            dados["numero_da_mesa"],  # mesa
+            dados["nome_do_colaborador"],  # atendente
+            lista_pratos,  # pratos (um por linha)
+            ROTULOS_STATUS.get(dados["status_pedido"], dados["status_pedido"]),  # status
+            criado_em.strftime("%d/%m %H:%M") if criado_em else "",
+            f"R$ {dados.get('valor_total') or 0:.2f}",  # total com os preços do momento do pedido
+        )
+
+    def _atualizar_label_paginacao(self):
+        total = len(self._pedidos_data)
+        if self._tem_mais:
+            texto = f"{total} pedidos carregados — role até o fim para ver mais"
+        elif total:
+            texto = f"{total} pedidos"
+        else:
+            texto = "Nenhum pedido encontrado"
+        self.label_paginacao.config(text=texto)
+
+    def _ao_rolar(self, primeiro, ultimo):
+        """Atualiza a scrollbar e pede a próxima página ao chegar perto do fim."""
+        self.scrollbar.set(primeiro, ultimo)
+        if self._tem_mais and float(ultimo) >= 0.95:
+            self.main_controller.carregar_mais_pedidos()
+
+    def _handler_filtrar(self):
+        """Recarrega a lista do início com os filtros preenchidos."""
+        filtros = {}
+
+        status = self.filtros["status"].get()
+        if status and status != TODOS:
+            filtros["status"] = status
+
+        mesa = self.filtros["num_mesa"].get().strip()
+        if mesa:
+            if not mesa.isdigit():
+                messagebox.showwarning("Aviso", "Número da mesa inválido!")
+                return
+            filtros["num_mesa"] = int(mesa)
+
+        atendente = self.filtros["atendente"].get()
+        if atendente in self._colaboradores:
+            filtros["fk_colaborador"] = self._colaboradores[atendente]
+
+        for chave in ("data_inicio", "data_fim"):
+            texto = self.filtros[chave].get().strip()
+            if not texto:
+                continue
+            try:
+                filtros[chave] = datetime.strptime(texto, "%d/%m/%Y").date()
+            except ValueError:
+                messagebox.showwarning("Aviso", f"Data inválida: {texto} (use dd/mm/aaaa)")
+                return
+
+        self.label_paginacao.config(text="Carregando pedidos...")
+        self.main_controller.carregar_pedidos(filtros)
+
+    def _handler_limpar_filtros(self):
+        """Remove os filtros e recarrega a lista do início."""
+        for entry in self.filtros.values():
+            if isinstance(entry, ttk.Combobox):
+                entry.set(TODOS)
+            else:
+                entry.delete(0, "end")
+        self.label_paginacao.config(text="Carregando pedidos...")
+        self.main_controller.carregar_pedidos()
+
+    def criar_fila_cozinha(self, pedidos):
+        """Cria a tela da cozinha com os pedidos pendentes e em preparo.
+
+        Args:
+            pedidos (list): [(id_pedido, pedido)] do mais antigo ao mais novo,
+                como retornado por Orders.fila_cozinha.
+        """
+        self.limpar_container()
+        self._pedidos_data = dict(pedidos)
+
+        frame = ttk.Frame(self.container, padding=20, style="Background.TFrame")
+        frame.pack(fill="both", expand=True)
+
+        ttk.Label(
+            frame,
+            text=f"Fila da Cozinha ({len(pedidos)})",
+            style="Subtitle.TLabel",
+            background=self.cor_fundo_janela,
+        ).pack(pady=(0, 15), anchor="w")
+
+        tree_frame = ttk.Frame(frame)
+        tree_frame.pack(fill="both", expand=True)
+        scrollbar = ttk.Scrollbar(tree_frame)
+        scrollbar.pack(side="right", fill="y")
+
+        self.tree = ttk.Treeview(
+            tree_frame,
+            columns=("id", "mesa", "pratos", "status", "criado_em"),
+            show="headings",
+            yscrollcommand=scrollbar.set,
+            style="Treeview",
+        )
+        scrollbar.config(command=self.tree.yview)
+        for col, title, width in [
+            ("id", "ID", 50),
+            ("mesa", "N° Mesa", 80),
+            ("pratos", "Pratos", 260),
+            ("status", "Status", 100),
+            ("criado_em", "Criado em", 110),
+        ]:
+            self.tree.heading(col, text=title, anchor="w")
+            self.tree.column(col, width=width, stretch=(col != "id"))
+        self.tree.pack(fill="both", expand=True)
+
+        for pedido_id, dados in pedidos:
+            _, mesa, _, lista_pratos, status, criado_em, _ = self._valores_linha(
+                pedido_id, dados
+            )
+            self.tree.insert(
+                "",
+                "end",
+                iid=str(pedido_id),
+                values=(pedido_id, mesa, lista_pratos, status, criado_em),
+                tags=(dados["status_pedido"],),
+            )
+        self.tree.tag_configure("pendente", background="#fff3cd")
+        self.tree.tag_configure("em_preparo", background="#cce5ff")
+        self.tree.bind("<ButtonRelease-1>", self._on_pedido_click)
+
+        btn_frame = ttk.Frame(frame)
+        btn_frame.pack(fill="x", pady=(10, 0))
+        botoes = [
+            (
+                "Iniciar Preparo",
+                lambda: self._handler_mudar_status(StatusPedido.EM_PREPARO.value),
+            ),
+            (
+                "Marcar como Pronto",
+                lambda: self._handler_mudar_status(StatusPedido.PRONTO.value),
+            ),
+            ("Atualizar Fila", lambda: self.main_controller.mostrar_tela("fila_cozinha")),
+        ]
+        for texto, comando in botoes:
+            ttk.Button(btn_frame, text=texto, command=comando, style="TButton").pack(
+                side="left", padx=5
+            )
+
+    def criar_relatorio_tempos(self, relatorio):
+        """Cria a tela com os percentis de tempo em cada status, por prato e por hora.
+
+        Args:
+            relatorio (dict): Retorno de Orders.relatorio_tempos_status.
+        """
+        self.limpar_container()
+
+        frame = ttk.Frame(self.container, padding=20, style="Background.TFrame")
+        frame.pack(fill="both", expand=True)
+
+        ttk.Label(
+            frame,
+            text="Tempos de Preparo",
+            style="Subtitle.TLabel",
+            background=self.cor_fundo_janela,
+        ).pack(pady=(0, 15), anchor="w")
+
+        secoes = [
+            ("Por prato", relatorio.get("por_prato", {}), str),
+            ("Por hora", relatorio.get("por_hora", {}), lambda hora: f"{hora:02d}h"),
+        ]
+        for titulo, grupos, rotulo_grupo in secoes:
+            ttk.Label(frame, text=titulo, style="Bold.TLabel").pack(anchor="w", pady=(10, 5))
+            tree_frame = ttk.Frame(frame)
+            tree_frame.pack(fill="both", expand=True)
+            scrollbar = ttk.Scrollbar(tree_frame)
+            scrollbar.pack(side="right", fill="y")
+
+            tree = ttk.Treeview(
+                tree_frame,
+                columns=("grupo", "status", "n", "p50", "p95", "p99"),
+                show="headings",
+                yscrollcommand=scrollbar.set,
+                style="Treeview",
+            )
+            scrollbar.config(command=tree.yview)
+            for col, title, width in [
+                ("grupo", titulo.split()[-1].capitalize(), 160),
+                ("status", "Status", 100),
+                ("n", "Pedidos", 70),
+                ("p50", "p50", 80),
+                ("p95", "p95", 80),
+                ("p99", "p99", 80),
+            ]:
+                tree.heading(col, text=title, anchor="w")
+                tree.column(col, width=width, stretch=(col == "grupo"))
+            tree.pack(fill="both", expand=True)
+
+            for grupo, por_status in grupos.items():
+                # Status na ordem do ciclo do pedido
+                for status in STATUS_PEDIDO:
+                    if status not in por_status:
+                        continue
+                    tempos = por_status[status]
+                    tree.insert(
+                        "",
+                        "end",
+                        values=(
+                            rotulo_grupo(grupo),
+                            ROTULOS_STATUS.get(status, status),
+                            tempos["n"],
+                            *(_formatar_duracao(tempos[p]) for p in ("p50", "p95", "p99")),
+                        ),
+                        tags=(status,),
+                    )
+            tree.tag_configure("pendente", background="#fff3cd")
+            tree.tag_configure("em_preparo", background="#cce5ff")
+            tree.tag_configure("pronto", background="#d4edda")
+
+        ttk.Button(
+            frame,
+            text="Atualizar Relatório",
+            command=lambda: self.main_controller.mostrar_tela("relatorio_tempos"),
+            style="TButton",
+        ).pack(anchor="w", pady=(10, 0))
+
+    def _handler_mudar_status(self, novo_status):
+        """Muda o status do pedido selecionado na fila da cozinha."""
+        selecionado = self.tree.selection()
+        if not selecionado:
+            messagebox.showwarning("Aviso", "Nenhum pedido selecionado!")
+            return
+        pedido_id = self.tree.item(selecionado[0])["values"][0]
+        pedido = self._pedidos_data.get(pedido_id, {})
+        self.main_controller.mudar_status_pedido(
+            pedido_id, novo_status, versao=pedido.get("versao")
+        )
+
     def criar_form_pedido(
         self,
         modo="novo",
@@ -169,13 +564,7 @@ class PedidoPage:
                 entry = ttk.Combobox(
                     frame,
                     width=37,
-                    values=[
-                        "pendente",
-                        "em preparo",
-                        "pronto",
-                        "entregue",
-                        "cancelado",
-                    ],
+                    values=STATUS_PEDIDO,
                 )
 
             else:
@@ -251,8 +640,8 @@ class PedidoPage:
             ]
 
             for i in range(self.pratos_listbox.size()):
-                item_text = self.pratos_listbox.get(i)
-                if any(str(prato_id) in item_text for prato_id in pratos_selecionados):
+                item_id = self.pratos_listbox.get(i).split(" - ")[0]
+                if item_id in {str(prato_id) for prato_id in pratos_selecionados}:
                     self.pratos_listbox.selection_set(i)
         frame.columnconfigure(1, weight=1)
 
@@ -295,7 +684,7 @@ class PedidoPage:
             frame, text=f"Atendente: {pedido.get('nome_do_colaborador', '')}"
         ).pack(anchor="w")
         ttk.Label(
-            frame, text=f"Status: {pedido.get('status_pedido', '').capitalize()}"
+            frame, text=f"Status: {ROTULOS_STATUS.get(pedido.get('status_pedido'), pedido.get('status_pedido', ''))}"
         ).pack(anchor="w")
 
         # Lista de pratos com ingredientes
@@ -310,7 +699,7 @@ class PedidoPage:
 
             # Nome do prato
             ttk.Label(
-                prato_frame, text=prato.get("prato", ""), style="Bold.TLabel"
+                prato_frame, text=_rotulo_prato(prato), style="Bold.TLabel"
             ).pack(anchor="w")
 
             # Ingredientes
@@ -320,11 +709,110 @@ class PedidoPage:
             for ingrediente in prato.get("ingredientes", []):
                 ttk.Label(ingredientes_frame, text=f"• {ingrediente}").pack(anchor="w")
 
+        ttk.Label(
+            frame,
+            text=f"Total: R$ {pedido.get('valor_total') or 0:.2f}",
+            style="Bold.TLabel",
+        ).pack(anchor="w", pady=(10, 0))
+
     # Métodos de handlers
     def _handler_adicionar_pedido(self):
         """Abre o formulário para novo pedido"""
         self.main_controller.mostrar_tela("form_pedido", modo="novo")
 
+    def _handler_status_selecionados(self):
+        """Muda para o status escolhido todos os pedidos selecionados."""
+        selecionados = [int(item) for item in self.tree.selection()]
+        if not selecionados:
+            messagebox.showwarning("Aviso", "Nenhum pedido selecionado!")
+            return
+        novo_status = self.status_lote.get()
+        if not messagebox.askyesno(
+            "Confirmar",
+            f"Mudar {len(selecionados)} pedido(s) para "
+            f"'{ROTULOS_STATUS.get(novo_status, novo_status)}'?",
+        ):
+            return
+        self.main_controller.mudar_status_em_lote(novo_status, ids=selecionados)
+
+    def _mesa_selecionada(self):
+        """Número da mesa dos pedidos selecionados, ou None (com aviso) se não houver uma só."""
+        selecionado = self.tree.selection()
+        if not selecionado:
+            messagebox.showwarning("Aviso", "Selecione um pedido da mesa!")
+            return None
+        mesas = {self._pedidos_data[int(item)]["numero_da_mesa"] for item in selecionado}
+        if len(mesas) > 1:
+            messagebox.showwarning("Aviso", "Selecione pedidos de uma única mesa!")
+            return None
+        return mesas.pop()
+
+    def _handler_conta_mesa(self):
+        """Mostra a conta em aberto da mesa do pedido selecionado."""
+        num_mesa = self._mesa_selecionada()
+        if num_mesa is not None:
+            self.main_controller.mostrar_conta_mesa(num_mesa)
+
+    def mostrar_conta_mesa(self, conta: dict):
+        """Mostra a conta em aberto de uma mesa em uma nova janela.
+
+        Args:
+            conta (dict): Conta no formato de Orders.contaDaMesa.
+        """
+        janela = tk.Toplevel(self.container)
+        janela.title(f"Conta da Mesa #{conta['num_mesa']}")
+
+        frame = ttk.Frame(janela, padding=20)
+        frame.pack(fill="both", expand=True)
+
+        pedidos = ", ".join(str(pedido_id) for pedido_id in conta["pedidos"])
+        ttk.Label(frame, text=f"Pedidos em aberto: {pedidos or 'nenhum'}").pack(anchor="w")
+
+        tree = ttk.Treeview(
+            frame,
+            columns=("prato", "quantidade", "preco", "subtotal"),
+            show="headings",
+            height=min(max(len(conta["itens"]), 1), 15),
+        )
+        for col, title, width in [
+            ("prato", "Prato", 200),
+            ("quantidade", "Qtd.", 60),
+            ("preco", "Preço", 90),
+            ("subtotal", "Subtotal", 90),
+        ]:
+            tree.heading(col, text=title, anchor="w")
+            tree.column(col, width=width)
+        for item in conta["itens"]:
+            tree.insert(
+                "",
+                "end",
+                values=(
+                    item["prato"],
+                    item["quantidade"],
+                    f"R$ {item['preco']:.2f}",
+                    f"R$ {item['subtotal']:.2f}",
+                ),
+            )
+        tree.pack(fill="both", expand=True, pady=(10, 0))
+
+        ttk.Label(
+            frame, text=f"Total: R$ {conta['total']:.2f}", style="Bold.TLabel"
+        ).pack(anchor="w", pady=(10, 0))
+
+    def _handler_fechar_mesa(self):
+        """Marca como entregues os pedidos em aberto da mesa do pedido selecionado."""
+        num_mesa = self._mesa_selecionada()
+        if num_mesa is None:
+            return
+        if not messagebox.askyesno(
+            "Confirmar",
+            f"Marcar como entregues todos os pedidos em aberto da mesa {num_mesa}?",
+        ):
+            return
+        self.main_controller.mudar_status_em_lote(
+            StatusPedido.ENTREGUE.value, num_mesa=num_mesa
+        )
+
     def _handler_editar_pedido(self):
         """Edita o pedido selecionado"""
         selecionado = self.tree.selection()
@@ -367,11 +855,12 @@ class PedidoPage:
 
         if modo == "editar":
             self.main_controller.atualizar_pedido(id_pedido, dados)
+            # Volta à lista já carregada; o controller aplica só o que mudou
+            self.main_controller.voltarListaPedidos()
         else:
             self.main_controller.criar_pedido(dados)
-
-        self.limpar_container()
-        self.main_controller.recarregarListaPedidos()
+            self.limpar_container()
+            self.main_controller.recarregarListaPedidos()
 
     def _handle_cancelar_form_pedido(self):
         """Notifica o controller principal para voltar à tela de lista."""
@@ -174,13 +174,12 @@ class PratosPage:
             self.entries["nome"].insert(0, data_prato.get("nome", ""))
             self.entries["preco"].insert(0, data_prato.get("preco", ""))
 
-            ingredientes_str = data_prato.get("ingredientes", "")
-            for ing_nome in ingredientes_str.split(", "):
-                for i in range(self.pratos_listbox.size()):
-                    item_text = self.pratos_listbox.get(i)
-                    if ing_nome in item_text:
-                        self.pratos_listbox.selection_set(i)
-                        break
+            # Seleção pelo id: desmarcar um ingrediente o remove do prato
+            ingredientes_ids = set(data_prato.get("ingredientes_ids") or [])
+            for i in range(self.pratos_listbox.size()):
+                item_id = int(self.pratos_listbox.get(i).split(" - ")[0])
+                if item_id in ingredientes_ids:
+                    self.pratos_listbox.selection_set(i)
 
         # Botões
         btn_frame = ttk.Frame(frame)
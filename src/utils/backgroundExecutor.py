@@ -0,0 +1,141 @@
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class BackgroundExecutor:
+    """Executa chamadas aos models em threads e devolve o resultado à thread do Tk.
+
+    O Tkinter não é thread-safe: os callbacks `ao_concluir`/`ao_falhar` nunca
+    rodam no worker, eles entram numa fila que é esvaziada pelo loop principal
+    via `root.after`.
+
+    Ordem: uma escrita espera a escrita anterior terminar, e uma leitura espera
+    as escritas submetidas antes dela. Assim a recarga de uma lista logo depois
+    de um "Salvar" sempre enxerga o que acabou de ser gravado.
+
+    Cancelamento: cada tarefa guarda a geração em que foi criada. Ao navegar
+    para outra tela, `cancelar_pendentes()` avança a geração; leituras que ainda
+    não começaram são canceladas e respostas antigas são descartadas. Escritas
+    nunca são canceladas e seus erros sempre são entregues.
+    """
+
+    def __init__(self, root, max_workers: int = 4, intervalo_ms: int = 50, ao_mudar_ocupado=None):
+        """Inicializa o executor.
+
+        Args:
+            root: Janela principal do Tk.
+            max_workers (int): Número de threads que acessam o banco.
+            intervalo_ms (int): Intervalo de verificação da fila de resultados.
+            ao_mudar_ocupado (callable, optional): Chamado na thread do Tk com
+                True quando há tarefas pendentes e False quando todas terminam.
+        """
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self.ao_mudar_ocupado = ao_mudar_ocupado
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._resultados = queue.Queue()
+        self._lock = threading.Lock()
+        self._geracao = 0
+        self._leituras = []
+        self._ultima_escrita = None
+        self._pendentes = 0
+        self._after_id = None
+
+    def executar(self, funcao, *args, ao_concluir=None, ao_falhar=None, escrita=False, **kwargs):
+        """Submete `funcao(*args, **kwargs)` a um worker. Deve ser chamado na thread do Tk.
+
+        Args:
+            funcao (callable): Chamada ao model, executada fora da thread do Tk.
+            ao_concluir (callable, optional): Recebe o retorno de `funcao`.
+            ao_falhar (callable, optional): Recebe a exceção levantada por `funcao`.
+                Se omitido, a exceção é apenas impressa.
+            escrita (bool): Marca a tarefa como escrita (não cancelável e ordenada).
+
+        Returns:
+            concurrent.futures.Future: Future da tarefa.
+        """
+        with self._lock:
+            geracao = self._geracao
+            dependencia = self._ultima_escrita
+            futuro = self._executor.submit(self._rodar, dependencia, funcao, args, kwargs)
+            if escrita:
+                self._ultima_escrita = futuro
+            else:
+                self._leituras = [f for f in self._leituras if not f.done()]
+                self._leituras.append(futuro)
+
+        self._pendentes += 1
+        if self._pendentes == 1:
+            self._notificar_ocupado(True)
+            self._agendar()
+
+        futuro.add_done_callback(
+            lambda f: self._resultados.put((f, geracao, escrita, ao_concluir, ao_falhar))
+        )
+        return futuro
+
+    @staticmethod
+    def _rodar(dependencia, funcao, args, kwargs):
+        # O FIFO do pool garante que a dependência já saiu da fila antes desta
+        # tarefa, então a espera não trava todos os workers.
+        if dependencia is not None:
+            wait([dependencia])
+        return funcao(*args, **kwargs)
+
+    def cancelar_pendentes(self):
+        """Descarta as leituras pendentes e as respostas das tarefas atuais."""
+        with self._lock:
+            self._geracao += 1
+            leituras, self._leituras = self._leituras, []
+        for futuro in leituras:
+            futuro.cancel()
+
+    def _agendar(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.intervalo_ms, self._processar_resultados)
+
+    def _processar_resultados(self):
+        """Entrega os resultados prontos na thread do Tk."""
+        self._after_id = None
+        while True:
+            try:
+                futuro, geracao, escrita, ao_concluir, ao_falhar = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+
+            self._pendentes -= 1
+            if futuro.cancelled():
+                continue
+            erro = futuro.exception()
+            atual = geracao == self._geracao
+            try:
+                if erro is None:
+                    if atual and ao_concluir is not None:
+                        ao_concluir(futuro.result())
+                elif atual or escrita:
+                    if ao_falhar is not None:
+                        ao_falhar(erro)
+                    else:
+                        print(f"❌ Erro em tarefa de banco de dados: {erro}")
+            except Exception:
+                # Um callback com erro não pode impedir a entrega dos demais
+                self.root.report_callback_exception(*sys.exc_info())
+
+        if self._pendentes > 0:
+            self._agendar()
+        else:
+            self._notificar_ocupado(False)
+
+    def _notificar_ocupado(self, ocupado: bool):
+        if self.ao_mudar_ocupado is not None:
+            self.ao_mudar_ocupado(ocupado)
+
+    def encerrar(self):
+        """Para de verificar a fila e libera os workers ao final das tarefas atuais."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,98 @@
+import sys
+import threading
+from typing import NamedTuple
+
+
+class PratoCatalogo(NamedTuple):
+    """Prato do catálogo; os ingredientes são ids, ordenados pelo nome."""
+
+    id: int
+    nome: str
+    preco: object
+    ingredientes: tuple
+
+
+class CatalogCache:
+    """Catálogo em memória (pratos, preços e ingredientes), indexado por id e por nome.
+
+    `versao` é o carimbo do catálogo no banco quando ele foi carregado (None
+    enquanto não foi carregado). Quem lê compara com o carimbo atual e só
+    recarrega quando ele muda.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.versao = None
+        self._pratos = {}
+        self._pratos_por_nome = {}
+        self._ingredientes = {}
+        self._ingredientes_por_nome = {}
+        self._ordem_pratos = ()
+        self._ordem_ingredientes = ()
+
+    def carregar(self, pratos: list, ingredientes: dict, ingredientes_por_prato: dict, versao):
+        """Substitui o conteúdo do catálogo.
+
+        Args:
+            pratos (list): [(id, nome, preco)] dos pratos.
+            ingredientes (dict): {id_ingrediente: nome}.
+            ingredientes_por_prato (dict): {id_prato: [id_ingrediente]}.
+            versao: Carimbo do catálogo lido antes das consultas.
+        """
+        self._ingredientes = {
+            ingrediente_id: sys.intern(nome) for ingrediente_id, nome in ingredientes.items()
+        }
+        self._ingredientes_por_nome = {
+            nome: ingrediente_id for ingrediente_id, nome in self._ingredientes.items()
+        }
+        self._ordem_ingredientes = tuple(
+            sorted(self._ingredientes, key=self._ingredientes.__getitem__)
+        )
+
+        self._pratos = {}
+        for prato_id, nome, preco in pratos:
+            ids = ingredientes_por_prato.get(prato_id, ())
+            self._pratos[prato_id] = PratoCatalogo(
+                prato_id,
+                sys.intern(nome),
+                preco,
+                tuple(
+                    sorted(
+                        set(ids) & self._ingredientes.keys(),
+                        key=self._ingredientes.__getitem__,
+                    )
+                ),
+            )
+        self._pratos_por_nome = {prato.nome: prato for prato in self._pratos.values()}
+        self._ordem_pratos = tuple(sorted(self._pratos.values(), key=lambda prato: prato.nome))
+        self.versao = versao
+
+    def prato(self, prato_id: int):
+        """Retorna o PratoCatalogo do id, ou None."""
+        return self._pratos.get(prato_id)
+
+    def prato_por_nome(self, nome: str):
+        """Retorna o PratoCatalogo com o nome, ou None."""
+        return self._pratos_por_nome.get(nome)
+
+    def pratos(self) -> tuple:
+        """Todos os pratos, ordenados pelo nome."""
+        return self._ordem_pratos
+
+    def nome_ingrediente(self, ingrediente_id: int):
+        """Nome do ingrediente, ou None."""
+        return self._ingredientes.get(ingrediente_id)
+
+    def ingrediente_por_nome(self, nome: str):
+        """Id do ingrediente com o nome, ou None."""
+        return self._ingredientes_por_nome.get(nome)
+
+    def ingredientes(self) -> list:
+        """[(id, nome)] de todos os ingredientes, ordenados pelo nome."""
+        return [
+            (ingrediente_id, self._ingredientes[ingrediente_id])
+            for ingrediente_id in self._ordem_ingredientes
+        ]
+
+    def __len__(self):
+        return len(self._pratos)
@@ -0,0 +1,62 @@
+import time
+from typing import NamedTuple
+
+# Segundos que um id ausente abaixo do marcador continua sendo procurado. Uma
+# transação desfeita também deixa lacuna, que então some sozinha.
+_PRAZO_LACUNA = 60.0
+# Máximo de lacunas guardadas (as mais recentes)
+_MAX_LACUNAS = 500
+
+
+class ChangeMarker(NamedTuple):
+    """Posição de leitura de um registro de alterações com id auto-incremento.
+
+    O id é atribuído no INSERT, não no commit: uma transação lenta pode
+    confirmar um id menor depois que outra já confirmou um maior. Por isso,
+    além do maior id lido (`ultimo`), o marcador guarda as lacunas abaixo dele
+    (ids ainda não vistos, com o prazo de cada uma), que são relidas a cada
+    leitura até aparecerem ou vencerem.
+    """
+
+    ultimo: int = 0
+    lacunas: tuple = ()  # ((id, vence_em), ...)
+
+    @classmethod
+    def inicial(cls, ids_recentes) -> "ChangeMarker":
+        """Marcador a partir dos últimos ids existentes (ex.: os 200 maiores).
+
+        Os ids que faltam entre o menor e o maior viram lacunas: podem ser
+        transações ainda abertas.
+        """
+        ids = sorted(ids_recentes)
+        if not ids:
+            return cls()
+        return cls(ids[0] - 1).avancar(ids)
+
+    def condicao(self):
+        """WHERE (sobre a coluna id) e parâmetros dos registros ainda não lidos."""
+        if not self.lacunas:
+            return "id > %s", (self.ultimo,)
+        ids = [lacuna for lacuna, _ in self.lacunas]
+        return (
+            f"(id > %s OR id IN ({', '.join(['%s'] * len(ids))}))",
+            (self.ultimo, *ids),
+        )
+
+    def avancar(self, ids_lidos) -> "ChangeMarker":
+        """Novo marcador depois de ler os registros `ids_lidos` desta posição."""
+        agora = time.monotonic()
+        lidos = set(ids_lidos)
+        ultimo = max(lidos, default=self.ultimo)
+        ultimo = max(ultimo, self.ultimo)
+        lacunas = [
+            (lacuna, vence_em)
+            for lacuna, vence_em in self.lacunas
+            if lacuna not in lidos and vence_em > agora
+        ]
+        lacunas.extend(
+            (lacuna, agora + _PRAZO_LACUNA)
+            for lacuna in range(self.ultimo + 1, ultimo)
+            if lacuna not in lidos
+        )
+        return ChangeMarker(ultimo, tuple(lacunas[-_MAX_LACUNAS:]))
@@ -0,0 +1,61 @@
+import threading
+from bisect import bisect_left, insort
+
+from src.utils.changeMarker import ChangeMarker
+
+
+class KitchenQueue:
+    """Fila dos pedidos ativos da cozinha, do mais antigo ao mais novo.
+
+    A ordem é a do id do pedido, que cresce com a ordem de chegada. Os ids
+    ficam numa lista mantida ordenada (busca binária a cada entrada ou saída),
+    então a tela lê a fila já na ordem, sem reordenar a cada leitura, e cada
+    mudança de status custa proporcional aos pedidos ativos, não à tabela.
+
+    `marcador` (ChangeMarker) guarda até qual registro de Pedidos_Alteracoes
+    a fila já foi sincronizada, com as lacunas ainda não vistas (None
+    enquanto a fila não foi carregada).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.marcador = None
+        self._ordem = []
+        self._pedidos = {}
+
+    def carregar(self, pedidos: dict, marcador: ChangeMarker):
+        """Substitui o conteúdo da fila.
+
+        Args:
+            pedidos (dict): {id_pedido: pedido} com os pedidos ativos.
+            marcador (ChangeMarker): Último registro de alteração já refletido em `pedidos`.
+        """
+        self._pedidos = dict(pedidos)
+        self._ordem = sorted(self._pedidos)
+        self.marcador = marcador
+
+    def atualizar(self, alterados: list, ativos: dict, marcador: ChangeMarker):
+        """Aplica as mudanças de status vindas do registro de alterações.
+
+        Args:
+            alterados (list): IDs dos pedidos que mudaram desde o último marcador.
+            ativos (dict): {id_pedido: pedido} dos alterados que continuam ativos.
+            marcador (ChangeMarker): Novo marcador da fila.
+        """
+        for pedido_id in alterados:
+            pedido = ativos.get(pedido_id)
+            if pedido is None:
+                if self._pedidos.pop(pedido_id, None) is not None:
+                    del self._ordem[bisect_left(self._ordem, pedido_id)]
+            else:
+                if pedido_id not in self._pedidos:
+                    insort(self._ordem, pedido_id)
+                self._pedidos[pedido_id] = pedido
+        self.marcador = marcador
+
+    def pedidos(self) -> list:
+        """Retorna [(id_pedido, pedido)] de todos os pedidos ativos, do mais antigo ao mais novo."""
+        return [(pedido_id, self._pedidos[pedido_id]) for pedido_id in self._ordem]
+
+    def __len__(self):
+        return len(self._pedidos)
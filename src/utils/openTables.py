@@ -0,0 +1,82 @@
+import threading
+import time
+
+from src.utils.changeMarker import ChangeMarker
+
+
+class OpenTables:
+    """Mapa em memória mesa -> pedidos em aberto, com os pratos e preços de cada pedido.
+
+    Responde à conta de uma mesa sem ir ao banco. O mapa é carregado uma vez
+    com todos os pedidos em aberto e depois sincronizado pelo registro de
+    alterações (Pedidos_Alteracoes): só os pedidos que mudaram são relidos.
+
+    `marcador` (ChangeMarker) guarda até qual registro de Pedidos_Alteracoes
+    o mapa já foi sincronizado, com as lacunas ainda não vistas (None
+    enquanto não foi carregado). `versao_pedidos` e
+    `versao_cardapio` são as versões das tabelas no cache de resultados do
+    Database no momento da sincronização: se mudaram, houve escrita local
+    desde então.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.marcador = None
+        self.versao_pedidos = None
+        self.versao_cardapio = None
+        self._sincronizado_em = 0.0
+        self._pedidos = {}  # id_pedido -> (num_mesa, linhas)
+        self._mesas = {}  # num_mesa -> {id_pedido}
+
+    def carregar(self, pedidos: dict, marcador: ChangeMarker, versao_pedidos, versao_cardapio):
+        """Substitui o conteúdo do mapa.
+
+        Args:
+            pedidos (dict): {id_pedido: (num_mesa, linhas)} dos pedidos em aberto.
+            marcador (ChangeMarker): Último registro de alteração já refletido em `pedidos`.
+            versao_pedidos, versao_cardapio: Versões das tabelas lidas antes da carga.
+        """
+        self._pedidos = {}
+        self._mesas = {}
+        self.atualizar(pedidos, pedidos, marcador, versao_pedidos)
+        self.versao_cardapio = versao_cardapio
+
+    def atualizar(self, alterados, abertos: dict, marcador: ChangeMarker, versao_pedidos):
+        """Aplica as mudanças vindas do registro de alterações.
+
+        Args:
+            alterados (iterable): IDs dos pedidos que mudaram desde o último marcador.
+            abertos (dict): {id_pedido: (num_mesa, linhas)} dos alterados que
+                continuam em aberto.
+            marcador (ChangeMarker): Novo marcador do mapa.
+            versao_pedidos: Versão das tabelas de pedidos lida antes da consulta.
+        """
+        for pedido_id in alterados:
+            anterior = self._pedidos.pop(pedido_id, None)
+            if anterior is not None:
+                pedidos_mesa = self._mesas[anterior[0]]
+                pedidos_mesa.discard(pedido_id)
+                if not pedidos_mesa:
+                    del self._mesas[anterior[0]]
+            pedido = abertos.get(pedido_id)
+            if pedido is not None:
+                self._pedidos[pedido_id] = pedido
+                self._mesas.setdefault(pedido[0], set()).add(pedido_id)
+        self.marcador = marcador
+        self.versao_pedidos = versao_pedidos
+        self._sincronizado_em = time.monotonic()
+
+    def vencido(self, max_idade: float) -> bool:
+        """Indica se a última sincronização foi há mais de `max_idade` segundos."""
+        return time.monotonic() - self._sincronizado_em > max_idade
+
+    def linhas(self, num_mesa) -> list:
+        """Retorna as linhas de todos os pedidos em aberto da mesa, por ordem de pedido."""
+        return [
+            linha
+            for pedido_id in sorted(self._mesas.get(num_mesa, ()))
+            for linha in self._pedidos[pedido_id][1]
+        ]
+
+    def __len__(self):
+        return len(self._pedidos)
@@ -0,0 +1,60 @@
+import threading
+from bisect import bisect_right
+
+
+class PriceHistory:
+    """Histórico de preços em memória: por prato, as datas de vigência em ordem
+    e os preços correspondentes, em duas listas paralelas.
+
+    O preço de um prato num momento é o da última vigência até aquele momento
+    (inclusive), achado por busca binária. As datas têm microssegundos e vêm do
+    relógio do servidor, como Pedidos.criado_em; vigências iguais ficam na
+    ordem do id do histórico. `versao` é o carimbo do catálogo no banco quando
+    o histórico foi carregado (None enquanto não foi carregado).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.versao = None
+        self._datas = {}  # prato_id -> [vigente_desde]
+        self._precos = {}  # prato_id -> [preco]
+
+    def carregar(self, linhas, versao):
+        """Substitui o conteúdo do histórico.
+
+        Args:
+            linhas (iterable): (prato_id, preco, vigente_desde) ordenadas por
+                prato e vigência; na mesma vigência, a última linha prevalece.
+            versao: Carimbo do catálogo lido antes da consulta.
+        """
+        datas, precos = {}, {}
+        for prato_id, preco, vigente_desde in linhas:
+            datas.setdefault(prato_id, []).append(vigente_desde)
+            precos.setdefault(prato_id, []).append(preco)
+        self._datas, self._precos = datas, precos
+        self.versao = versao
+
+    def preco_em(self, prato_id: int, momento):
+        """Preço do prato no `momento` (datetime).
+
+        Sem `momento` (pedidos anteriores à coluna criado_em), o preço atual;
+        antes da primeira vigência, o primeiro preço conhecido. None se o
+        prato não tem histórico.
+        """
+        precos = self._precos.get(prato_id)
+        if not precos:
+            return None
+        if momento is None:
+            return precos[-1]
+        indice = bisect_right(self._datas[prato_id], momento) - 1
+        return precos[max(indice, 0)]
+
+    def total(self, pratos: dict, momento):
+        """Soma quantidade x preço no `momento` de {prato_id: quantidade}."""
+        return sum(
+            quantidade * (self.preco_em(prato_id, momento) or 0)
+            for prato_id, quantidade in pratos.items()
+        )
+
+    def __len__(self):
+        return len(self._precos)